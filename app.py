@@ -15,8 +15,9 @@ import os
 # Agregar revenge_backend al path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'revenge_backend'))
 
-from flask import Flask, jsonify, send_from_directory
+from flask import Flask, Response, jsonify, send_from_directory
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 from dotenv import load_dotenv
 
 # Cargar variables de entorno desde revenge_backend
@@ -32,8 +33,10 @@ from revenge_backend.routes.usuario_routes import usuario_bp
 from revenge_backend.routes.proveedor_routes import proveedor_bp
 from revenge_backend.routes.reporte_routes import reporte_bp
 
-# Importar manejador de errores desde revenge_backend
-from revenge_backend.utils.error_handler import register_error_handlers
+# Manejador de errores: mismo módulo (utils.error_handler) desde el que
+# controladores y decoradores lanzan APIError; importado como
+# revenge_backend.utils.error_handler sería otra clase y no coincidiría
+from utils.error_handler import register_error_handlers
 
 def create_app(serve_frontend=False):
     """
@@ -71,6 +74,13 @@ def create_app(serve_frontend=False):
     # Deshabilitar redirección automática de trailing slashes
     app.url_map.strict_slashes = False
     
+    # Detrás de nginx: tomar la IP del cliente de X-Forwarded-For (solo los
+    # PROXY_SALTOS proxies de confianza); si no, todos comparten la IP del proxy
+    # y el límite de logins por IP bloquearía a todos a la vez
+    proxy_saltos = int(os.getenv('PROXY_SALTOS', 0))
+    if proxy_saltos > 0:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxy_saltos, x_proto=proxy_saltos)
+    
     # Habilitar CORS
     # En desarrollo, permitir requests desde Vue (puerto 5173 o 3000)
     # En producción, más restrictivo
@@ -103,6 +113,18 @@ def create_app(serve_frontend=False):
     # Registrar manejadores de errores
     register_error_handlers(app)
     
+    # Tiempos por endpoint, estados y peticiones en curso (expuestos en /metrics)
+    from utils.metricas import Metricas
+    Metricas.registrar_app(app)
+    
+    # Compilar permisos por rol (roles_permisos) antes de atender peticiones
+    from models.permiso_model import PermisoModel
+    PermisoModel.cargar()
+    
+    # Lista de revocación de tokens (tokens_revocados)
+    from models.token_revocado_model import TokenRevocadoModel
+    TokenRevocadoModel.cargar()
+    
     # ==================== RUTAS DEL FRONTEND (Solo en producción) ====================
     
     if serve_frontend and frontend_folder:
@@ -152,6 +174,13 @@ def create_app(serve_frontend=False):
             'mode': 'production' if serve_frontend else 'development'
         }), 200
     
+    @app.route('/metrics')
+    def metrics():
+        """Métricas del worker en formato de exposición de Prometheus"""
+        if not Metricas.HABILITADAS:
+            return jsonify({'error': 'Métricas deshabilitadas'}), 404
+        return Response(Metricas.exponer(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+    
     @app.route('/api')
     def api_info():
         """Información de la API"""
@@ -6,8 +6,14 @@ Implementa pool de conexiones para mejor rendimiento
 import pymysql
 from pymysql import cursors
 from contextlib import contextmanager
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
 import os
+import re
+import threading
+import time
 from dotenv import load_dotenv
+from utils.metricas import Metricas
 
 load_dotenv()
 
@@ -23,24 +29,230 @@ class DatabaseConfig:
     CHARSET = 'utf8mb4'
     
     # Configuración del pool
-    MAX_CONNECTIONS = 10
+    MAX_CONNECTIONS = int(os.getenv('DB_POOL_SIZE', 10))
     CONNECT_TIMEOUT = 10
+    POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 5))            # Espera máxima si el pool está agotado (s)
+    POOL_IDLE_TIMEOUT = float(os.getenv('DB_POOL_IDLE_TIMEOUT', 300))  # Conexiones ociosas más tiempo se cierran (s)
+    POOL_PING_INTERVAL = float(os.getenv('DB_POOL_PING_INTERVAL', 30)) # Ping al prestar si estuvo ociosa más de esto (s)
+    
+    # Consultas en paralelo: como máximo la mitad del pool, el resto queda para las ventas
+    PARALLEL_WORKERS = int(os.getenv('DB_PARALLEL_WORKERS', max(1, MAX_CONNECTIONS // 2)))
+    
+    # Lecturas en streaming: el servidor espera hasta esto a que el cliente lento lea (s)
+    STREAM_WRITE_TIMEOUT = int(os.getenv('DB_STREAM_WRITE_TIMEOUT', 600))
+    STREAM_LOTE = 1000
+
+
+class PoolTimeoutError(Exception):
+    """El pool no liberó una conexión dentro del tiempo de espera"""
+    pass
+
+
+class QueryTimeoutError(Exception):
+    """Un grupo de consultas en paralelo no terminó dentro del plazo"""
+    pass
+
+
+class CursorMedido(cursors.DictCursor):
+    """DictCursor que registra duración y filas de cada consulta en Metricas"""
+    
+    def execute(self, query, args=None):
+        inicio = time.perf_counter()
+        try:
+            resultado = super().execute(query, args)
+        except Exception:
+            Metricas.incrementar('db_errores_total', etiquetas=(('operacion', 'consulta'),))
+            raise
+        finally:
+            Metricas.observar('db_consulta_segundos', time.perf_counter() - inicio)
+        Metricas.incrementar('db_filas_total', max(self.rowcount, 0))
+        return resultado
+
+
+class ConnectionPool:
+    """
+    Pool de conexiones acotado y thread-safe
+    Estructura: Pila (deque) de conexiones ociosas, la más reciente se reutiliza primero
+    """
+    
+    def __init__(self, factory, max_connections, timeout, idle_timeout, ping_interval):
+        self._factory = factory
+        self._max_connections = max_connections
+        self._timeout = timeout
+        self._idle_timeout = idle_timeout
+        self._ping_interval = ping_interval
+        self._condition = threading.Condition(threading.Lock())
+        self._reset()
+    
+    def _reset(self):
+        """Reinicia el estado (también tras un fork, las conexiones no se comparten entre procesos)"""
+        self._pid = os.getpid()
+        self._idle = deque()  # (conexión, timestamp de devolución)
+        self._in_use = 0
+        self._stats = {
+            'creadas': 0,
+            'cerradas': 0,
+            'prestamos': 0,
+            'esperas': 0,
+            'tiempo_espera_total': 0.0,
+            'tiempo_espera_max': 0.0,
+            'timeouts': 0,
+            'pings_fallidos': 0
+        }
+    
+    def acquire(self):
+        """Obtiene una conexión del pool, esperando hasta POOL_TIMEOUT si está agotado"""
+        if self._pid != os.getpid():
+            with self._condition:
+                if self._pid != os.getpid():
+                    self._reset()
+        
+        inicio = None
+        with self._condition:
+            self._evict_idle()
+            while not self._idle and self._in_use >= self._max_connections:
+                if inicio is None:
+                    inicio = time.monotonic()
+                    self._stats['esperas'] += 1
+                restante = self._timeout - (time.monotonic() - inicio)
+                if restante <= 0:
+                    self._stats['timeouts'] += 1
+                    raise PoolTimeoutError(
+                        f"Pool de conexiones agotado ({self._max_connections} en uso) "
+                        f"tras esperar {self._timeout}s"
+                    )
+                self._condition.wait(restante)
+            
+            if inicio is not None:
+                espera = time.monotonic() - inicio
+                self._stats['tiempo_espera_total'] += espera
+                self._stats['tiempo_espera_max'] = max(self._stats['tiempo_espera_max'], espera)
+            
+            self._in_use += 1
+            self._stats['prestamos'] += 1
+            conexion, devuelta_en = self._idle.pop() if self._idle else (None, None)
+        
+        # Fuera del lock: ping o conexión nueva (I/O de red)
+        try:
+            if conexion is not None and time.monotonic() - devuelta_en > self._ping_interval:
+                try:
+                    conexion.ping(reconnect=False)
+                except Exception:
+                    self._close(conexion)
+                    conexion = None
+                    with self._condition:
+                        self._stats['pings_fallidos'] += 1
+                        self._stats['cerradas'] += 1
+            
+            if conexion is None:
+                conexion = self._factory()
+                with self._condition:
+                    self._stats['creadas'] += 1
+            
+            return conexion
+        except Exception:
+            with self._condition:
+                self._in_use -= 1
+                self._condition.notify()
+            raise
+    
+    def release(self, conexion, discard=False):
+        """Devuelve una conexión al pool (o la cierra si está rota)"""
+        if self._pid != os.getpid():
+            # Conexión heredada de otro proceso: no se reutiliza
+            return
+        
+        cerrar = discard or not getattr(conexion, 'open', False)
+        if cerrar:
+            self._close(conexion)
+            conexion = None
+        
+        with self._condition:
+            self._in_use = max(self._in_use - 1, 0)
+            if cerrar:
+                self._stats['cerradas'] += 1
+            if conexion is not None:
+                self._idle.append((conexion, time.monotonic()))
+            self._condition.notify()
+    
+    def _evict_idle(self):
+        """Cierra las conexiones ociosas por más de POOL_IDLE_TIMEOUT (llamar con el lock tomado)"""
+        limite = time.monotonic() - self._idle_timeout
+        # Las más antiguas están al inicio de la deque
+        while self._idle and self._idle[0][1] < limite:
+            conexion, _ = self._idle.popleft()
+            self._close(conexion)
+            self._stats['cerradas'] += 1
+    
+    @staticmethod
+    def _close(conexion):
+        """Cierra una conexión ignorando errores de red"""
+        try:
+            conexion.close()
+        except Exception:
+            pass
+    
+    def close_all(self):
+        """Cierra todas las conexiones ociosas"""
+        with self._condition:
+            while self._idle:
+                conexion, _ = self._idle.popleft()
+                self._close(conexion)
+                self._stats['cerradas'] += 1
+    
+    def stats(self):
+        """Retorna estadísticas del pool"""
+        with self._condition:
+            esperas = self._stats['esperas']
+            return {
+                'max_conexiones': self._max_connections,
+                'en_uso': self._in_use,
+                'ociosas': len(self._idle),
+                'tiempo_espera_promedio': (
+                    self._stats['tiempo_espera_total'] / esperas if esperas else 0.0
+                ),
+                **self._stats
+            }
 
 
 class Database:
     """Clase para manejar la conexión a MySQL con patrón Singleton"""
     
     _instance = None
-    _connection_pool = []
+    _connection_pool = None
+    _pool_lock = threading.Lock()
+    _executor = None
+    _executor_pid = None
     
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(Database, cls).__new__(cls)
         return cls._instance
     
+    @staticmethod
+    def get_pool():
+        """Retorna el pool de conexiones (se crea en el primer uso)"""
+        if Database._connection_pool is None:
+            with Database._pool_lock:
+                if Database._connection_pool is None:
+                    Database._connection_pool = ConnectionPool(
+                        factory=Database.get_connection,
+                        max_connections=DatabaseConfig.MAX_CONNECTIONS,
+                        timeout=DatabaseConfig.POOL_TIMEOUT,
+                        idle_timeout=DatabaseConfig.POOL_IDLE_TIMEOUT,
+                        ping_interval=DatabaseConfig.POOL_PING_INTERVAL
+                    )
+        return Database._connection_pool
+    
+    @staticmethod
+    def pool_stats():
+        """Retorna estadísticas del pool de conexiones"""
+        return Database.get_pool().stats()
+    
     @staticmethod
     def get_connection():
-        """Obtiene una conexión a la base de datos"""
+        """Abre una conexión nueva a la base de datos (usada por el pool)"""
+        inicio = time.perf_counter()
         try:
             connection = pymysql.connect(
                 host=DatabaseConfig.HOST,
@@ -49,11 +261,14 @@ class Database:
                 password=DatabaseConfig.PASSWORD,
                 database=DatabaseConfig.DATABASE,
                 charset=DatabaseConfig.CHARSET,
-                cursorclass=cursors.DictCursor,
+                cursorclass=CursorMedido,
+                connect_timeout=DatabaseConfig.CONNECT_TIMEOUT,
                 autocommit=False
             )
+            Metricas.observar('db_conexion_segundos', time.perf_counter() - inicio)
             return connection
         except pymysql.Error as e:
+            Metricas.incrementar('db_errores_total', etiquetas=(('operacion', 'conexion'),))
             print(f"❌ Error conectando a la base de datos: {e}")
             raise
     
@@ -70,26 +285,40 @@ class Database:
             with Database.get_cursor(commit=True) as cursor:
                 cursor.execute("INSERT INTO ...")
         """
+        pool = Database.get_pool()
         connection = None
         cursor = None
+        discard = False
         try:
-            connection = Database.get_connection()
+            connection = pool.acquire()
             cursor = connection.cursor()
             yield cursor
             
             if commit:
                 connection.commit()
+            else:
+                # Cerrar la transacción implícita de lectura para que la
+                # próxima petición no vea un snapshot viejo
+                connection.rollback()
                 
         except Exception as e:
             if connection:
-                connection.rollback()
+                try:
+                    connection.rollback()
+                except pymysql.Error:
+                    discard = True
+            if isinstance(e, (pymysql.OperationalError, pymysql.InterfaceError)):
+                discard = True
             print(f"❌ Error en la operación de BD: {e}")
             raise
         finally:
             if cursor:
-                cursor.close()
+                try:
+                    cursor.close()
+                except pymysql.Error:
+                    discard = True
             if connection:
-                connection.close()
+                pool.release(connection, discard=discard)
     
     @staticmethod
     def execute_query(query, params=None, fetch_one=False, fetch_all=False, commit=False):
@@ -117,6 +346,124 @@ class Database:
             else:
                 return cursor.lastrowid if commit else cursor.rowcount
     
+    @staticmethod
+    def stream_query(query, params=None, como_dict=False):
+        """
+        Generador que recorre un resultado fila por fila con un cursor sin buffer
+        (SSCursor): la memoria no crece con la cantidad de filas.
+        La conexión queda ocupada hasta agotar o cerrar el generador; si se
+        abandona a medias se descarta en lugar de leer las filas restantes.
+        
+        Args:
+            query (str): Query SQL de lectura
+            params (tuple): Parámetros de la query
+            como_dict (bool): Filas como dict (SSDictCursor) en lugar de tuplas
+            
+        Yields:
+            tuple o dict: Cada fila del resultado
+        """
+        pool = Database.get_pool()
+        connection = pool.acquire()
+        cursor = None
+        completo = False
+        leidas = 0
+        try:
+            cursor = connection.cursor(cursors.SSDictCursor if como_dict else cursors.SSCursor)
+            cursor.execute("SET SESSION net_write_timeout = %s", (DatabaseConfig.STREAM_WRITE_TIMEOUT,))
+            # Solo el tiempo del servidor: el de recorrer las filas depende del consumidor
+            inicio = time.perf_counter()
+            cursor.execute(query, params or ())
+            Metricas.observar('db_consulta_segundos', time.perf_counter() - inicio)
+            
+            while True:
+                filas = cursor.fetchmany(DatabaseConfig.STREAM_LOTE)
+                if not filas:
+                    break
+                leidas += len(filas)
+                yield from filas
+            
+            cursor.close()
+            connection.rollback()
+            completo = True
+        except Exception as e:
+            Metricas.incrementar('db_errores_total', etiquetas=(('operacion', 'streaming'),))
+            print(f"❌ Error en lectura en streaming: {e}")
+            raise
+        finally:
+            Metricas.incrementar('db_filas_total', leidas)
+            pool.release(connection, discard=not completo)
+    
+    @staticmethod
+    def get_executor():
+        """Retorna el pool de hilos para consultas en paralelo (uno por proceso)"""
+        if Database._executor is None or Database._executor_pid != os.getpid():
+            with Database._pool_lock:
+                if Database._executor is None or Database._executor_pid != os.getpid():
+                    Database._executor = ThreadPoolExecutor(
+                        max_workers=DatabaseConfig.PARALLEL_WORKERS,
+                        thread_name_prefix='db-paralelo'
+                    )
+                    Database._executor_pid = os.getpid()
+        return Database._executor
+    
+    @staticmethod
+    def _con_tiempo_maximo(query, timeout):
+        """
+        Agrega el hint MAX_EXECUTION_TIME a un SELECT: el servidor aborta la
+        consulta al vencer el plazo (MySQL 5.7.8+; en otros motores es un comentario)
+        """
+        milisegundos = max(int(timeout * 1000), 1)
+        return re.sub(
+            r'^\s*SELECT\b', f'SELECT /*+ MAX_EXECUTION_TIME({milisegundos}) */',
+            query, count=1, flags=re.IGNORECASE
+        )
+    
+    @staticmethod
+    def execute_parallel(consultas, timeout=None):
+        """
+        Ejecuta consultas de lectura independientes en paralelo, cada una con
+        su propia conexión del pool. El tiempo total se acerca al de la más lenta.
+        
+        Args:
+            consultas (dict): nombre -> (query, params, fetch_one)
+            timeout (float): Plazo para el grupo completo en segundos (None = sin límite);
+                             el servidor también corta cada SELECT al vencer
+            
+        Returns:
+            dict: nombre -> resultado (fetchone o fetchall)
+            
+        Raises:
+            QueryTimeoutError: Si alguna consulta no terminó dentro del plazo
+        """
+        executor = Database.get_executor()
+        futuros = {
+            executor.submit(
+                Database.execute_query,
+                Database._con_tiempo_maximo(query, timeout) if timeout else query, params,
+                fetch_one=fetch_one, fetch_all=not fetch_one
+            ): nombre
+            for nombre, (query, params, fetch_one) in consultas.items()
+        }
+        
+        hechos, pendientes = wait(futuros, timeout=timeout, return_when=FIRST_EXCEPTION)
+        
+        # Ante un error o vencido el plazo, no iniciar las que siguen en cola
+        # (las que ya corren las aborta el servidor por MAX_EXECUTION_TIME y
+        # devuelven su conexión al pool)
+        for futuro in hechos:
+            if futuro.exception() is not None:
+                for pendiente in pendientes:
+                    pendiente.cancel()
+                raise futuro.exception()
+        
+        if pendientes:
+            for pendiente in pendientes:
+                pendiente.cancel()
+            nombres = ', '.join(sorted(futuros[f] for f in pendientes))
+            raise QueryTimeoutError(f"Consultas sin terminar tras {timeout}s: {nombres}")
+        
+        return {nombre: futuro.result() for futuro, nombre in futuros.items()}
+    
     @staticmethod
     def test_connection():
         """Prueba la conexión a la base de datos"""
@@ -7,6 +7,9 @@ from flask import request
 from services.auth_service import AuthService
 from utils.error_handler import success_response, error_response, UnauthorizedError
 from utils.decorators import validar_json, validar_campos_requeridos
+from utils.jwt_helper import JWTHelper
+from utils.password_helper import VerificacionSaturadaError
+from utils.limitador_login import LimitadorLogin, LoginBloqueadoError
 
 
 class AuthController:
@@ -21,24 +24,25 @@ class AuthController:
             data = request.get_json()
             email = data['email']
             password = data['password']
+            ip = request.remote_addr or ''  # IP del cliente si PROXY_SALTOS está configurado
+            
+            # Antes de tocar la BD o calcular un hash
+            LimitadorLogin.verificar(ip, email)
             
             usuario = AuthService.login(email, password)
             
             if not usuario:
+                LimitadorLogin.registrar_fallo(ip, email)
                 raise UnauthorizedError("Credenciales inválidas")
+            LimitadorLogin.registrar_exito(ip, email)
             
-            # Generar token temporal (básico para desarrollo)
-            import hashlib
-            import time
-            token_data = f"{usuario['id']}:{usuario['email']}:{time.time()}"
-            usuario['token'] = hashlib.sha256(token_data.encode()).hexdigest()
-            
-            # TODO: Implementar JWT real para producción
-            # from utils.jwt_helper import JWTHelper
-            # token = JWTHelper.generar_token(
-            #     usuario['id'], usuario['email'], usuario['rol_id']
-            # )
-            # usuario['token'] = token
+            # JWT con jti (revocable en logout)
+            token = JWTHelper.generar_token(
+                usuario['id'], usuario['email'], usuario['rol_id']
+            )
+            if not token:
+                return error_response("No se pudo generar el token", 500)
+            usuario['token'] = token
             
             return success_response(
                 data=usuario,
@@ -47,6 +51,11 @@ class AuthController:
             
         except UnauthorizedError as e:
             return error_response(str(e), 401)
+        except LoginBloqueadoError as e:
+            respuesta, codigo = error_response(str(e), 429)
+            return respuesta, codigo, {'Retry-After': str(int(e.espera) + 1)}
+        except VerificacionSaturadaError as e:
+            return error_response(str(e), 503)
         except Exception as e:
             return error_response(f"Error en login: {str(e)}", 500)
     
@@ -74,6 +83,8 @@ class AuthController:
             
         except ValueError as e:
             return error_response(str(e), 400)
+        except VerificacionSaturadaError as e:
+            return error_response(str(e), 503)
         except Exception as e:
             return error_response(f"Error registrando usuario: {str(e)}", 500)
     
@@ -81,7 +92,13 @@ class AuthController:
     def logout():
         """POST /api/auth/logout"""
         try:
-            # TODO: Implementar con JWT
+            # Revocar el token de la petición (si es válido)
+            token = JWTHelper.extraer_token_header()
+            payload = JWTHelper.verificar_token(token) if token else None
+            
+            if payload:
+                AuthService.logout(payload['usuario_id'], payload.get('jti'), payload.get('exp'))
+            
             return success_response(message="Logout exitoso")
         except Exception as e:
             return error_response(f"Error en logout: {str(e)}", 500)
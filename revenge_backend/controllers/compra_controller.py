@@ -4,8 +4,8 @@ Controlador de Compras
 
 from flask import request
 from services.compra_service import CompraService
-from utils.error_handler import success_response, error_response
-from utils.decorators import validar_json, validar_campos_requeridos
+from utils.error_handler import success_response, error_response, paginated_response
+from utils.decorators import validar_json, validar_campos_requeridos, validar_paginacion
 
 
 class CompraController:
@@ -39,14 +39,14 @@ class CompraController:
             return error_response(str(e), 500)
     
     @staticmethod
+    @validar_paginacion
     def listar():
-        """GET /api/compras"""
+        """GET /api/compras?limite=&cursor= (o &offset= por compatibilidad)"""
         try:
-            limite = int(request.args.get('limite', 100))
-            offset = int(request.args.get('offset', 0))
-            
-            compras = CompraService.listar_compras(limite, offset)
-            return success_response(data=compras)
+            compras, next_cursor = CompraService.listar_compras(
+                request.limite, request.offset, request.cursor
+            )
+            return paginated_response(compras, next_cursor)
         except Exception as e:
             return error_response(str(e), 500)
     
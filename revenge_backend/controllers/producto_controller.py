@@ -34,16 +34,18 @@ class ProductoController:
     
     @staticmethod
     def buscar():
-        """GET /api/productos/buscar"""
+        """GET /api/productos/buscar?codigo= | ?nombre=[&modo=fuzzy]"""
         try:
             codigo = request.args.get('codigo')
             nombre = request.args.get('nombre')
+            modo = request.args.get('modo')
             
             if codigo:
                 producto = ProductoService.buscar_producto('codigo', codigo)
                 return success_response(data=producto)
             elif nombre:
-                productos = ProductoService.buscar_producto('nombre', nombre)
+                criterio = 'fuzzy' if modo == 'fuzzy' else 'nombre'
+                productos = ProductoService.buscar_producto(criterio, nombre)
                 return success_response(data=productos)
             else:
                 return error_response("Proporcione código o nombre para buscar", 400)
@@ -3,16 +3,60 @@ Controlador de Reportes
 Maneja las peticiones HTTP para reportes
 """
 
-from flask import request, jsonify, send_file
+from io import BytesIO
+from flask import request, jsonify, send_file, Response
 from services.reporte_service import ReporteService
-from utils.error_handler import BadRequestError
-from utils.pdf_generator import PDFGenerator
+from services.exportacion_service import ExportacionService, ColaExportacionesLlenaError
+from utils.error_handler import (
+    BadRequestError, NotFoundError, ServiceUnavailableError, TooManyRequestsError, success_response
+)
+from utils.pdf_pool import PoolPDF, ColaPDFLlenaError, PDFNoDisponibleError
 from datetime import datetime
 
 
 class ReporteController:
     """Controlador para endpoints de reportes"""
     
+    @staticmethod
+    def _exportar_async(tipo, formato, fecha_inicio=None, fecha_fin=None):
+        """
+        Con ?modo=async encola la exportación y responde 202 con el ID del trabajo
+        
+        Returns:
+            tuple o None: Respuesta HTTP, o None para generar en la petición
+        """
+        if request.args.get('modo') != 'async':
+            return None
+        
+        try:
+            estado = ExportacionService.encolar(tipo, formato, fecha_inicio, fecha_fin)
+        except ColaExportacionesLlenaError as e:
+            raise ServiceUnavailableError(str(e))
+        except ValueError as e:
+            raise BadRequestError(str(e))
+        
+        return success_response(
+            ReporteController._estado_publico(estado),
+            'Exportación encolada',
+            202
+        )
+    
+    @staticmethod
+    def _estado_publico(estado):
+        """Campos del estado de un trabajo expuestos al cliente"""
+        datos = {
+            'job_id': estado['id'],
+            'tipo': estado['tipo'],
+            'formato': estado['formato'],
+            'estado': estado['estado'],
+            'error': estado['error'],
+            'url_estado': f"/api/reportes/exportaciones/{estado['id']}",
+            'url_descarga': None
+        }
+        if estado['estado'] == 'completado':
+            datos['url_descarga'] = f"/api/reportes/exportaciones/{estado['id']}/descarga"
+        return datos
+    
     @staticmethod
     def reporte_ventas():
         """GET - Obtiene reporte de ventas"""
@@ -77,7 +121,15 @@ class ReporteController:
     
     @staticmethod
     def reporte_ventas_pdf():
-        """GET - Genera PDF de reporte de ventas"""
+        """GET - Genera PDF de reporte de ventas (?modo=async para generarlo en segundo plano)"""
+        respuesta_async = ReporteController._exportar_async(
+            'ventas', 'pdf',
+            request.args.get('fecha_inicio') or request.args.get('fecha_desde'),
+            request.args.get('fecha_fin') or request.args.get('fecha_hasta')
+        )
+        if respuesta_async:
+            return respuesta_async
+        
         try:
             fecha_inicio = request.args.get('fecha_inicio') or request.args.get('fecha_desde')
             fecha_fin = request.args.get('fecha_fin') or request.args.get('fecha_hasta')
@@ -88,12 +140,13 @@ class ReporteController:
             if not resultado['success']:
                 raise BadRequestError(resultado.get('error', 'Error al generar reporte'))
             
-            # Generar PDF
-            pdf_buffer = PDFGenerator.generar_reporte_ventas(
+            # Generar PDF (en el pool de procesos)
+            pdf_buffer = BytesIO(PoolPDF.generar(
+                'ventas',
                 resultado['data'], 
                 fecha_inicio, 
                 fecha_fin
-            )
+            ))
             
             # Nombre del archivo
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -106,6 +159,10 @@ class ReporteController:
                 download_name=filename
             )
             
+        except ColaPDFLlenaError as e:
+            raise TooManyRequestsError(str(e), reintentar_en=PoolPDF.REINTENTAR_EN)
+        except PDFNoDisponibleError as e:
+            raise ServiceUnavailableError(str(e), reintentar_en=PoolPDF.REINTENTAR_EN)
         except ImportError as e:
             raise BadRequestError("reportlab no está instalado. Ejecuta: pip install reportlab")
         except Exception as e:
@@ -116,7 +173,15 @@ class ReporteController:
     
     @staticmethod
     def reporte_compras_pdf():
-        """GET - Genera PDF de reporte de compras"""
+        """GET - Genera PDF de reporte de compras (?modo=async para generarlo en segundo plano)"""
+        respuesta_async = ReporteController._exportar_async(
+            'compras', 'pdf',
+            request.args.get('fecha_inicio') or request.args.get('fecha_desde'),
+            request.args.get('fecha_fin') or request.args.get('fecha_hasta')
+        )
+        if respuesta_async:
+            return respuesta_async
+        
         try:
             fecha_inicio = request.args.get('fecha_inicio') or request.args.get('fecha_desde')
             fecha_fin = request.args.get('fecha_fin') or request.args.get('fecha_hasta')
@@ -127,12 +192,13 @@ class ReporteController:
             if not resultado['success']:
                 raise BadRequestError(resultado.get('error', 'Error al generar reporte'))
             
-            # Generar PDF
-            pdf_buffer = PDFGenerator.generar_reporte_compras(
+            # Generar PDF (en el pool de procesos)
+            pdf_buffer = BytesIO(PoolPDF.generar(
+                'compras',
                 resultado['data'], 
                 fecha_inicio, 
                 fecha_fin
-            )
+            ))
             
             # Nombre del archivo
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -145,6 +211,10 @@ class ReporteController:
                 download_name=filename
             )
             
+        except ColaPDFLlenaError as e:
+            raise TooManyRequestsError(str(e), reintentar_en=PoolPDF.REINTENTAR_EN)
+        except PDFNoDisponibleError as e:
+            raise ServiceUnavailableError(str(e), reintentar_en=PoolPDF.REINTENTAR_EN)
         except ImportError as e:
             raise BadRequestError("reportlab no está instalado. Ejecuta: pip install reportlab")
         except Exception as e:
@@ -155,7 +225,11 @@ class ReporteController:
     
     @staticmethod
     def reporte_inventario_pdf():
-        """GET - Genera PDF de reporte de inventario"""
+        """GET - Genera PDF de reporte de inventario (?modo=async para generarlo en segundo plano)"""
+        respuesta_async = ReporteController._exportar_async('inventario', 'pdf')
+        if respuesta_async:
+            return respuesta_async
+        
         try:
             # Obtener datos del reporte
             resultado = ReporteService.generar_reporte_inventario()
@@ -163,8 +237,8 @@ class ReporteController:
             if not resultado['success']:
                 raise BadRequestError(resultado.get('error', 'Error al generar reporte'))
             
-            # Generar PDF
-            pdf_buffer = PDFGenerator.generar_reporte_inventario(resultado['data'])
+            # Generar PDF (en el pool de procesos)
+            pdf_buffer = BytesIO(PoolPDF.generar('inventario', resultado['data']))
             
             # Nombre del archivo
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -177,6 +251,10 @@ class ReporteController:
                 download_name=filename
             )
             
+        except ColaPDFLlenaError as e:
+            raise TooManyRequestsError(str(e), reintentar_en=PoolPDF.REINTENTAR_EN)
+        except PDFNoDisponibleError as e:
+            raise ServiceUnavailableError(str(e), reintentar_en=PoolPDF.REINTENTAR_EN)
         except ImportError as e:
             raise BadRequestError("reportlab no está instalado. Ejecuta: pip install reportlab")
         except Exception as e:
@@ -189,7 +267,15 @@ class ReporteController:
     
     @staticmethod
     def reporte_ventas_excel():
-        """GET - Genera Excel de reporte de ventas"""
+        """GET - Genera Excel de reporte de ventas (?modo=async para generarlo en segundo plano)"""
+        respuesta_async = ReporteController._exportar_async(
+            'ventas', 'excel',
+            request.args.get('fecha_inicio') or request.args.get('fecha_desde'),
+            request.args.get('fecha_fin') or request.args.get('fecha_hasta')
+        )
+        if respuesta_async:
+            return respuesta_async
+        
         try:
             from utils.excel_generator import ExcelGenerator
             
@@ -230,7 +316,15 @@ class ReporteController:
     
     @staticmethod
     def reporte_compras_excel():
-        """GET - Genera Excel de reporte de compras"""
+        """GET - Genera Excel de reporte de compras (?modo=async para generarlo en segundo plano)"""
+        respuesta_async = ReporteController._exportar_async(
+            'compras', 'excel',
+            request.args.get('fecha_inicio') or request.args.get('fecha_desde'),
+            request.args.get('fecha_fin') or request.args.get('fecha_hasta')
+        )
+        if respuesta_async:
+            return respuesta_async
+        
         try:
             from utils.excel_generator import ExcelGenerator
             
@@ -271,7 +365,11 @@ class ReporteController:
     
     @staticmethod
     def reporte_inventario_excel():
-        """GET - Genera Excel de reporte de inventario"""
+        """GET - Genera Excel de reporte de inventario (?modo=async para generarlo en segundo plano)"""
+        respuesta_async = ReporteController._exportar_async('inventario', 'excel')
+        if respuesta_async:
+            return respuesta_async
+        
         try:
             from utils.excel_generator import ExcelGenerator
             
@@ -302,3 +400,89 @@ class ReporteController:
             import traceback
             traceback.print_exc()
             raise BadRequestError(f"Error al generar Excel: {str(e)}")
+    
+    # ==================== EXPORTACIONES ASÍNCRONAS ====================
+    
+    @staticmethod
+    def estado_exportacion(job_id):
+        """GET - Estado de una exportación en segundo plano"""
+        estado = ExportacionService.obtener_estado(job_id)
+        if not estado:
+            raise NotFoundError("Exportación no encontrada o vencida")
+        
+        return success_response(ReporteController._estado_publico(estado))
+    
+    @staticmethod
+    def descargar_exportacion(job_id):
+        """GET - Descarga el archivo de una exportación completada"""
+        ruta, estado = ExportacionService.obtener_archivo(job_id)
+        if not estado:
+            raise NotFoundError("Exportación no encontrada o vencida")
+        if not ruta:
+            raise BadRequestError(f"La exportación está en estado '{estado['estado']}'")
+        
+        return send_file(
+            ruta,
+            mimetype=estado['mimetype'],
+            as_attachment=True,
+            download_name=estado['nombre_descarga']
+        )
+    
+    # ==================== EXPORTACIONES EN STREAMING ====================
+    
+    @staticmethod
+    def exportar_ventas_xlsx():
+        """GET - Exporta las líneas de venta del rango a Excel (streaming, memoria constante)"""
+        fecha_inicio = request.args.get('fecha_inicio') or request.args.get('fecha_desde')
+        fecha_fin = request.args.get('fecha_fin') or request.args.get('fecha_hasta')
+        
+        try:
+            contenido, filename = ReporteService.exportar_lineas_ventas_excel(fecha_inicio, fecha_fin)
+        except ImportError:
+            raise BadRequestError("openpyxl no está instalado. Ejecuta: pip install openpyxl")
+        except ValueError as e:
+            raise BadRequestError(str(e))
+        
+        return ReporteController._respuesta_stream(
+            contenido,
+            'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            filename
+        )
+    
+    @staticmethod
+    def exportar_ventas_csv():
+        """GET - Exporta las líneas de venta del rango a CSV (streaming)"""
+        return ReporteController._exportar_ventas_texto('csv', 'text/csv; charset=utf-8')
+    
+    @staticmethod
+    def exportar_ventas_ndjson():
+        """GET - Exporta las líneas de venta del rango a NDJSON (streaming)"""
+        return ReporteController._exportar_ventas_texto('ndjson', 'application/x-ndjson')
+    
+    @staticmethod
+    def _exportar_ventas_texto(formato, mimetype):
+        """Respuesta en streaming de las líneas de venta en formato de texto"""
+        fecha_inicio = request.args.get('fecha_inicio') or request.args.get('fecha_desde')
+        fecha_fin = request.args.get('fecha_fin') or request.args.get('fecha_hasta')
+        
+        try:
+            contenido, filename = ReporteService.exportar_lineas_ventas_texto(formato, fecha_inicio, fecha_fin)
+        except ValueError as e:
+            raise BadRequestError(str(e))
+        
+        return ReporteController._respuesta_stream(contenido, mimetype, filename)
+    
+    @staticmethod
+    def _respuesta_stream(contenido, mimetype, filename):
+        """Respuesta HTTP que envía el generador a medida que produce datos"""
+        return Response(
+            contenido,
+            mimetype=mimetype,
+            headers={
+                'Content-Disposition': f'attachment; filename="{filename}"',
+                'Cache-Control': 'no-store',
+                # Evita que un proxy (nginx) acumule la respuesta completa
+                'X-Accel-Buffering': 'no'
+            }
+        )
+
@@ -6,6 +6,7 @@ from flask import request
 from services.usuario_service import UsuarioService
 from utils.error_handler import success_response, error_response
 from utils.decorators import validar_json
+from utils.password_helper import VerificacionSaturadaError
 
 
 class UsuarioController:
@@ -42,6 +43,8 @@ class UsuarioController:
             return success_response(message="Usuario actualizado exitosamente")
         except ValueError as e:
             return error_response(str(e), 400)
+        except VerificacionSaturadaError as e:
+            return error_response(str(e), 503)
         except Exception as e:
             return error_response(str(e), 500)
     
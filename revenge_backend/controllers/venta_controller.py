@@ -2,10 +2,11 @@
 Controlador de Ventas
 """
 
-from flask import request
+from flask import request, Response
 from services.venta_service import VentaService
-from utils.error_handler import success_response, error_response
-from utils.decorators import validar_json, validar_campos_requeridos
+from services.boleta_service import BoletaService
+from utils.error_handler import success_response, error_response, paginated_response
+from utils.decorators import validar_json, validar_campos_requeridos, validar_paginacion
 
 
 class VentaController:
@@ -39,14 +40,14 @@ class VentaController:
             return error_response(str(e), 500)
     
     @staticmethod
+    @validar_paginacion
     def listar():
-        """GET /api/ventas"""
+        """GET /api/ventas?limite=&cursor= (o &offset= por compatibilidad)"""
         try:
-            limite = int(request.args.get('limite', 100))
-            offset = int(request.args.get('offset', 0))
-            
-            ventas = VentaService.listar_ventas(limite, offset)
-            return success_response(data=ventas)
+            ventas, next_cursor = VentaService.listar_ventas(
+                request.limite, request.offset, request.cursor
+            )
+            return paginated_response(ventas, next_cursor)
         except Exception as e:
             return error_response(str(e), 500)
     
@@ -61,6 +62,26 @@ class VentaController:
         except Exception as e:
             return error_response(str(e), 500)
     
+    @staticmethod
+    def boleta(venta_id):
+        """GET /api/ventas/<id>/boleta?formato=pdf|texto|escpos"""
+        try:
+            formato = request.args.get('formato', 'pdf')
+            resultado = BoletaService.generar(venta_id, formato)
+            if not resultado:
+                return error_response("Venta no encontrada", 404)
+            
+            contenido, mimetype, extension = resultado
+            # PDF y texto se muestran (para imprimir); ESC/POS se descarga
+            disposicion = 'attachment' if formato == 'escpos' else 'inline'
+            return Response(contenido, mimetype=mimetype, headers={
+                'Content-Disposition': f'{disposicion}; filename="boleta_{venta_id}.{extension}"'
+            })
+        except ValueError as e:
+            return error_response(str(e), 400)
+        except Exception as e:
+            return error_response(str(e), 500)
+    
     @staticmethod
     def por_fecha():
         """GET /api/ventas/por-fecha"""
@@ -0,0 +1,15 @@
+-- Secuencias atómicas (números de boleta)
+-- Cada proceso reserva bloques con:
+--   INSERT ... ON DUPLICATE KEY UPDATE valor = LAST_INSERT_ID(valor + N)
+
+CREATE TABLE IF NOT EXISTS secuencias (
+    nombre VARCHAR(50) PRIMARY KEY,
+    valor BIGINT UNSIGNED NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+-- Continuar desde la última boleta emitida (formato B-00001)
+INSERT INTO secuencias (nombre, valor)
+SELECT 'boleta', COALESCE(MAX(CAST(SUBSTRING_INDEX(numero_boleta, '-', -1) AS UNSIGNED)), 0)
+FROM ventas
+ON DUPLICATE KEY UPDATE valor = GREATEST(secuencias.valor, VALUES(valor));
@@ -0,0 +1,11 @@
+-- Log de invalidaciones de cache entre workers (utils/cache_sync.py)
+-- Cada worker lee las filas con id mayor a su marca una vez por intervalo.
+-- clave NULL = vaciar el cache completo.
+
+CREATE TABLE IF NOT EXISTS cache_invalidaciones (
+    id BIGINT UNSIGNED PRIMARY KEY AUTO_INCREMENT,
+    cache VARCHAR(50) NOT NULL,
+    clave VARCHAR(100) NULL,
+    created_at TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    INDEX idx_cache_invalidaciones_created (created_at)
+);
@@ -0,0 +1,6 @@
+-- Índices para la paginación por cursor de /api/ventas y /api/compras
+-- La consulta "WHERE fecha < ? OR (fecha = ? AND id < ?) ORDER BY fecha DESC, id DESC LIMIT n"
+-- recorre el índice desde la posición del cursor: el costo no depende de la profundidad.
+
+CREATE INDEX idx_ventas_fecha_id ON ventas(fecha, id);
+CREATE INDEX idx_compras_fecha_id ON compras(fecha, id);
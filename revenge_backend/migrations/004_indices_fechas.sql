@@ -0,0 +1,10 @@
+-- Índices compuestos para los filtros por rango de fechas
+-- Los filtros usan "fecha >= inicio AND fecha < fin + 1 día" (utils/fecha_helper.py),
+-- por lo que MySQL puede hacer un range scan sobre estos índices.
+-- ventas(fecha, id) y compras(fecha, id) ya se crean en 003_indices_paginacion.sql.
+
+-- Ventas de un cajero en un rango (VentaModel.obtener_por_cajero)
+CREATE INDEX idx_ventas_cajero_fecha ON ventas(cajero_id, fecha);
+
+-- Compras de un proveedor ordenadas por fecha (CompraModel.obtener_por_proveedor)
+CREATE INDEX idx_compras_proveedor_fecha ON compras(proveedor_id, fecha);
@@ -0,0 +1,48 @@
+-- Agregados diarios de ventas (models/venta_diaria_model.py)
+-- Se actualizan dentro de la transacción de cada venta; los reportes de ventas,
+-- el resumen del día y los productos más vendidos leen de aquí.
+
+CREATE TABLE IF NOT EXISTS ventas_diarias (
+    fecha DATE NOT NULL,
+    cajero_id INT NOT NULL,
+    metodo_pago_id INT NOT NULL,
+    num_ventas INT NOT NULL DEFAULT 0,
+    subtotal DECIMAL(14,2) NOT NULL DEFAULT 0,
+    descuento DECIMAL(14,2) NOT NULL DEFAULT 0,
+    impuestos DECIMAL(14,2) NOT NULL DEFAULT 0,
+    total DECIMAL(14,2) NOT NULL DEFAULT 0,
+    total_min DECIMAL(10,2) NOT NULL DEFAULT 0,
+    total_max DECIMAL(10,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (fecha, cajero_id, metodo_pago_id)
+);
+
+CREATE TABLE IF NOT EXISTS ventas_diarias_productos (
+    fecha DATE NOT NULL,
+    cajero_id INT NOT NULL,
+    metodo_pago_id INT NOT NULL,
+    producto_id INT NOT NULL,
+    cantidad INT NOT NULL DEFAULT 0,
+    importe DECIMAL(14,2) NOT NULL DEFAULT 0,
+    lineas INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (fecha, cajero_id, metodo_pago_id, producto_id),
+    INDEX idx_ventas_diarias_productos_producto (producto_id, fecha)
+);
+
+-- Carga inicial desde el histórico
+-- (para reparar un rango más adelante: VentaDiariaModel.reconstruir(fecha_inicio, fecha_fin))
+INSERT INTO ventas_diarias
+    (fecha, cajero_id, metodo_pago_id, num_ventas, subtotal,
+     descuento, impuestos, total, total_min, total_max)
+SELECT DATE(v.fecha), v.cajero_id, v.metodo_pago_id,
+       COUNT(*), SUM(v.subtotal), SUM(v.descuento), SUM(v.impuestos),
+       SUM(v.total), MIN(v.total), MAX(v.total)
+FROM ventas v
+GROUP BY DATE(v.fecha), v.cajero_id, v.metodo_pago_id;
+
+INSERT INTO ventas_diarias_productos
+    (fecha, cajero_id, metodo_pago_id, producto_id, cantidad, importe, lineas)
+SELECT DATE(v.fecha), v.cajero_id, v.metodo_pago_id, dv.producto_id,
+       SUM(dv.cantidad), SUM(dv.subtotal), COUNT(*)
+FROM detalle_venta dv
+INNER JOIN ventas v ON dv.venta_id = v.id
+GROUP BY DATE(v.fecha), v.cajero_id, v.metodo_pago_id, dv.producto_id;
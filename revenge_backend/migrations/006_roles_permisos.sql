@@ -0,0 +1,18 @@
+-- Permisos por rol (models/permiso_model.py)
+-- Se cargan al iniciar cada worker y se compilan a una máscara de bits por rol;
+-- los decoradores verifican permisos con el rol_id del token, sin consultar la BD.
+-- '*' = todos los permisos. Tras modificar esta tabla, publicar la invalidación:
+--   INSERT INTO cache_invalidaciones (cache, clave) VALUES ('roles_permisos', NULL);
+
+CREATE TABLE IF NOT EXISTS roles_permisos (
+    rol_id INT NOT NULL,
+    permiso VARCHAR(50) NOT NULL,
+    PRIMARY KEY (rol_id, permiso),
+    FOREIGN KEY (rol_id) REFERENCES roles(id)
+);
+
+INSERT IGNORE INTO roles_permisos (rol_id, permiso) VALUES
+    (1, '*'),
+    (2, 'venta'), (2, 'ver_productos'), (2, 'ver_categorias'),
+    (3, 'compra'), (3, 'gestion_productos'), (3, 'gestion_inventario'),
+    (3, 'gestion_proveedores'), (3, 'ver_productos'), (3, 'ver_categorias');
@@ -0,0 +1,15 @@
+-- Lista de revocación de JWT (models/token_revocado_model.py)
+-- jti: un token puntual (logout)
+-- usuario_id sin jti: todos los tokens del usuario emitidos antes de revocado_en
+--   (cambio de contraseña, desactivación)
+-- Cada worker la carga en memoria al iniciar; las filas vencidas se purgan solas.
+
+CREATE TABLE IF NOT EXISTS tokens_revocados (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    jti CHAR(32) NULL,
+    usuario_id INT NULL,
+    revocado_en DATETIME(6) NOT NULL,
+    expira_en DATETIME NOT NULL,
+    UNIQUE KEY uk_tokens_revocados_jti (jti),
+    INDEX idx_tokens_revocados_expira (expira_en)
+);
@@ -3,7 +3,10 @@ Modelo Categoría
 Estructura: Árbol (para soportar categorías jerárquicas en el futuro)
 """
 
+import os
 from config.database import Database
+from utils.cache_sync import CacheSync
+from utils.lru_cache import LRUCache
 
 
 class CategoriaModel:
@@ -11,7 +14,12 @@ class CategoriaModel:
     
     # Cache en memoria como árbol
     _arbol_categorias = {}
-    _categorias_dict = {}  # Hash map para búsqueda rápida
+    # Cache LRU para búsqueda rápida (el handler de CacheSync es propio: también resetea el árbol)
+    _cache = LRUCache(
+        'categorias',
+        max_items=int(os.getenv('CACHE_CATEGORIAS_MAX', 1000)),
+        sincronizado=False
+    )
     
     @staticmethod
     def crear(nombre, descripcion=None, created_by=None, parent_id=None):
@@ -25,6 +33,7 @@ class CategoriaModel:
         try:
             categoria_id = Database.execute_query(query, params, commit=True)
             CategoriaModel._cargar_arbol()  # Recargar árbol
+            CacheSync.publicar('categorias')  # Los demás workers recargan su árbol
             return categoria_id
         except Exception as e:
             print(f"Error creando categoría: {e}")
@@ -34,8 +43,9 @@ class CategoriaModel:
     def obtener_por_id(categoria_id):
         """Obtiene una categoría por ID - Búsqueda O(1) usando hash map"""
         # Primero busca en cache
-        if categoria_id in CategoriaModel._categorias_dict:
-            return CategoriaModel._categorias_dict[categoria_id]
+        categoria = CategoriaModel._cache.obtener(categoria_id)
+        if categoria:
+            return categoria
         
         query = """
             SELECT c.*, e.nombre as estado_nombre,
@@ -49,7 +59,7 @@ class CategoriaModel:
         
         # Guardar en cache
         if categoria:
-            CategoriaModel._categorias_dict[categoria_id] = categoria
+            CategoriaModel._cache.guardar(categoria['id'], categoria)
         
         return categoria
     
@@ -104,9 +114,10 @@ class CategoriaModel:
         try:
             filas_afectadas = Database.execute_query(query, tuple(valores), commit=True)
             
-            # Limpiar cache
-            if categoria_id in CategoriaModel._categorias_dict:
-                del CategoriaModel._categorias_dict[categoria_id]
+            # Limpiar cache (local y en los demás workers)
+            CacheSync.invalidar('categorias', [categoria_id])
+            # Los productos en cache guardan el nombre de la categoría
+            CacheSync.invalidar('productos')
             CategoriaModel._cargar_arbol()
             
             return filas_afectadas > 0
@@ -129,9 +140,8 @@ class CategoriaModel:
         try:
             filas_afectadas = Database.execute_query(query, (categoria_id,), commit=True)
             
-            # Limpiar cache
-            if categoria_id in CategoriaModel._categorias_dict:
-                del CategoriaModel._categorias_dict[categoria_id]
+            # Limpiar cache (local y en los demás workers)
+            CacheSync.invalidar('categorias', [categoria_id])
             
             return filas_afectadas > 0
         except Exception as e:
@@ -171,10 +181,10 @@ class CategoriaModel:
         categorias = CategoriaModel.obtener_todas()
         
         CategoriaModel._arbol_categorias = {}
-        CategoriaModel._categorias_dict = {}
+        CategoriaModel._cache.limpiar()
         
         for cat in categorias:
-            CategoriaModel._categorias_dict[cat['id']] = cat
+            CategoriaModel._cache.guardar(cat['id'], cat)
             # Por ahora solo un nivel, preparado para expandir
             CategoriaModel._arbol_categorias[cat['id']] = {
                 'data': cat,
@@ -184,6 +194,22 @@ class CategoriaModel:
     @staticmethod
     def obtener_arbol():
         """Retorna el árbol de categorías"""
+        CacheSync.sincronizar()
+        
         if not CategoriaModel._arbol_categorias:
             CategoriaModel._cargar_arbol()
         return CategoriaModel._arbol_categorias
+    
+    @staticmethod
+    def _invalidar_desde_sync(clave):
+        """Handler de CacheSync: el árbol se reconstruye en el próximo uso"""
+        CategoriaModel._cache.invalidar_desde_sync(clave)
+        CategoriaModel._arbol_categorias = {}
+    
+    @staticmethod
+    def estadisticas_cache():
+        """Retorna hits, misses y desalojos del cache de categorías"""
+        return CategoriaModel._cache.estadisticas()
+
+
+CacheSync.registrar('categorias', CategoriaModel._invalidar_desde_sync)
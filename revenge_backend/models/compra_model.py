@@ -4,6 +4,7 @@ Estructura: Cola para procesar pedidos pendientes
 """
 
 from config.database import Database
+from utils.fecha_helper import FechaHelper
 from datetime import datetime
 
 
@@ -50,8 +51,14 @@ class CompraModel:
         return compra
     
     @staticmethod
-    def obtener_todas(limite=100, offset=0):
-        """Obtiene todas las compras con paginación"""
+    def obtener_todas(limite=100, offset=0, cursor=None):
+        """
+        Obtiene todas las compras con paginación (más recientes primero)
+        
+        Args:
+            cursor: (fecha, id) de la última compra de la página anterior.
+                    Con cursor se ignora el offset (costo constante por página)
+        """
         query = """
             SELECT c.id, c.numero_factura, c.proveedor_id, p.nombre as proveedor_nombre,
                    c.usuario_id, u.nombre as usuario_nombre,
@@ -59,10 +66,22 @@ class CompraModel:
             FROM compras c
             INNER JOIN proveedores p ON c.proveedor_id = p.id
             INNER JOIN usuarios u ON c.usuario_id = u.id
-            ORDER BY c.fecha DESC
-            LIMIT %s OFFSET %s
         """
-        return Database.execute_query(query, (limite, offset), fetch_all=True)
+        params = []
+        
+        if cursor:
+            fecha, compra_id = cursor
+            query += " WHERE c.fecha < %s OR (c.fecha = %s AND c.id < %s)"
+            params.extend([fecha, fecha, compra_id])
+        
+        query += " ORDER BY c.fecha DESC, c.id DESC LIMIT %s"
+        params.append(limite)
+        
+        if offset and not cursor:
+            query += " OFFSET %s"
+            params.append(offset)
+        
+        return Database.execute_query(query, tuple(params), fetch_all=True)
     
     @staticmethod
     def obtener_por_proveedor(proveedor_id):
@@ -84,10 +103,10 @@ class CompraModel:
             FROM compras c
             INNER JOIN proveedores p ON c.proveedor_id = p.id
             INNER JOIN usuarios u ON c.usuario_id = u.id
-            WHERE DATE(c.fecha) BETWEEN %s AND %s
+            WHERE c.fecha >= %s AND c.fecha < %s
             ORDER BY c.fecha DESC
         """
-        return Database.execute_query(query, (fecha_inicio, fecha_fin), fetch_all=True)
+        return Database.execute_query(query, FechaHelper.rango(fecha_inicio, fecha_fin), fetch_all=True)
     
     @staticmethod
     def obtener_detalles(compra_id):
@@ -115,9 +134,9 @@ class CompraModel:
                 SUM(total) as total_gastado,
                 AVG(total) as compra_promedio
             FROM compras
-            WHERE YEAR(fecha) = %s AND MONTH(fecha) = %s
+            WHERE fecha >= %s AND fecha < %s
         """
-        return Database.execute_query(query, (año, mes), fetch_one=True)
+        return Database.execute_query(query, FechaHelper.rango_mes(año, mes), fetch_one=True)
     
     @staticmethod
     def agregar_a_cola_pendientes(compra_id):
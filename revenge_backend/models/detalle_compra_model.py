@@ -25,28 +25,38 @@ class DetalleCompraModel:
             raise
     
     @staticmethod
-    def crear_multiples(compra_id, detalles_lista):
+    def crear_multiples(compra_id, detalles_lista, cursor=None):
         """
-        Crea múltiples detalles de compra en una transacción
+        Crea múltiples detalles de compra con un solo INSERT multi-fila
         
         Args:
             detalles_lista: Lista de diccionarios con los detalles
+            cursor: Cursor de una transacción existente (opcional)
         """
         query = """
             INSERT INTO detalle_compra (compra_id, producto_id, cantidad, precio_unitario)
             VALUES (%s, %s, %s, %s)
         """
+        params = [
+            (
+                compra_id,
+                detalle['producto_id'],
+                detalle['cantidad'],
+                detalle['precio_unitario']
+            )
+            for detalle in detalles_lista
+        ]
+        
+        if not params:
+            return True
+        
+        if cursor:
+            cursor.executemany(query, params)
+            return True
         
         try:
             with Database.get_cursor(commit=True) as cursor:
-                for detalle in detalles_lista:
-                    params = (
-                        compra_id,
-                        detalle['producto_id'],
-                        detalle['cantidad'],
-                        detalle['precio_unitario']
-                    )
-                    cursor.execute(query, params)
+                cursor.executemany(query, params)
             
             return True
         except Exception as e:
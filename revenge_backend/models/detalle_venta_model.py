@@ -27,9 +27,9 @@ class DetalleVentaModel:
             raise
     
     @staticmethod
-    def crear_multiples(venta_id, detalles_lista):
+    def crear_multiples(venta_id, detalles_lista, cursor=None):
         """
-        Crea múltiples detalles de venta en una transacción
+        Crea múltiples detalles de venta con un solo INSERT multi-fila
         
         Args:
             detalles_lista: Lista de diccionarios con los detalles
@@ -42,24 +42,34 @@ class DetalleVentaModel:
                 },
                 ...
             ]
+            cursor: Cursor de una transacción existente (opcional)
         """
         query = """
             INSERT INTO detalle_venta (venta_id, producto_id, cantidad, 
                                       precio_unitario, descuento_unitario)
             VALUES (%s, %s, %s, %s, %s)
         """
+        params = [
+            (
+                venta_id,
+                detalle['producto_id'],
+                detalle['cantidad'],
+                detalle['precio_unitario'],
+                detalle.get('descuento_unitario', 0)
+            )
+            for detalle in detalles_lista
+        ]
+        
+        if not params:
+            return True
+        
+        if cursor:
+            cursor.executemany(query, params)
+            return True
         
         try:
             with Database.get_cursor(commit=True) as cursor:
-                for detalle in detalles_lista:
-                    params = (
-                        venta_id,
-                        detalle['producto_id'],
-                        detalle['cantidad'],
-                        detalle['precio_unitario'],
-                        detalle.get('descuento_unitario', 0)
-                    )
-                    cursor.execute(query, params)
+                cursor.executemany(query, params)
             
             return True
         except Exception as e:
@@ -0,0 +1,118 @@
+"""
+Modelo Permisos por Rol
+Estructura: Registro compilado a máscaras de bits
+- Cada permiso tiene un bit; cada rol, la OR de sus permisos
+- Se carga una vez por proceso desde roles_permisos; verificar es un AND
+"""
+
+import threading
+from config.database import Database
+from utils.cache_sync import CacheSync
+
+
+class PermisoModel:
+    """Registro de permisos por rol"""
+    
+    TODOS = -1  # Máscara con todos los bits ('*')
+    
+    # Respaldo si la tabla roles_permisos no existe o no responde
+    POR_DEFECTO = {
+        1: ['*'],  # Administrador: todos los permisos
+        2: ['venta', 'ver_productos', 'ver_categorias'],  # Cajero
+        3: ['compra', 'gestion_productos', 'gestion_inventario',
+            'gestion_proveedores', 'ver_productos', 'ver_categorias']  # Trabajador
+    }
+    
+    # (bits {permiso: bit}, mascaras {rol_id: int}); se reemplaza completo al recargar
+    _registro = None
+    _lock = threading.Lock()
+    
+    @staticmethod
+    def _compilar(permisos_por_rol):
+        """
+        Compila {rol_id: [permisos]} a máscaras de bits
+        
+        Returns:
+            tuple: (bits, mascaras)
+        """
+        nombres = sorted({p for permisos in permisos_por_rol.values() for p in permisos if p != '*'})
+        bits = {nombre: 1 << posicion for posicion, nombre in enumerate(nombres)}
+        
+        mascaras = {}
+        for rol_id, permisos in permisos_por_rol.items():
+            if '*' in permisos:
+                mascaras[rol_id] = PermisoModel.TODOS
+            else:
+                mascara = 0
+                for permiso in permisos:
+                    mascara |= bits[permiso]
+                mascaras[rol_id] = mascara
+        
+        return bits, mascaras
+    
+    @staticmethod
+    def cargar(_clave=None):
+        """
+        Carga roles_permisos y recompila el registro (al iniciar o por CacheSync)
+        Si falla una recarga se conserva el registro anterior; los permisos por
+        defecto solo se usan si nunca se pudo cargar
+        """
+        try:
+            filas = Database.execute_query(
+                "SELECT rol_id, permiso FROM roles_permisos",
+                fetch_all=True
+            )
+        except Exception as e:
+            if PermisoModel._registro is not None:
+                print(f"⚠️  No se pudo recargar roles_permisos, se mantienen los permisos actuales: {e}")
+                return
+            print(f"⚠️  No se pudo cargar roles_permisos, usando permisos por defecto: {e}")
+            filas = None
+        
+        permisos_por_rol = {}
+        for fila in filas or []:
+            permisos_por_rol.setdefault(fila['rol_id'], []).append(fila['permiso'])
+        
+        PermisoModel._registro = PermisoModel._compilar(permisos_por_rol or PermisoModel.POR_DEFECTO)
+    
+    @staticmethod
+    def _obtener_registro():
+        """Registro compilado (se carga en el primer uso si no se cargó al iniciar)"""
+        registro = PermisoModel._registro
+        if registro is None:
+            with PermisoModel._lock:
+                if PermisoModel._registro is None:
+                    PermisoModel.cargar()
+                registro = PermisoModel._registro
+        return registro
+    
+    @staticmethod
+    def mascara(rol_id):
+        """Máscara de permisos de un rol (0 si no existe)"""
+        return PermisoModel._obtener_registro()[1].get(rol_id, 0)
+    
+    @staticmethod
+    def tiene_permiso(rol_id, permiso):
+        """
+        Verifica si un rol tiene un permiso
+        
+        Args:
+            rol_id: ID del rol (del token)
+            permiso: 'venta', 'compra', 'gestion_usuarios', etc.
+        """
+        bits, mascaras = PermisoModel._obtener_registro()
+        mascara = mascaras.get(rol_id, 0)
+        if mascara == PermisoModel.TODOS:
+            return True
+        
+        bit = bits.get(permiso)
+        return bit is not None and bool(mascara & bit)
+    
+    @staticmethod
+    def es_administrador(rol_id):
+        """Un rol es administrador si tiene todos los permisos ('*')"""
+        return PermisoModel.mascara(rol_id) == PermisoModel.TODOS
+
+
+# Los cambios en roles_permisos publicados por CacheSync recargan el registro
+CacheSync.registrar('roles_permisos', PermisoModel.cargar)
@@ -1,17 +1,34 @@
 """
 Modelo Producto
-Estructura: Diccionario (hash map) para búsqueda instantánea por código o nombre
+Estructura: Cache LRU (hash map + lista enlazada) para búsqueda instantánea por ID o código
 """
 
+import os
+import threading
 from config.database import Database
+from utils.cache_sync import CacheSync
+from utils.lru_cache import LRUCache
+from utils.indice_busqueda import IndiceBusqueda
 
 
 class ProductoModel:
     """Modelo para manejar productos con búsqueda optimizada"""
     
-    # Cache en memoria como hash map
-    _productos_por_codigo = {}  # Búsqueda por código de barras O(1)
-    _productos_por_id = {}      # Búsqueda por ID O(1)
+    # Cache LRU por ID con índice secundario por código de barras - O(1)
+    _cache = LRUCache(
+        'productos',
+        max_items=int(os.getenv('CACHE_PRODUCTOS_MAX', 10000)),
+        indices={'codigo': lambda producto: producto.get('codigo_barras')}
+    )
+    
+    # Índice invertido para búsqueda por texto (nombre, código, descripción)
+    _indice = IndiceBusqueda(
+        {'nombre': 3, 'codigo_barras': 3, 'descripcion': 1},
+        campos_sin_subcadena=('codigo_barras',)
+    )
+    _indice_pendientes = set()  # IDs a reindexar (escrituras locales o de otros workers)
+    _indice_lock = threading.Lock()
+    _indice_cargando = False
     
     @staticmethod
     def crear(codigo_barras, nombre, descripcion, categoria_id, precio_compra, 
@@ -36,6 +53,8 @@ class ProductoModel:
                     None, 'sistema', 'Stock inicial', created_by
                 )
             
+            ProductoModel.reindexar([producto_id])
+            
             return producto_id
         except Exception as e:
             print(f"Error creando producto: {e}")
@@ -45,8 +64,9 @@ class ProductoModel:
     def obtener_por_id(producto_id):
         """Obtiene un producto por ID - O(1)"""
         # Buscar en cache
-        if producto_id in ProductoModel._productos_por_id:
-            return ProductoModel._productos_por_id[producto_id]
+        producto = ProductoModel._cache.obtener(producto_id)
+        if producto:
+            return producto
         
         query = """
             SELECT p.*, c.nombre as categoria_nombre, e.nombre as estado_nombre
@@ -59,17 +79,56 @@ class ProductoModel:
         
         # Guardar en cache
         if producto:
-            ProductoModel._productos_por_id[producto_id] = producto
-            ProductoModel._productos_por_codigo[producto['codigo_barras']] = producto
+            ProductoModel._cache.guardar(producto['id'], producto)
         
         return producto
     
+    @staticmethod
+    def obtener_por_ids(producto_ids):
+        """
+        Obtiene varios productos por ID en una sola consulta
+        Los que están en cache se sirven desde memoria, el resto con un único IN (...)
+        
+        Returns:
+            dict: {producto_id: producto} (los IDs inexistentes no aparecen)
+        """
+        productos = {}
+        faltantes = []
+        
+        for producto_id in dict.fromkeys(producto_ids):
+            producto = ProductoModel._cache.obtener(producto_id)
+            if producto:
+                productos[producto_id] = producto
+            else:
+                faltantes.append(producto_id)
+        
+        if not faltantes:
+            return productos
+        
+        placeholders = ', '.join(['%s'] * len(faltantes))
+        query = f"""
+            SELECT p.*, c.nombre as categoria_nombre, e.nombre as estado_nombre
+            FROM productos p
+            INNER JOIN categorias c ON p.categoria_id = c.id
+            INNER JOIN estados e ON p.estado_id = e.id
+            WHERE p.id IN ({placeholders}) AND p.deleted_at IS NULL
+        """
+        resultados = Database.execute_query(query, tuple(faltantes), fetch_all=True)
+        
+        # Guardar en cache
+        for producto in resultados:
+            ProductoModel._cache.guardar(producto['id'], producto)
+            productos[producto['id']] = producto
+        
+        return productos
+    
     @staticmethod
     def obtener_por_codigo(codigo_barras):
         """Obtiene un producto por código de barras - O(1)"""
         # Buscar en cache
-        if codigo_barras in ProductoModel._productos_por_codigo:
-            return ProductoModel._productos_por_codigo[codigo_barras]
+        producto = ProductoModel._cache.obtener_por('codigo', codigo_barras)
+        if producto:
+            return producto
         
         query = """
             SELECT p.*, c.nombre as categoria_nombre, e.nombre as estado_nombre
@@ -82,24 +141,44 @@ class ProductoModel:
         
         # Guardar en cache
         if producto:
-            ProductoModel._productos_por_codigo[codigo_barras] = producto
-            ProductoModel._productos_por_id[producto['id']] = producto
+            ProductoModel._cache.guardar(producto['id'], producto)
         
         return producto
     
     @staticmethod
-    def buscar_por_nombre(nombre):
-        """Busca productos por nombre (búsqueda parcial)"""
+    def buscar_por_nombre(nombre, limite=50, difuso=False):
+        """
+        Busca productos por nombre, código o descripción (prefijo y subcadena)
+        Responde desde el índice invertido; usa SQL solo mientras el índice está frío
+        
+        Args:
+            difuso: Tolerar errores de tipeo (distancia de edición 1-2 por término)
+        """
+        CacheSync.sincronizar()
+        
+        if ProductoModel._indice.listo:
+            ProductoModel._aplicar_pendientes_indice()
+            
+            ids = ProductoModel._indice.buscar(nombre, limite, difuso=difuso)
+            productos = ProductoModel.obtener_por_ids(ids)
+            return [productos[producto_id] for producto_id in ids if producto_id in productos]
+        
+        ProductoModel._calentar_indice()
+        
+        # Índice frío: mismos campos que el índice (sin tolerancia a errores de tipeo)
         query = """
             SELECT p.*, c.nombre as categoria_nombre, e.nombre as estado_nombre
             FROM productos p
             INNER JOIN categorias c ON p.categoria_id = c.id
             INNER JOIN estados e ON p.estado_id = e.id
-            WHERE p.nombre LIKE %s AND p.deleted_at IS NULL
+            WHERE (p.nombre LIKE %s OR p.codigo_barras LIKE %s OR p.descripcion LIKE %s)
+              AND p.deleted_at IS NULL
             ORDER BY p.nombre
-            LIMIT 50
+            LIMIT %s
         """
-        return Database.execute_query(query, (f"%{nombre}%",), fetch_all=True)
+        patron = f"%{nombre}%"
+        # El código se busca por prefijo, como en el índice (campos_sin_subcadena)
+        return Database.execute_query(query, (patron, f"{nombre}%", patron, limite), fetch_all=True)
     
     @staticmethod
     def obtener_todos(incluir_inactivos=False):
@@ -171,8 +250,10 @@ class ProductoModel:
         try:
             filas_afectadas = Database.execute_query(query, tuple(valores), commit=True)
             
-            # Limpiar cache
-            ProductoModel._limpiar_cache_producto(producto_id)
+            # Limpiar cache (local y en los demás workers)
+            ProductoModel.invalidar_cache([producto_id])
+            if {'nombre', 'descripcion', 'estado_id'} & set(kwargs):
+                ProductoModel.reindexar([producto_id])
             
             return filas_afectadas > 0
         except Exception as e:
@@ -182,27 +263,30 @@ class ProductoModel:
     @staticmethod
     def actualizar_stock(producto_id, nueva_cantidad, tipo_movimiento, 
                         referencia_id=None, referencia_tipo=None, 
-                        motivo=None, usuario_id=None):
+                        motivo=None, usuario_id=None, variacion=None):
         """
         Actualiza el stock de un producto y registra el movimiento
+        El stock anterior se lee de la fila bloqueada (FOR UPDATE), no del cache
         
         Args:
+            nueva_cantidad: Stock final (se ignora si se indica variacion)
             tipo_movimiento: 'entrada', 'salida', 'ajuste'
+            variacion: Cantidad a sumar (o restar si es negativa) al stock actual
         """
-        # Obtener stock actual
-        producto = ProductoModel.obtener_por_id(producto_id)
-        if not producto:
-            raise Exception("Producto no encontrado")
-        
-        stock_anterior = producto['stock']
-        stock_nuevo = nueva_cantidad
-        cantidad_movimiento = stock_nuevo - stock_anterior
-        
-        # Actualizar stock
         query = "UPDATE productos SET stock = %s, updated_at = NOW() WHERE id = %s"
         
         try:
             with Database.get_cursor(commit=True) as cursor:
+                stock_bloqueado = ProductoModel.bloquear_stock([producto_id], cursor)
+                if producto_id not in stock_bloqueado:
+                    raise Exception("Producto no encontrado")
+                
+                stock_anterior = stock_bloqueado[producto_id]
+                stock_nuevo = stock_anterior + variacion if variacion is not None else nueva_cantidad
+                if stock_nuevo < 0:
+                    raise ValueError(f"Stock insuficiente. Disponible: {stock_anterior}")
+                cantidad_movimiento = stock_nuevo - stock_anterior
+                
                 cursor.execute(query, (stock_nuevo, producto_id))
                 
                 # Registrar movimiento
@@ -211,15 +295,38 @@ class ProductoModel:
                     stock_anterior, stock_nuevo, referencia_id,
                     referencia_tipo, motivo, usuario_id, cursor
                 )
-            
-            # Limpiar cache
-            ProductoModel._limpiar_cache_producto(producto_id)
+                
+                # Limpiar cache (se publica junto con la transacción)
+                ProductoModel.invalidar_cache([producto_id], cursor)
             
             return True
         except Exception as e:
             print(f"Error actualizando stock: {e}")
             raise
     
+    @staticmethod
+    def bloquear_stock(producto_ids, cursor):
+        """
+        Bloquea las filas de los productos (SELECT ... FOR UPDATE) en orden de ID
+        y retorna su stock actual. Debe llamarse dentro de una transacción.
+        
+        Returns:
+            dict: {producto_id: stock} (los productos eliminados no aparecen)
+        """
+        ids = sorted(set(producto_ids))
+        if not ids:
+            return {}
+        
+        placeholders = ', '.join(['%s'] * len(ids))
+        query = f"""
+            SELECT id, stock FROM productos
+            WHERE id IN ({placeholders}) AND deleted_at IS NULL
+            ORDER BY id
+            FOR UPDATE
+        """
+        cursor.execute(query, tuple(ids))
+        return {fila['id']: int(fila['stock']) for fila in cursor.fetchall()}
+    
     @staticmethod
     def eliminar_logico(producto_id):
         """Elimina lógicamente un producto"""
@@ -227,7 +334,8 @@ class ProductoModel:
         
         try:
             filas_afectadas = Database.execute_query(query, (producto_id,), commit=True)
-            ProductoModel._limpiar_cache_producto(producto_id)
+            ProductoModel.invalidar_cache([producto_id])
+            ProductoModel.reindexar([producto_id])
             return filas_afectadas > 0
         except Exception as e:
             print(f"Error eliminando producto: {e}")
@@ -264,6 +372,71 @@ class ProductoModel:
         else:
             Database.execute_query(query, params, commit=True)
     
+    @staticmethod
+    def registrar_movimientos_lote(movimientos, cursor):
+        """
+        Registra varios movimientos de inventario con un solo INSERT multi-fila
+        
+        Args:
+            movimientos: Lista de tuplas con el mismo orden que _registrar_movimiento
+                (producto_id, tipo, cantidad, stock_anterior, stock_nuevo,
+                 referencia_id, referencia_tipo, motivo, usuario_id)
+            cursor: Cursor de la transacción en curso
+        """
+        if not movimientos:
+            return
+        
+        # Todos los valores como placeholders para que executemany
+        # los agrupe en un único INSERT ... VALUES (...), (...)
+        query = """
+            INSERT INTO movimientos_inventario 
+            (producto_id, tipo, cantidad, stock_anterior, stock_nuevo,
+             referencia_id, referencia_tipo, motivo, usuario_id)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """
+        cursor.executemany(query, movimientos)
+    
+    @staticmethod
+    def actualizar_stock_lote(variaciones, cursor, precios_compra=None):
+        """
+        Aplica variaciones de stock a varios productos con un solo UPDATE ... CASE
+        
+        Args:
+            variaciones: dict {producto_id: cantidad} (positiva suma, negativa resta)
+            cursor: Cursor de la transacción en curso
+            precios_compra: dict opcional {producto_id: precio}, sube precio_compra
+                solo si el nuevo precio es mayor al actual
+        
+        Returns:
+            int: Filas afectadas
+        """
+        if not variaciones:
+            return 0
+        
+        # Orden fijo por ID para que las transacciones concurrentes bloqueen
+        # las filas en el mismo orden
+        ids = sorted(variaciones)
+        casos = ' '.join(['WHEN %s THEN %s'] * len(ids))
+        
+        asignaciones = [f"stock = stock + CASE id {casos} ELSE 0 END"]
+        params = [valor for pid in ids for valor in (pid, variaciones[pid])]
+        
+        if precios_compra:
+            ids_precio = sorted(precios_compra)
+            casos_precio = ' '.join(['WHEN %s THEN GREATEST(precio_compra, %s)'] * len(ids_precio))
+            asignaciones.append(f"precio_compra = CASE id {casos_precio} ELSE precio_compra END")
+            params.extend(valor for pid in ids_precio for valor in (pid, precios_compra[pid]))
+        
+        placeholders = ', '.join(['%s'] * len(ids))
+        query = f"""
+            UPDATE productos SET {', '.join(asignaciones)}, updated_at = NOW()
+            WHERE id IN ({placeholders})
+        """
+        params.extend(ids)
+        
+        cursor.execute(query, tuple(params))
+        return cursor.rowcount
+    
     @staticmethod
     def obtener_movimientos(producto_id, limite=50):
         """Obtiene el historial de movimientos de un producto"""
@@ -278,33 +451,103 @@ class ProductoModel:
         return Database.execute_query(query, (producto_id, limite), fetch_all=True)
     
     @staticmethod
-    def _limpiar_cache_producto(producto_id):
-        """Limpia el cache de un producto específico"""
-        if producto_id in ProductoModel._productos_por_id:
-            producto = ProductoModel._productos_por_id[producto_id]
-            codigo = producto.get('codigo_barras')
-            
-            del ProductoModel._productos_por_id[producto_id]
-            
-            if codigo and codigo in ProductoModel._productos_por_codigo:
-                del ProductoModel._productos_por_codigo[codigo]
+    def invalidar_cache(producto_ids, cursor=None):
+        """
+        Invalida productos en el cache de este worker y publica la invalidación
+        para los demás (dentro de la transacción si se pasa el cursor)
+        """
+        CacheSync.invalidar('productos', list(producto_ids), cursor)
     
     @staticmethod
     def cargar_cache():
-        """Carga todos los productos activos en cache"""
+        """Carga todos los productos activos en cache y en el índice de búsqueda"""
         productos = ProductoModel.obtener_todos()
         
-        ProductoModel._productos_por_id.clear()
-        ProductoModel._productos_por_codigo.clear()
+        ProductoModel._cache.limpiar()
         
         for producto in productos:
-            ProductoModel._productos_por_id[producto['id']] = producto
-            ProductoModel._productos_por_codigo[producto['codigo_barras']] = producto
+            ProductoModel._cache.guardar(producto['id'], producto)
+        
+        ProductoModel._indice.cargar(productos)
     
     @staticmethod
     def obtener_cache():
         """Retorna el cache de productos"""
         return {
-            'por_id': ProductoModel._productos_por_id,
-            'por_codigo': ProductoModel._productos_por_codigo
+            'por_id': ProductoModel._cache.como_dict(),
+            'por_codigo': ProductoModel._cache.indice_como_dict('codigo')
         }
+    
+    @staticmethod
+    def reindexar(producto_ids):
+        """
+        Marca productos para reindexar en este worker y en los demás
+        (se reindexan desde la base de datos antes de la próxima búsqueda)
+        """
+        CacheSync.invalidar('busqueda_productos', list(producto_ids))
+    
+    @staticmethod
+    def _marcar_para_reindexar(clave):
+        """Handler de CacheSync: clave None deja el índice frío"""
+        if clave is None:
+            ProductoModel._indice.invalidar()
+        else:
+            with ProductoModel._indice_lock:
+                ProductoModel._indice_pendientes.add(int(clave))
+    
+    @staticmethod
+    def _aplicar_pendientes_indice():
+        """Reindexa los productos modificados desde la última búsqueda"""
+        with ProductoModel._indice_lock:
+            if not ProductoModel._indice_pendientes:
+                return
+            pendientes = list(ProductoModel._indice_pendientes)
+            ProductoModel._indice_pendientes.clear()
+        
+        placeholders = ', '.join(['%s'] * len(pendientes))
+        query = f"""
+            SELECT id, codigo_barras, nombre, descripcion
+            FROM productos
+            WHERE id IN ({placeholders}) AND deleted_at IS NULL AND estado_id = 1
+        """
+        try:
+            vigentes = Database.execute_query(query, tuple(pendientes), fetch_all=True)
+        except Exception as e:
+            with ProductoModel._indice_lock:
+                ProductoModel._indice_pendientes.update(pendientes)
+            print(f"❌ Error reindexando productos: {e}")
+            return
+        
+        # Los que ya no están activos salen del índice
+        encontrados = {producto['id'] for producto in vigentes}
+        for producto in vigentes:
+            ProductoModel._indice.agregar(producto['id'], producto)
+        for producto_id in pendientes:
+            if producto_id not in encontrados:
+                ProductoModel._indice.quitar(producto_id)
+    
+    @staticmethod
+    def _calentar_indice():
+        """Carga el índice en segundo plano (una sola carga a la vez)"""
+        with ProductoModel._indice_lock:
+            if ProductoModel._indice_cargando:
+                return
+            ProductoModel._indice_cargando = True
+        
+        def cargar():
+            try:
+                ProductoModel.cargar_cache()
+            except Exception as e:
+                print(f"❌ Error cargando índice de búsqueda: {e}")
+            finally:
+                ProductoModel._indice_cargando = False
+        
+        threading.Thread(target=cargar, daemon=True).start()
+    
+    @staticmethod
+    def estadisticas_cache():
+        """Retorna hits, misses y desalojos del cache de productos"""
+        return ProductoModel._cache.estadisticas()
+
+
+CacheSync.registrar('busqueda_productos', ProductoModel._marcar_para_reindexar)
@@ -1,13 +1,20 @@
 """
 Modelo Proveedor
+Estructura: Cache LRU (hash map + lista enlazada) para búsqueda por ID
 """
 
+import os
 from config.database import Database
+from utils.cache_sync import CacheSync
+from utils.lru_cache import LRUCache
 
 
 class ProveedorModel:
     """Modelo para manejar proveedores"""
     
+    # Cache LRU por ID (lo usa cada compra registrada)
+    _cache = LRUCache('proveedores', max_items=int(os.getenv('CACHE_PROVEEDORES_MAX', 1000)))
+    
     @staticmethod
     def crear(nombre, ruc=None, telefono=None, direccion=None, 
               email=None, contacto=None, created_by=None):
@@ -28,14 +35,25 @@ class ProveedorModel:
     
     @staticmethod
     def obtener_por_id(proveedor_id):
-        """Obtiene un proveedor por ID"""
+        """Obtiene un proveedor por ID - O(1)"""
+        # Primero busca en cache
+        proveedor = ProveedorModel._cache.obtener(proveedor_id)
+        if proveedor:
+            return proveedor
+        
         query = """
             SELECT p.*, e.nombre as estado_nombre
             FROM proveedores p
             INNER JOIN estados e ON p.estado_id = e.id
             WHERE p.id = %s AND p.deleted_at IS NULL
         """
-        return Database.execute_query(query, (proveedor_id,), fetch_one=True)
+        proveedor = Database.execute_query(query, (proveedor_id,), fetch_one=True)
+        
+        # Guardar en cache
+        if proveedor:
+            ProveedorModel._cache.guardar(proveedor['id'], proveedor)
+        
+        return proveedor
     
     @staticmethod
     def obtener_por_ruc(ruc):
@@ -96,6 +114,10 @@ class ProveedorModel:
         
         try:
             filas_afectadas = Database.execute_query(query, tuple(valores), commit=True)
+            
+            # Limpiar cache (local y en los demás workers)
+            CacheSync.invalidar('proveedores', [proveedor_id])
+            
             return filas_afectadas > 0
         except Exception as e:
             print(f"Error actualizando proveedor: {e}")
@@ -115,6 +137,7 @@ class ProveedorModel:
         
         try:
             filas_afectadas = Database.execute_query(query, (proveedor_id,), commit=True)
+            CacheSync.invalidar('proveedores', [proveedor_id])
             return filas_afectadas > 0
         except Exception as e:
             print(f"Error eliminando proveedor: {e}")
@@ -1,15 +1,109 @@
 """
 Modelo de Reportes
 Consultas especializadas para generación de reportes
+Estructura: Caches LRU de resultados por (tipo, rango de fechas normalizado)
+- Periodos cerrados: no cambian, se guardan por mucho tiempo
+- Periodos que incluyen hoy: se vacían al confirmar una venta o compra
 """
 
 from config.database import Database
+from utils.fecha_helper import FechaHelper
+from utils.lru_cache import LRUCache
+from utils.cache_sync import CacheSync
 from datetime import datetime, timedelta
+import os
+import time
 
 
 class ReporteModel:
     """Modelo para consultas de reportes"""
     
+    # Plazo máximo de cada reporte (segundos)
+    TIMEOUT = float(os.getenv('REPORTE_TIMEOUT', 30))
+    
+    # Un rango se considera cerrado cuando terminó hace más de este margen
+    # (ventas que confirman justo después de medianoche)
+    MARGEN_CIERRE = timedelta(seconds=60)
+    
+    # Las ventas y compras se fechan con el reloj de MySQL (CURRENT_TIMESTAMP), que
+    # puede estar en otra zona horaria que la app: el cierre se decide con la hora
+    # de la BD. El desfase se mide con SELECT NOW() y se vuelve a medir cada tanto
+    DESFASE_TTL = float(os.getenv('REPORTE_DESFASE_TTL', 3600))
+    _desfase = None  # (hora BD - hora app, time.monotonic() de la medición)
+    
+    # Los datos cacheados se comparten entre peticiones: son de solo lectura
+    _cache_cerrados = LRUCache(
+        'reportes',
+        max_items=int(os.getenv('CACHE_REPORTES_MAX', 200)),
+        ttl=float(os.getenv('CACHE_REPORTES_TTL', 86400)),
+        tipo_clave=str
+    )
+    _cache_abiertos = LRUCache(
+        'reportes_abiertos',
+        max_items=int(os.getenv('CACHE_REPORTES_MAX', 200)),
+        tipo_clave=str
+    )
+    
+    @staticmethod
+    def _con_cache(tipo, fecha_inicio, fecha_fin, calcular):
+        """
+        Retorna el reporte desde el cache o lo calcula y lo guarda
+        
+        Args:
+            tipo (str): 'ventas' o 'compras'
+            calcular: funcion(fecha_inicio, fecha_fin) -> dict
+        """
+        inicio = FechaHelper.a_fecha(fecha_inicio).isoformat()
+        fin = FechaHelper.a_fecha(fecha_fin).isoformat()
+        clave = (tipo, inicio, fin)
+        
+        _, hasta = FechaHelper.rango(inicio, fin)
+        try:
+            cerrado = hasta <= ReporteModel._ahora_bd() - ReporteModel.MARGEN_CIERRE
+        except Exception as e:
+            # Sin la hora de la BD no se puede saber si el día cerró: se trata como abierto
+            print(f"⚠️  No se pudo leer la hora de MySQL: {e}")
+            cerrado = False
+        cache = ReporteModel._cache_cerrados if cerrado else ReporteModel._cache_abiertos
+        
+        datos = cache.obtener(clave)
+        if datos is None:
+            datos = calcular(inicio, fin)
+            cache.guardar(clave, datos)
+        return datos
+    
+    @staticmethod
+    def _ahora_bd():
+        """Hora actual según MySQL (hora de la app + desfase medido)"""
+        medicion = ReporteModel._desfase
+        if medicion is None or time.monotonic() - medicion[1] > ReporteModel.DESFASE_TTL:
+            fila = Database.execute_query("SELECT NOW() as ahora", fetch_one=True)
+            medicion = (fila['ahora'] - datetime.now(), time.monotonic())
+            ReporteModel._desfase = medicion
+        return datetime.now() + medicion[0]
+    
+    @staticmethod
+    def invalidar_cache_abiertos(cursor=None):
+        """
+        Vacía los reportes de rangos que incluyen hoy (en todos los workers)
+        Llamar dentro de la transacción de una venta o compra
+        """
+        CacheSync.invalidar('reportes_abiertos', None, cursor)
+    
+    @staticmethod
+    def invalidar_cache(cursor=None):
+        """Vacía todos los reportes cacheados (ej. tras reconstruir agregados)"""
+        CacheSync.invalidar('reportes', None, cursor)
+        CacheSync.invalidar('reportes_abiertos', None, cursor)
+    
+    @staticmethod
+    def estadisticas_cache():
+        """Retorna las estadísticas de los caches de reportes"""
+        return {
+            'cerrados': ReporteModel._cache_cerrados.estadisticas(),
+            'abiertos': ReporteModel._cache_abiertos.estadisticas()
+        }
+    
     @staticmethod
     def reporte_ventas(fecha_inicio=None, fecha_fin=None):
         """
@@ -28,31 +122,39 @@ class ReporteModel:
         if not fecha_fin:
             fecha_fin = datetime.now().strftime('%Y-%m-%d')
         
+        return ReporteModel._con_cache('ventas', fecha_inicio, fecha_fin, ReporteModel._calcular_ventas)
+    
+    @staticmethod
+    def _calcular_ventas(fecha_inicio, fecha_fin):
+        """Ejecuta las consultas del reporte de ventas"""
+        # Límites semiabiertos [inicio, fin + 1 día): usan el índice sobre fecha
+        desde, hasta = FechaHelper.rango(fecha_inicio, fecha_fin)
+        
+        # Todas las consultas leen de los agregados diarios (models/venta_diaria_model.py)
+        
         # Resumen general
         query_resumen = """
             SELECT 
-                COUNT(*) as total_ventas,
+                CAST(COALESCE(SUM(num_ventas), 0) AS UNSIGNED) as total_ventas,
                 COALESCE(SUM(total), 0) as monto_total,
-                COALESCE(AVG(total), 0) as promedio_venta,
-                COALESCE(MIN(total), 0) as venta_minima,
-                COALESCE(MAX(total), 0) as venta_maxima
-            FROM ventas
-            WHERE DATE(fecha) BETWEEN %s AND %s
+                COALESCE(SUM(total) / NULLIF(SUM(num_ventas), 0), 0) as promedio_venta,
+                COALESCE(MIN(total_min), 0) as venta_minima,
+                COALESCE(MAX(total_max), 0) as venta_maxima
+            FROM ventas_diarias
+            WHERE fecha >= %s AND fecha < %s
         """
-        resumen = Database.execute_query(query_resumen, (fecha_inicio, fecha_fin), fetch_one=True)
         
         # Ventas por día
         query_por_dia = """
             SELECT 
-                DATE(fecha) as fecha,
-                COUNT(*) as cantidad,
+                fecha,
+                CAST(SUM(num_ventas) AS UNSIGNED) as cantidad,
                 COALESCE(SUM(total), 0) as total
-            FROM ventas
-            WHERE DATE(fecha) BETWEEN %s AND %s
-            GROUP BY DATE(fecha)
+            FROM ventas_diarias
+            WHERE fecha >= %s AND fecha < %s
+            GROUP BY fecha
             ORDER BY fecha
         """
-        ventas_por_dia = Database.execute_query(query_por_dia, (fecha_inicio, fecha_fin))
         
         # Productos más vendidos (con más detalles)
         query_productos = """
@@ -60,56 +162,77 @@ class ReporteModel:
                 p.codigo_barras,
                 p.nombre as producto,
                 c.nombre as categoria,
-                SUM(dv.cantidad) as cantidad_vendida,
-                dv.precio_unitario,
-                COALESCE(SUM(dv.subtotal), 0) as total_vendido
-            FROM detalle_venta dv
-            INNER JOIN productos p ON dv.producto_id = p.id
+                SUM(vd.cantidad) as cantidad_vendida,
+                COALESCE(SUM(vd.importe) / NULLIF(SUM(vd.cantidad), 0), 0) as precio_unitario,
+                COALESCE(SUM(vd.importe), 0) as total_vendido
+            FROM ventas_diarias_productos vd
+            INNER JOIN productos p ON vd.producto_id = p.id
             INNER JOIN categorias c ON p.categoria_id = c.id
-            INNER JOIN ventas v ON dv.venta_id = v.id
-            WHERE DATE(v.fecha) BETWEEN %s AND %s
-            GROUP BY p.id, p.codigo_barras, p.nombre, c.nombre, dv.precio_unitario
+            WHERE vd.fecha >= %s AND vd.fecha < %s
+            GROUP BY p.id, p.codigo_barras, p.nombre, c.nombre
             ORDER BY cantidad_vendida DESC
             LIMIT 10
         """
-        productos_mas_vendidos = Database.execute_query(query_productos, (fecha_inicio, fecha_fin))
-        
-        # Calcular total general para porcentajes
-        total_general = float(resumen['monto_total']) if resumen else 0.0
         
         # Ventas por método de pago
         query_metodos = """
             SELECT 
                 mp.nombre as metodo_pago,
-                COUNT(*) as cantidad,
-                COALESCE(SUM(v.total), 0) as total
-            FROM ventas v
-            INNER JOIN metodos_pago mp ON v.metodo_pago_id = mp.id
-            WHERE DATE(v.fecha) BETWEEN %s AND %s
+                CAST(SUM(vd.num_ventas) AS UNSIGNED) as cantidad,
+                COALESCE(SUM(vd.total), 0) as total
+            FROM ventas_diarias vd
+            INNER JOIN metodos_pago mp ON vd.metodo_pago_id = mp.id
+            WHERE vd.fecha >= %s AND vd.fecha < %s
             GROUP BY mp.id, mp.nombre
             ORDER BY total DESC
         """
-        ventas_por_metodo = Database.execute_query(query_metodos, (fecha_inicio, fecha_fin))
         
         # Ventas por cajero
         query_cajeros = """
             SELECT 
                 u.nombre as cajero,
-                COUNT(*) as cantidad_ventas,
-                COALESCE(SUM(v.total), 0) as total_vendido
-            FROM ventas v
-            INNER JOIN usuarios u ON v.cajero_id = u.id
-            WHERE DATE(v.fecha) BETWEEN %s AND %s
+                CAST(SUM(vd.num_ventas) AS UNSIGNED) as cantidad_ventas,
+                COALESCE(SUM(vd.total), 0) as total_vendido
+            FROM ventas_diarias vd
+            INNER JOIN usuarios u ON vd.cajero_id = u.id
+            WHERE vd.fecha >= %s AND vd.fecha < %s
             GROUP BY u.id, u.nombre
             ORDER BY total_vendido DESC
         """
-        ventas_por_cajero = Database.execute_query(query_cajeros, (fecha_inicio, fecha_fin))
+        
+        # Las consultas son independientes: se ejecutan en paralelo
+        rango = (desde, hasta)
+        resultados = Database.execute_parallel({
+            'resumen': (query_resumen, rango, True),
+            'por_dia': (query_por_dia, rango, False),
+            'productos': (query_productos, rango, False),
+            'metodos': (query_metodos, rango, False),
+            'cajeros': (query_cajeros, rango, False)
+        }, timeout=ReporteModel.TIMEOUT)
+        return ReporteModel._armar_reporte_ventas(fecha_inicio, fecha_fin, resultados)
+    
+    @staticmethod
+    def _armar_reporte_ventas(fecha_inicio, fecha_fin, resultados):
+        """
+        Arma el reporte de ventas con las filas de las consultas
+        
+        Los conteos salen de SUM() sobre los agregados: MySQL los devuelve como
+        Decimal, así que se convierten a int (mismo tipo que el antiguo COUNT(*))
+        """
+        resumen = resultados['resumen']
+        ventas_por_dia = resultados['por_dia']
+        productos_mas_vendidos = resultados['productos']
+        ventas_por_metodo = resultados['metodos']
+        ventas_por_cajero = resultados['cajeros']
+        
+        # Calcular total general para porcentajes
+        total_general = float(resumen['monto_total']) if resumen else 0.0
         
         return {
             'fecha_inicio': fecha_inicio,
             'fecha_fin': fecha_fin,
             'resumen': {
-                'total_ventas': resumen['total_ventas'] if resumen else 0,
+                'total_ventas': int(resumen['total_ventas']) if resumen else 0,
                 'monto_total': float(resumen['monto_total']) if resumen else 0.0,
                 'promedio_venta': float(resumen['promedio_venta']) if resumen else 0.0,
                 'venta_minima': float(resumen['venta_minima']) if resumen else 0.0,
@@ -118,7 +241,7 @@ class ReporteModel:
             'ventas_por_dia': [
                 {
                     'fecha': str(item['fecha']),
-                    'cantidad': item['cantidad'],
+                    'cantidad': int(item['cantidad']),
                     'total': float(item['total'])
                 } for item in ventas_por_dia
             ],
@@ -136,7 +259,7 @@ class ReporteModel:
             'ventas_por_metodo_pago': [
                 {
                     'metodo': item['metodo_pago'],
-                    'cantidad': item['cantidad'],
+                    'cantidad': int(item['cantidad']),
                     'total': float(item['total']),
                     'porcentaje': round((float(item['total']) / total_general * 100), 2) if total_general > 0 else 0
                 } for item in ventas_por_metodo
@@ -144,9 +267,9 @@ class ReporteModel:
             'ventas_por_cajero': [
                 {
                     'cajero': item['cajero'],
-                    'cantidad': item['cantidad_ventas'],
+                    'cantidad': int(item['cantidad_ventas']),
                     'total': float(item['total_vendido']),
-                    'ticket_promedio': round(float(item['total_vendido']) / item['cantidad_ventas'], 2) if item['cantidad_ventas'] > 0 else 0,
+                    'ticket_promedio': round(float(item['total_vendido']) / int(item['cantidad_ventas']), 2) if item['cantidad_ventas'] > 0 else 0,
                     'porcentaje': round((float(item['total_vendido']) / total_general * 100), 2) if total_general > 0 else 0
                 } for item in ventas_por_cajero
             ]
@@ -171,7 +294,6 @@ class ReporteModel:
             FROM productos
             WHERE deleted_at IS NULL
         """
-        resumen = Database.execute_query(query_resumen, fetch_one=True)
         
         # Productos por categoría
         query_categorias = """
@@ -186,7 +308,6 @@ class ReporteModel:
             GROUP BY c.id, c.nombre
             ORDER BY cantidad_productos DESC
         """
-        productos_por_categoria = Database.execute_query(query_categorias)
         
         # Productos con stock bajo
         query_stock_bajo = """
@@ -203,7 +324,6 @@ class ReporteModel:
             AND p.deleted_at IS NULL
             ORDER BY (p.stock - p.stock_minimo) ASC
         """
-        productos_stock_bajo = Database.execute_query(query_stock_bajo)
         
         # Productos sin stock
         query_sin_stock = """
@@ -218,7 +338,18 @@ class ReporteModel:
             AND p.deleted_at IS NULL
             ORDER BY p.nombre
         """
-        productos_sin_stock = Database.execute_query(query_sin_stock)
+        
+        # Las consultas son independientes: se ejecutan en paralelo
+        resultados = Database.execute_parallel({
+            'resumen': (query_resumen, None, True),
+            'categorias': (query_categorias, None, False),
+            'stock_bajo': (query_stock_bajo, None, False),
+            'sin_stock': (query_sin_stock, None, False)
+        }, timeout=ReporteModel.TIMEOUT)
+        resumen = resultados['resumen']
+        productos_por_categoria = resultados['categorias']
+        productos_stock_bajo = resultados['stock_bajo']
+        productos_sin_stock = resultados['sin_stock']
         
         return {
             'resumen': {
@@ -274,6 +405,14 @@ class ReporteModel:
         if not fecha_fin:
             fecha_fin = datetime.now().strftime('%Y-%m-%d')
         
+        return ReporteModel._con_cache('compras', fecha_inicio, fecha_fin, ReporteModel._calcular_compras)
+    
+    @staticmethod
+    def _calcular_compras(fecha_inicio, fecha_fin):
+        """Ejecuta las consultas del reporte de compras"""
+        # Límites semiabiertos [inicio, fin + 1 día): usan el índice sobre fecha
+        desde, hasta = FechaHelper.rango(fecha_inicio, fecha_fin)
+        
         # Resumen general
         query_resumen = """
             SELECT 
@@ -281,9 +420,8 @@ class ReporteModel:
                 COALESCE(SUM(total), 0) as monto_total,
                 COALESCE(AVG(total), 0) as promedio_compra
             FROM compras
-            WHERE DATE(fecha) BETWEEN %s AND %s
+            WHERE fecha >= %s AND fecha < %s
         """
-        resumen = Database.execute_query(query_resumen, (fecha_inicio, fecha_fin), fetch_one=True)
         
         # Compras por proveedor
         query_proveedores = """
@@ -293,11 +431,10 @@ class ReporteModel:
                 COALESCE(SUM(c.total), 0) as total_comprado
             FROM compras c
             INNER JOIN proveedores pr ON c.proveedor_id = pr.id
-            WHERE DATE(c.fecha) BETWEEN %s AND %s
+            WHERE c.fecha >= %s AND c.fecha < %s
             GROUP BY pr.id, pr.nombre
             ORDER BY total_comprado DESC
         """
-        compras_por_proveedor = Database.execute_query(query_proveedores, (fecha_inicio, fecha_fin))
         
         # Productos más comprados (con más detalles)
         query_productos = """
@@ -312,12 +449,11 @@ class ReporteModel:
             INNER JOIN productos p ON dc.producto_id = p.id
             INNER JOIN categorias c ON p.categoria_id = c.id
             INNER JOIN compras co ON dc.compra_id = co.id
-            WHERE DATE(co.fecha) BETWEEN %s AND %s
+            WHERE co.fecha >= %s AND co.fecha < %s
             GROUP BY p.id, p.codigo_barras, p.nombre, c.nombre, dc.precio_unitario
             ORDER BY cantidad_comprada DESC
             LIMIT 10
         """
-        productos_mas_comprados = Database.execute_query(query_productos, (fecha_inicio, fecha_fin))
         
         # Compras por día
         query_por_dia = """
@@ -326,11 +462,23 @@ class ReporteModel:
                 COUNT(*) as cantidad,
                 COALESCE(SUM(total), 0) as total
             FROM compras
-            WHERE DATE(fecha) BETWEEN %s AND %s
+            WHERE fecha >= %s AND fecha < %s
             GROUP BY DATE(fecha)
             ORDER BY fecha
         """
-        compras_por_dia = Database.execute_query(query_por_dia, (fecha_inicio, fecha_fin))
+        
+        # Las consultas son independientes: se ejecutan en paralelo
+        rango = (desde, hasta)
+        resultados = Database.execute_parallel({
+            'resumen': (query_resumen, rango, True),
+            'proveedores': (query_proveedores, rango, False),
+            'productos': (query_productos, rango, False),
+            'por_dia': (query_por_dia, rango, False)
+        }, timeout=ReporteModel.TIMEOUT)
+        resumen = resultados['resumen']
+        compras_por_proveedor = resultados['proveedores']
+        productos_mas_comprados = resultados['productos']
+        compras_por_dia = resultados['por_dia']
         
         # Calcular total general para porcentajes
         total_general = float(resumen['monto_total']) if resumen else 0.0
@@ -370,3 +518,40 @@ class ReporteModel:
                 } for item in compras_por_dia
             ]
         }
+    
+    # Columnas de la exportación de líneas de venta (en el orden del SELECT)
+    COLUMNAS_LINEAS_VENTAS = [
+        'Venta ID', 'Boleta', 'Fecha', 'Cajero', 'Método de Pago', 'Código',
+        'Producto', 'Cantidad', 'Precio Unit.', 'Desc. Unit.', 'Subtotal'
+    ]
+    
+    @staticmethod
+    def lineas_ventas(fecha_inicio, fecha_fin, como_dict=False):
+        """
+        Recorre las líneas de venta de un rango sin cargarlas en memoria
+        
+        Returns:
+            generator: Filas (tuplas o dicts) en el orden de COLUMNAS_LINEAS_VENTAS
+        """
+        query = """
+            SELECT 
+                v.id as venta_id,
+                v.numero_boleta,
+                v.fecha,
+                u.nombre as cajero,
+                mp.nombre as metodo_pago,
+                p.codigo_barras,
+                p.nombre as producto,
+                dv.cantidad,
+                dv.precio_unitario,
+                dv.descuento_unitario,
+                dv.subtotal
+            FROM ventas v
+            INNER JOIN detalle_venta dv ON dv.venta_id = v.id
+            INNER JOIN productos p ON dv.producto_id = p.id
+            INNER JOIN usuarios u ON v.cajero_id = u.id
+            INNER JOIN metodos_pago mp ON v.metodo_pago_id = mp.id
+            WHERE v.fecha >= %s AND v.fecha < %s
+            ORDER BY v.fecha, v.id, dv.id
+        """
+        return Database.stream_query(query, FechaHelper.rango(fecha_inicio, fecha_fin), como_dict=como_dict)
@@ -0,0 +1,65 @@
+"""
+Modelo Secuencia
+Estructura: Bloques de números pre-asignados en memoria por proceso
+"""
+
+import os
+import threading
+from config.database import Database
+
+
+class SecuenciaModel:
+    """
+    Contadores únicos respaldados por la tabla `secuencias`
+    
+    Cada proceso reserva un bloque de números con un único UPDATE atómico
+    (LAST_INSERT_ID(expr)) y lo reparte desde memoria; mientras quede bloque
+    no hay acceso a BD. Los números son únicos entre workers pero pueden
+    quedar huecos si un proceso termina sin agotar su bloque.
+    """
+    
+    TAMANO_BLOQUE = int(os.getenv('SECUENCIA_BLOQUE', 20))
+    
+    # Bloques en memoria: {nombre: [siguiente, ultimo]}
+    _bloques = {}
+    _lock = threading.Lock()
+    _pid = os.getpid()
+    
+    @staticmethod
+    def siguiente(nombre):
+        """Retorna el siguiente número de la secuencia"""
+        with SecuenciaModel._lock:
+            if SecuenciaModel._pid != os.getpid():
+                # Tras un fork el bloque del padre no se comparte
+                SecuenciaModel._bloques.clear()
+                SecuenciaModel._pid = os.getpid()
+            
+            bloque = SecuenciaModel._bloques.get(nombre)
+            if not bloque or bloque[0] > bloque[1]:
+                ultimo = SecuenciaModel._reservar_bloque(nombre, SecuenciaModel.TAMANO_BLOQUE)
+                bloque = [ultimo - SecuenciaModel.TAMANO_BLOQUE + 1, ultimo]
+                SecuenciaModel._bloques[nombre] = bloque
+            
+            numero = bloque[0]
+            bloque[0] += 1
+            return numero
+    
+    @staticmethod
+    def _reservar_bloque(nombre, cantidad):
+        """
+        Reserva `cantidad` números en BD y retorna el último del bloque
+        Un solo statement: crea la fila si no existe o la incrementa
+        """
+        query = """
+            INSERT INTO secuencias (nombre, valor) VALUES (%s, LAST_INSERT_ID(%s))
+            ON DUPLICATE KEY UPDATE valor = LAST_INSERT_ID(valor + %s)
+        """
+        with Database.get_cursor(commit=True) as cursor:
+            cursor.execute(query, (nombre, cantidad, cantidad))
+            return cursor.lastrowid
+    
+    @staticmethod
+    def descartar_bloques():
+        """Descarta los bloques en memoria (los números no usados quedan como huecos)"""
+        with SecuenciaModel._lock:
+            SecuenciaModel._bloques.clear()
@@ -0,0 +1,133 @@
+"""
+Modelo Tokens Revocados
+Estructura: Hash set de jti + hash map usuario -> instante de revocación
+- Persistido en tokens_revocados y cargado en memoria al iniciar
+- Verificar un token es una búsqueda O(1), sin consultar la BD
+- Las revocaciones llegan a los demás workers por CacheSync
+- Las fechas se guardan y comparan en hora local de la aplicación (nunca con
+  NOW() de MySQL: la zona horaria de la sesión puede ser otra)
+"""
+
+import threading
+import time
+from datetime import datetime
+from config.database import Database
+from utils.cache_sync import CacheSync
+
+
+class TokenRevocadoModel:
+    """Lista de revocación de tokens JWT"""
+    
+    _jtis = {}          # {jti: expira_en (epoch)}
+    _usuarios = {}      # {usuario_id: (revocado_en, expira_en) (epoch)}
+    _cargado = False
+    _ultimo_intento = 0.0
+    _lock = threading.Lock()
+    
+    REINTENTO = 5       # Segundos entre intentos de carga si la BD no respondió
+    
+    @staticmethod
+    def cargar(_clave=None):
+        """Carga las revocaciones vigentes (al iniciar o por CacheSync)"""
+        TokenRevocadoModel._ultimo_intento = time.monotonic()
+        try:
+            filas = Database.execute_query(
+                """
+                SELECT jti, usuario_id, revocado_en, expira_en
+                FROM tokens_revocados
+                WHERE expira_en > %s
+                """,
+                (datetime.now(),),
+                fetch_all=True
+            )
+        except Exception as e:
+            print(f"⚠️  No se pudo cargar tokens_revocados: {e}")
+            return
+        
+        jtis = {}
+        usuarios = {}
+        for fila in filas or []:
+            expira_en = fila['expira_en'].timestamp()
+            if fila['jti']:
+                jtis[fila['jti']] = expira_en
+            elif fila['usuario_id'] is not None:
+                revocado_en = fila['revocado_en'].timestamp()
+                anterior = usuarios.get(fila['usuario_id'])
+                if not anterior or anterior[0] < revocado_en:
+                    usuarios[fila['usuario_id']] = (revocado_en, expira_en)
+        
+        with TokenRevocadoModel._lock:
+            TokenRevocadoModel._jtis = jtis
+            TokenRevocadoModel._usuarios = usuarios
+            TokenRevocadoModel._cargado = True
+    
+    @staticmethod
+    def esta_revocado(payload):
+        """
+        Verifica si un token (payload ya decodificado) fue revocado
+        
+        Returns:
+            bool
+        """
+        if not TokenRevocadoModel._cargado and \
+                time.monotonic() - TokenRevocadoModel._ultimo_intento > TokenRevocadoModel.REINTENTO:
+            TokenRevocadoModel.cargar()
+        
+        jti = payload.get('jti')
+        if jti and jti in TokenRevocadoModel._jtis:
+            return True
+        
+        revocacion = TokenRevocadoModel._usuarios.get(payload.get('usuario_id'))
+        return revocacion is not None and payload.get('iat', 0) < revocacion[0]
+    
+    @staticmethod
+    def _guardar(jti, usuario_id, revocado_en, expira_en):
+        """Persiste una revocación, purga las vencidas y avisa a los demás workers"""
+        with Database.get_cursor(commit=True) as cursor:
+            cursor.execute(
+                """
+                INSERT IGNORE INTO tokens_revocados (jti, usuario_id, revocado_en, expira_en)
+                VALUES (%s, %s, %s, %s)
+                """,
+                (jti, usuario_id, datetime.fromtimestamp(revocado_en), datetime.fromtimestamp(expira_en))
+            )
+            cursor.execute("DELETE FROM tokens_revocados WHERE expira_en < %s", (datetime.now(),))
+            CacheSync.publicar('tokens_revocados', cursor=cursor)
+    
+    @staticmethod
+    def revocar_token(jti, usuario_id, expira_en):
+        """
+        Revoca un token puntual (logout)
+        
+        Args:
+            jti: ID del token
+            expira_en: Claim 'exp' del token (después ya no hace falta recordarlo)
+        """
+        if not jti:
+            return
+        
+        with TokenRevocadoModel._lock:
+            TokenRevocadoModel._jtis[jti] = expira_en
+        
+        TokenRevocadoModel._guardar(jti, usuario_id, time.time(), expira_en)
+    
+    @staticmethod
+    def revocar_usuario(usuario_id, duracion_token):
+        """
+        Revoca todos los tokens emitidos hasta ahora para un usuario
+        (cambio de contraseña, desactivación)
+        
+        Args:
+            duracion_token: Segundos de vida de un token (tras eso ya vencieron solos)
+        """
+        ahora = time.time()
+        expira_en = ahora + duracion_token
+        
+        with TokenRevocadoModel._lock:
+            TokenRevocadoModel._usuarios[usuario_id] = (ahora, expira_en)
+        
+        TokenRevocadoModel._guardar(None, usuario_id, ahora, expira_en)
+
+
+# Las revocaciones de otros workers recargan la lista
+CacheSync.registrar('tokens_revocados', TokenRevocadoModel.cargar)
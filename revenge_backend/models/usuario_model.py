@@ -1,17 +1,20 @@
 """
 Modelo Usuario
-Estructura: Diccionario (hash map) para usuarios activos en memoria
+Estructura: Cache LRU (hash map + lista enlazada) para usuarios activos en memoria
 """
 
+import os
 from config.database import Database
+from utils.cache_sync import CacheSync
+from utils.lru_cache import LRUCache
 from datetime import datetime
 
 
 class UsuarioModel:
     """Modelo para manejar usuarios - Principio Single Responsibility"""
     
-    # Cache en memoria para usuarios activos (Diccionario/Hash Map)
-    _usuarios_activos = {}
+    # Cache LRU para usuarios activos (acotado y con expiración)
+    _cache = LRUCache('usuarios', max_items=int(os.getenv('CACHE_USUARIOS_MAX', 1000)))
     
     @staticmethod
     def crear(nombre, email, password_hash, rol_id, created_by=None):
@@ -33,8 +36,9 @@ class UsuarioModel:
     def obtener_por_id(usuario_id):
         """Obtiene un usuario por ID"""
         # Primero busca en cache
-        if usuario_id in UsuarioModel._usuarios_activos:
-            return UsuarioModel._usuarios_activos[usuario_id]
+        usuario = UsuarioModel._cache.obtener(usuario_id)
+        if usuario:
+            return usuario
         
         query = """
             SELECT u.*, r.nombre as rol_nombre, e.nombre as estado_nombre
@@ -47,7 +51,7 @@ class UsuarioModel:
         
         # Guardar en cache si está activo
         if usuario and usuario['estado_id'] == 1:
-            UsuarioModel._usuarios_activos[usuario_id] = usuario
+            UsuarioModel._cache.guardar(usuario['id'], usuario)
         
         return usuario
     
@@ -104,9 +108,8 @@ class UsuarioModel:
         try:
             filas_afectadas = Database.execute_query(query, tuple(valores), commit=True)
             
-            # Limpiar del cache
-            if usuario_id in UsuarioModel._usuarios_activos:
-                del UsuarioModel._usuarios_activos[usuario_id]
+            # Limpiar del cache (local y en los demás workers)
+            CacheSync.invalidar('usuarios', [usuario_id])
             
             return filas_afectadas > 0
         except Exception as e:
@@ -121,9 +124,8 @@ class UsuarioModel:
         try:
             filas_afectadas = Database.execute_query(query, (usuario_id,), commit=True)
             
-            # Limpiar del cache
-            if usuario_id in UsuarioModel._usuarios_activos:
-                del UsuarioModel._usuarios_activos[usuario_id]
+            # Limpiar del cache (local y en los demás workers)
+            CacheSync.invalidar('usuarios', [usuario_id])
             
             return filas_afectadas > 0
         except Exception as e:
@@ -158,14 +160,24 @@ class UsuarioModel:
     @staticmethod
     def agregar_a_cache(usuario_id, usuario_data):
         """Agrega un usuario al cache de usuarios activos"""
-        UsuarioModel._usuarios_activos[usuario_id] = usuario_data
+        UsuarioModel._cache.guardar(usuario_id, usuario_data)
+    
+    @staticmethod
+    def quitar_de_cache(usuario_id):
+        """Quita un usuario del cache de usuarios activos"""
+        return UsuarioModel._cache.eliminar(usuario_id)
     
     @staticmethod
     def limpiar_cache():
         """Limpia el cache de usuarios activos"""
-        UsuarioModel._usuarios_activos.clear()
+        UsuarioModel._cache.limpiar()
     
     @staticmethod
     def obtener_cache():
-        """Retorna el diccionario de usuarios activos en cache"""
-        return UsuarioModel._usuarios_activos
+        """Retorna una copia de los usuarios activos en cache"""
+        return UsuarioModel._cache.como_dict()
+    
+    @staticmethod
+    def estadisticas_cache():
+        """Retorna hits, misses y desalojos del cache de usuarios"""
+        return UsuarioModel._cache.estadisticas()
@@ -0,0 +1,113 @@
+"""
+Modelo Ventas Diarias
+Estructura: Tablas de agregados (rollup) mantenidas en la misma transacción de la venta
+- ventas_diarias:           día x cajero x método de pago (conteo y montos de cabecera)
+- ventas_diarias_productos: día x cajero x método de pago x producto (cantidades e importes)
+Un reporte de 12 meses lee cientos de filas en lugar de millones de ventas y detalles
+"""
+
+from config.database import Database
+from utils.fecha_helper import FechaHelper
+from models.reporte_model import ReporteModel
+
+
+class VentaDiariaModel:
+    """Modelo para mantener los agregados diarios de ventas"""
+    
+    # Cabecera: una fila por (día, cajero, método de pago)
+    _SELECT_CABECERA = """
+        SELECT DATE(v.fecha), v.cajero_id, v.metodo_pago_id,
+               COUNT(*), SUM(v.subtotal), SUM(v.descuento), SUM(v.impuestos),
+               SUM(v.total), MIN(v.total), MAX(v.total)
+        FROM ventas v
+    """
+    _INSERT_CABECERA = """
+        INSERT INTO ventas_diarias
+            (fecha, cajero_id, metodo_pago_id, num_ventas, subtotal,
+             descuento, impuestos, total, total_min, total_max)
+    """
+    
+    # Productos: una fila por (día, cajero, método de pago, producto)
+    _SELECT_PRODUCTOS = """
+        SELECT DATE(v.fecha), v.cajero_id, v.metodo_pago_id, dv.producto_id,
+               SUM(dv.cantidad), SUM(dv.subtotal), COUNT(*)
+        FROM detalle_venta dv
+        INNER JOIN ventas v ON dv.venta_id = v.id
+    """
+    _INSERT_PRODUCTOS = """
+        INSERT INTO ventas_diarias_productos
+            (fecha, cajero_id, metodo_pago_id, producto_id, cantidad, importe, lineas)
+    """
+    
+    @staticmethod
+    def registrar_venta(venta_id, cursor):
+        """
+        Suma una venta recién insertada a los agregados
+        Debe llamarse dentro de la transacción de la venta (después de insertar
+        cabecera y detalles): el agregado se confirma o revierte junto con ella
+        """
+        query_cabecera = VentaDiariaModel._INSERT_CABECERA + VentaDiariaModel._SELECT_CABECERA + """
+            WHERE v.id = %s
+            GROUP BY DATE(v.fecha), v.cajero_id, v.metodo_pago_id
+            ON DUPLICATE KEY UPDATE
+                num_ventas = num_ventas + VALUES(num_ventas),
+                subtotal = subtotal + VALUES(subtotal),
+                descuento = descuento + VALUES(descuento),
+                impuestos = impuestos + VALUES(impuestos),
+                total = total + VALUES(total),
+                total_min = LEAST(total_min, VALUES(total_min)),
+                total_max = GREATEST(total_max, VALUES(total_max))
+        """
+        cursor.execute(query_cabecera, (venta_id,))
+        
+        query_productos = VentaDiariaModel._INSERT_PRODUCTOS + VentaDiariaModel._SELECT_PRODUCTOS + """
+            WHERE dv.venta_id = %s
+            GROUP BY DATE(v.fecha), v.cajero_id, v.metodo_pago_id, dv.producto_id
+            ON DUPLICATE KEY UPDATE
+                cantidad = cantidad + VALUES(cantidad),
+                importe = importe + VALUES(importe),
+                lineas = lineas + VALUES(lineas)
+        """
+        cursor.execute(query_productos, (venta_id,))
+    
+    @staticmethod
+    def reconstruir(fecha_inicio, fecha_fin):
+        """
+        Recalcula los agregados de un rango de días desde ventas y detalle_venta
+        (carga inicial o reparación). Los INSERT ... SELECT bloquean las ventas
+        leídas hasta el commit, por lo que no se pierden ventas concurrentes.
+        
+        Returns:
+            int: Filas de cabecera generadas
+        """
+        desde, hasta = FechaHelper.rango(fecha_inicio, fecha_fin)
+        
+        try:
+            with Database.get_cursor(commit=True) as cursor:
+                cursor.execute(
+                    "DELETE FROM ventas_diarias_productos WHERE fecha >= %s AND fecha < %s",
+                    (desde, hasta)
+                )
+                cursor.execute(
+                    "DELETE FROM ventas_diarias WHERE fecha >= %s AND fecha < %s",
+                    (desde, hasta)
+                )
+                
+                cursor.execute(VentaDiariaModel._INSERT_CABECERA + VentaDiariaModel._SELECT_CABECERA + """
+                    WHERE v.fecha >= %s AND v.fecha < %s
+                    GROUP BY DATE(v.fecha), v.cajero_id, v.metodo_pago_id
+                """, (desde, hasta))
+                filas = cursor.rowcount
+                
+                cursor.execute(VentaDiariaModel._INSERT_PRODUCTOS + VentaDiariaModel._SELECT_PRODUCTOS + """
+                    WHERE v.fecha >= %s AND v.fecha < %s
+                    GROUP BY DATE(v.fecha), v.cajero_id, v.metodo_pago_id, dv.producto_id
+                """, (desde, hasta))
+                
+                # Los reportes cacheados de esos días quedaron desactualizados
+                ReporteModel.invalidar_cache(cursor)
+            
+            return filas
+        except Exception as e:
+            print(f"❌ Error reconstruyendo ventas diarias: {e}")
+            raise
@@ -4,6 +4,8 @@ Estructura: Lista para registrar detalles de venta
 """
 
 from config.database import Database
+from utils.fecha_helper import FechaHelper
+from models.secuencia_model import SecuenciaModel
 from datetime import datetime
 
 
@@ -65,8 +67,15 @@ class VentaModel:
         return venta
     
     @staticmethod
-    def obtener_todas(limite=100, offset=0):
-        """Obtiene todas las ventas con paginación"""
+    def obtener_todas(limite=100, offset=0, cursor=None):
+        """
+        Obtiene todas las ventas con paginación (más recientes primero)
+        
+        Args:
+            cursor: (fecha, id) de la última venta de la página anterior.
+                    Con cursor se ignora el offset: la consulta salta
+                    directo a la posición por el índice (costo constante)
+        """
         query = """
             SELECT v.id, v.numero_boleta, v.cajero_id, u.nombre as cajero_nombre,
                    v.fecha, v.subtotal, v.descuento, v.impuestos, v.total,
@@ -74,10 +83,22 @@ class VentaModel:
             FROM ventas v
             INNER JOIN usuarios u ON v.cajero_id = u.id
             INNER JOIN metodos_pago mp ON v.metodo_pago_id = mp.id
-            ORDER BY v.fecha DESC
-            LIMIT %s OFFSET %s
         """
-        return Database.execute_query(query, (limite, offset), fetch_all=True)
+        params = []
+        
+        if cursor:
+            fecha, venta_id = cursor
+            query += " WHERE v.fecha < %s OR (v.fecha = %s AND v.id < %s)"
+            params.extend([fecha, fecha, venta_id])
+        
+        query += " ORDER BY v.fecha DESC, v.id DESC LIMIT %s"
+        params.append(limite)
+        
+        if offset and not cursor:
+            query += " OFFSET %s"
+            params.append(offset)
+        
+        return Database.execute_query(query, tuple(params), fetch_all=True)
     
     @staticmethod
     def obtener_por_fecha(fecha_inicio, fecha_fin):
@@ -88,10 +109,10 @@ class VentaModel:
             FROM ventas v
             INNER JOIN usuarios u ON v.cajero_id = u.id
             INNER JOIN metodos_pago mp ON v.metodo_pago_id = mp.id
-            WHERE DATE(v.fecha) BETWEEN %s AND %s
+            WHERE v.fecha >= %s AND v.fecha < %s
             ORDER BY v.fecha DESC
         """
-        return Database.execute_query(query, (fecha_inicio, fecha_fin), fetch_all=True)
+        return Database.execute_query(query, FechaHelper.rango(fecha_inicio, fecha_fin), fetch_all=True)
     
     @staticmethod
     def obtener_por_cajero(cajero_id, fecha_inicio=None, fecha_fin=None):
@@ -106,8 +127,8 @@ class VentaModel:
         params = [cajero_id]
         
         if fecha_inicio and fecha_fin:
-            query += " AND DATE(v.fecha) BETWEEN %s AND %s"
-            params.extend([fecha_inicio, fecha_fin])
+            query += " AND v.fecha >= %s AND v.fecha < %s"
+            params.extend(FechaHelper.rango(fecha_inicio, fecha_fin))
         
         query += " ORDER BY v.fecha DESC"
         
@@ -131,33 +152,33 @@ class VentaModel:
         if not fecha:
             fecha = datetime.now().strftime('%Y-%m-%d')
         
+        # Desde los agregados diarios (models/venta_diaria_model.py)
         query = """
             SELECT 
-                COUNT(*) as total_ventas,
+                CAST(COALESCE(SUM(num_ventas), 0) AS UNSIGNED) as total_ventas,
                 SUM(total) as total_ingresos,
                 SUM(descuento) as total_descuentos,
-                AVG(total) as ticket_promedio
-            FROM ventas
-            WHERE DATE(fecha) = %s
+                SUM(total) / NULLIF(SUM(num_ventas), 0) as ticket_promedio
+            FROM ventas_diarias
+            WHERE fecha >= %s AND fecha < %s
         """
-        return Database.execute_query(query, (fecha,), fetch_one=True)
+        return Database.execute_query(query, FechaHelper.rango_dia(fecha), fetch_one=True)
     
     @staticmethod
     def obtener_productos_mas_vendidos(limite=10, fecha_inicio=None, fecha_fin=None):
-        """Obtiene los productos más vendidos"""
+        """Obtiene los productos más vendidos (desde los agregados diarios)"""
         query = """
             SELECT p.id, p.nombre, p.codigo_barras,
-                   SUM(dv.cantidad) as total_vendido,
-                   SUM(dv.subtotal) as total_ingresos
-            FROM detalle_venta dv
-            INNER JOIN productos p ON dv.producto_id = p.id
-            INNER JOIN ventas v ON dv.venta_id = v.id
+                   SUM(vd.cantidad) as total_vendido,
+                   SUM(vd.importe) as total_ingresos
+            FROM ventas_diarias_productos vd
+            INNER JOIN productos p ON vd.producto_id = p.id
         """
         params = []
         
         if fecha_inicio and fecha_fin:
-            query += " WHERE DATE(v.fecha) BETWEEN %s AND %s"
-            params.extend([fecha_inicio, fecha_fin])
+            query += " WHERE vd.fecha >= %s AND vd.fecha < %s"
+            params.extend(FechaHelper.rango(fecha_inicio, fecha_fin))
         
         query += """
             GROUP BY p.id, p.nombre, p.codigo_barras
@@ -170,25 +191,12 @@ class VentaModel:
     
     @staticmethod
     def generar_numero_boleta():
-        """Genera el siguiente número de boleta"""
-        query = """
-            SELECT numero_boleta FROM ventas 
-            ORDER BY id DESC LIMIT 1
         """
-        ultima_venta = Database.execute_query(query, fetch_one=True)
-        
-        if ultima_venta:
-            ultimo_numero = ultima_venta['numero_boleta']
-            # Extraer número (formato: B-00001)
-            try:
-                numero = int(ultimo_numero.split('-')[1])
-                nuevo_numero = numero + 1
-            except:
-                nuevo_numero = 1
-        else:
-            nuevo_numero = 1
-        
-        return f"B-{nuevo_numero:05d}"
+        Genera el siguiente número de boleta
+        Usa la secuencia 'boleta' (única entre workers, sin SELECT sobre ventas)
+        """
+        numero = SecuenciaModel.siguiente('boleta')
+        return f"B-{numero:05d}"
     
     @staticmethod
     def verificar_numero_boleta_existe(numero_boleta):
@@ -33,3 +33,18 @@ reporte_bp.route('/compras/excel', methods=['GET'])(ReporteController.reporte_co
 
 # GET /api/reportes/inventario/excel - Generar Excel
 reporte_bp.route('/inventario/excel', methods=['GET'])(ReporteController.reporte_inventario_excel)
+
+# GET /api/reportes/ventas/export.xlsx - Líneas de venta en Excel (streaming)
+reporte_bp.route('/ventas/export.xlsx', methods=['GET'])(ReporteController.exportar_ventas_xlsx)
+
+# GET /api/reportes/ventas/export.csv - Líneas de venta en CSV (streaming)
+reporte_bp.route('/ventas/export.csv', methods=['GET'])(ReporteController.exportar_ventas_csv)
+
+# GET /api/reportes/ventas/export.ndjson - Líneas de venta en NDJSON (streaming)
+reporte_bp.route('/ventas/export.ndjson', methods=['GET'])(ReporteController.exportar_ventas_ndjson)
+
+# GET /api/reportes/exportaciones/<job_id> - Estado de una exportación (?modo=async)
+reporte_bp.route('/exportaciones/<job_id>', methods=['GET'])(ReporteController.estado_exportacion)
+
+# GET /api/reportes/exportaciones/<job_id>/descarga - Descargar archivo generado
+reporte_bp.route('/exportaciones/<job_id>/descarga', methods=['GET'])(ReporteController.descargar_exportacion)
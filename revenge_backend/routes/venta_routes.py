@@ -22,5 +22,8 @@ venta_bp.route('/por-fecha', methods=['GET'])(VentaController.por_fecha)
 # GET /api/ventas/<id>
 venta_bp.route('/<int:venta_id>', methods=['GET'])(VentaController.obtener)
 
+# GET /api/ventas/<id>/boleta
+venta_bp.route('/<int:venta_id>/boleta', methods=['GET'])(VentaController.boleta)
+
 # POST /api/ventas
 venta_bp.route('/', methods=['POST'])(VentaController.crear)
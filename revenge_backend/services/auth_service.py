@@ -7,6 +7,10 @@ Principios SOLID aplicados:
 """
 
 from models.usuario_model import UsuarioModel
+from models.permiso_model import PermisoModel
+from models.token_revocado_model import TokenRevocadoModel
+from utils.jwt_helper import JWTHelper
+from utils.password_helper import PasswordHelper
 from datetime import datetime, timedelta
 import os
 
@@ -18,24 +22,36 @@ class AuthService:
     def login(email, password):
         """
         Autentica un usuario
-        Por ahora sin hash (según solicitud del usuario)
+        La verificación corre en el pool de PasswordHelper, con un límite
+        de logins simultáneos
         
         Returns:
             dict: Información del usuario o None
+        
+        Raises:
+            VerificacionSaturadaError: Demasiados logins simultáneos
         """
         usuario = UsuarioModel.obtener_por_email(email)
         
         if not usuario:
+            # Mismo trabajo que con un email existente (tiempo de respuesta constante)
+            with PasswordHelper.turno_login():
+                PasswordHelper.verificar(password, PasswordHelper.hash_ficticio())
             return None
         
         # Verificar estado activo
         if usuario['estado_id'] != 1:
             raise Exception("Usuario inactivo")
         
-        # TODO: Implementar verificación de hash cuando esté listo
-        # Por ahora comparación simple (TEMPORAL - NO SEGURO)
-        if usuario['password_hash'] != password:
-            return None
+        with PasswordHelper.turno_login():
+            if not PasswordHelper.verificar(password, usuario['password_hash']):
+                return None
+            
+            # Costo/algoritmo cambiado (o contraseña en texto plano): rehashear ahora
+            # que se conoce la contraseña
+            if PasswordHelper.necesita_rehash(usuario['password_hash']):
+                usuario['password_hash'] = PasswordHelper.hashear(password)
+                UsuarioModel.actualizar(usuario['id'], password_hash=usuario['password_hash'])
         
         # Agregar al cache de usuarios activos
         UsuarioModel.agregar_a_cache(usuario['id'], usuario)
@@ -62,9 +78,7 @@ class AuthService:
         if UsuarioModel.verificar_email_existe(email):
             raise Exception("El email ya está registrado")
         
-        # TODO: Implementar hash de contraseña
-        # Por ahora guarda directamente (TEMPORAL - NO SEGURO)
-        password_hash = password
+        password_hash = PasswordHelper.hashear(password)
         
         # Crear usuario
         usuario_id = UsuarioModel.crear(
@@ -78,87 +92,74 @@ class AuthService:
         return usuario_id
     
     @staticmethod
-    def verificar_permisos(usuario_id, accion):
+    def verificar_permisos(rol_id, accion):
         """
-        Verifica si un usuario tiene permisos para una acción
+        Verifica si un rol tiene permisos para una acción
+        (máscara de bits precompilada, sin consultar la BD)
         
         Args:
+            rol_id: ID del rol (claim del token)
             accion: 'venta', 'compra', 'gestion_usuarios', etc.
         
         Returns:
             bool: True si tiene permiso
         """
-        usuario = UsuarioModel.obtener_por_id(usuario_id)
-        
-        if not usuario:
-            return False
-        
-        rol_id = usuario['rol_id']
-        
-        # Definir permisos por rol
-        permisos = {
-            1: ['*'],  # Administrador: todos los permisos
-            2: ['venta', 'ver_productos', 'ver_categorias'],  # Cajero
-            3: ['compra', 'gestion_productos', 'gestion_inventario', 
-                'gestion_proveedores', 'ver_productos', 'ver_categorias']  # Trabajador
-        }
-        
-        permisos_rol = permisos.get(rol_id, [])
-        
-        # Admin tiene todos los permisos
-        if '*' in permisos_rol:
-            return True
-        
-        return accion in permisos_rol
+        return PermisoModel.tiene_permiso(rol_id, accion)
     
     @staticmethod
-    def puede_realizar_venta(usuario_id):
-        """Verifica si un usuario puede realizar ventas"""
-        usuario = UsuarioModel.obtener_por_id(usuario_id)
-        
-        if not usuario:
-            return False
-        
-        # Solo admin (1) y cajero (2) pueden realizar ventas
-        return usuario['rol_id'] in [1, 2]
+    def puede_realizar_venta(rol_id):
+        """Verifica si un rol puede realizar ventas"""
+        return PermisoModel.tiene_permiso(rol_id, 'venta')
     
     @staticmethod
-    def es_administrador(usuario_id):
-        """Verifica si un usuario es administrador"""
-        usuario = UsuarioModel.obtener_por_id(usuario_id)
-        
-        if not usuario:
-            return False
-        
-        return usuario['rol_id'] == 1
+    def es_administrador(rol_id):
+        """Verifica si un rol es administrador"""
+        return PermisoModel.es_administrador(rol_id)
     
     @staticmethod
     def cambiar_password(usuario_id, password_actual, password_nueva):
         """
         Cambia la contraseña de un usuario
-        TODO: Implementar con hash
         """
         usuario = UsuarioModel.obtener_por_id(usuario_id)
         
         if not usuario:
             raise Exception("Usuario no encontrado")
         
-        # TODO: Verificar password actual con hash
-        if usuario['password_hash'] != password_actual:
-            raise Exception("Contraseña actual incorrecta")
+        with PasswordHelper.turno_login():
+            if not PasswordHelper.verificar(password_actual, usuario['password_hash']):
+                raise Exception("Contraseña actual incorrecta")
         
-        # TODO: Hashear nueva contraseña
-        password_hash = password_nueva
+        password_hash = PasswordHelper.hashear(password_nueva)
         
         # Actualizar
-        return UsuarioModel.actualizar(usuario_id, password_hash=password_hash)
+        resultado = UsuarioModel.actualizar(usuario_id, password_hash=password_hash)
+        
+        # Los tokens emitidos con la contraseña anterior dejan de ser válidos
+        AuthService.revocar_sesiones(usuario_id)
+        
+        return resultado
     
     @staticmethod
-    def logout(usuario_id):
-        """Cierra sesión de un usuario"""
+    def logout(usuario_id, jti=None, exp=None):
+        """
+        Cierra sesión de un usuario
+        
+        Args:
+            jti: ID del token a revocar (claim 'jti')
+            exp: Vencimiento del token (claim 'exp')
+        """
         # Remover del cache de usuarios activos
-        if usuario_id in UsuarioModel.obtener_cache():
-            cache = UsuarioModel.obtener_cache()
-            del cache[usuario_id]
+        UsuarioModel.quitar_de_cache(usuario_id)
+        
+        # Revocar el token usado (efecto inmediato en todos los workers)
+        if jti and exp:
+            TokenRevocadoModel.revocar_token(jti, usuario_id, exp)
         
         return True
+    
+    @staticmethod
+    def revocar_sesiones(usuario_id):
+        """Revoca todos los tokens emitidos hasta ahora para un usuario"""
+        UsuarioModel.quitar_de_cache(usuario_id)
+        TokenRevocadoModel.revocar_usuario(usuario_id, JWTHelper.duracion_token())
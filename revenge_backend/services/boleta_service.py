@@ -0,0 +1,149 @@
+"""
+Servicio de Boletas
+Las ventas recién creadas dejan sus datos en un cache del proceso,
+así la boleta que se imprime al cobrar no vuelve a consultar la base de datos
+"""
+
+import os
+from datetime import datetime
+from models.venta_model import VentaModel
+from models.metodo_pago_model import MetodoPagoModel
+from utils.boleta_generator import BoletaGenerator
+from utils.lru_cache import LRUCache
+
+
+class BoletaService:
+    """Servicio para generar boletas de venta"""
+    
+    # Las ventas no se modifican: no hace falta sincronizar entre workers
+    _cache = LRUCache(
+        'boletas',
+        max_items=int(os.getenv('CACHE_BOLETAS_MAX', 500)),
+        ttl=float(os.getenv('CACHE_BOLETAS_TTL', 3600)),
+        sincronizado=False
+    )
+    
+    # {metodo_pago_id: nombre} (se recarga si aparece un ID nuevo)
+    _metodos_pago = {}
+    
+    FORMATOS = {
+        'pdf': ('application/pdf', 'pdf'),
+        'texto': ('text/plain; charset=utf-8', 'txt'),
+        'escpos': ('application/octet-stream', 'bin')
+    }
+    
+    @staticmethod
+    def _nombre_metodo_pago(metodo_pago_id):
+        """Nombre del método de pago desde un mapa en memoria"""
+        nombre = BoletaService._metodos_pago.get(metodo_pago_id)
+        if nombre is None:
+            metodos = MetodoPagoModel.obtener_todos(incluir_inactivos=True) or []
+            BoletaService._metodos_pago = {m['id']: m['nombre'] for m in metodos}
+            nombre = BoletaService._metodos_pago.get(metodo_pago_id, '')
+        return nombre
+    
+    @staticmethod
+    def registrar(venta_id, numero_boleta, cajero, items, subtotal, descuento,
+                  impuestos, total, metodo_pago_id, observaciones=None):
+        """
+        Guarda los datos de una venta recién creada para su boleta
+        
+        Args:
+            cajero (dict): Usuario que realizó la venta
+            items (list): Items validados de crear_venta (incluyen 'producto')
+        """
+        BoletaService._cache.guardar(venta_id, {
+            'venta_id': venta_id,
+            'numero_boleta': numero_boleta,
+            'fecha': datetime.now(),
+            'cajero': cajero['nombre'],
+            'metodo_pago': BoletaService._nombre_metodo_pago(metodo_pago_id),
+            'items': [
+                {
+                    'producto': item['producto']['nombre'],
+                    'cantidad': item['cantidad'],
+                    'precio_unitario': item['precio_unitario'],
+                    'descuento_unitario': item['descuento_unitario'],
+                    'subtotal': item['cantidad'] * (item['precio_unitario'] - item['descuento_unitario'])
+                }
+                for item in items
+            ],
+            'subtotal': subtotal,
+            'descuento': descuento,
+            'impuestos': impuestos,
+            'total': total,
+            'observaciones': observaciones
+        })
+    
+    @staticmethod
+    def obtener_datos(venta_id):
+        """
+        Datos de la boleta: del cache si la venta se creó en este proceso,
+        si no (reimpresión u otro worker) desde la base de datos
+        
+        Returns:
+            dict o None si la venta no existe
+        """
+        boleta = BoletaService._cache.obtener(venta_id)
+        if boleta is not None:
+            return boleta
+        
+        venta = VentaModel.obtener_por_id(venta_id)
+        if not venta:
+            return None
+        
+        boleta = {
+            'venta_id': venta['id'],
+            'numero_boleta': venta['numero_boleta'],
+            'fecha': venta['fecha'],
+            'cajero': venta['cajero_nombre'],
+            'metodo_pago': venta['metodo_pago_nombre'],
+            'items': [
+                {
+                    'producto': detalle['producto_nombre'],
+                    'cantidad': detalle['cantidad'],
+                    'precio_unitario': detalle['precio_unitario'],
+                    'descuento_unitario': detalle['descuento_unitario'],
+                    'subtotal': detalle['cantidad'] * (detalle['precio_unitario'] - detalle['descuento_unitario'])
+                }
+                for detalle in venta['detalles']
+            ],
+            'subtotal': venta['subtotal'],
+            'descuento': venta['descuento'],
+            'impuestos': venta['impuestos'],
+            'total': venta['total'],
+            'observaciones': venta.get('observaciones')
+        }
+        BoletaService._cache.guardar(venta_id, boleta)
+        return boleta
+    
+    @staticmethod
+    def generar(venta_id, formato='pdf'):
+        """
+        Genera la boleta de una venta
+        
+        Args:
+            formato (str): 'pdf', 'texto' o 'escpos'
+        
+        Returns:
+            tuple: (contenido, mimetype, extension) o None si la venta no existe
+        
+        Raises:
+            ValueError: Formato inválido
+        """
+        if formato not in BoletaService.FORMATOS:
+            raise ValueError(f"Formato inválido: {formato}. Use pdf, texto o escpos")
+        
+        boleta = BoletaService.obtener_datos(venta_id)
+        if boleta is None:
+            return None
+        
+        if formato == 'pdf':
+            contenido = BoletaGenerator.generar_pdf(boleta)
+        elif formato == 'texto':
+            contenido = BoletaGenerator.generar_texto(boleta).encode('utf-8')
+        else:
+            contenido = BoletaGenerator.generar_escpos(boleta)
+        
+        mimetype, extension = BoletaService.FORMATOS[formato]
+        return contenido, mimetype, extension
@@ -7,7 +7,9 @@ from models.compra_model import CompraModel
 from models.detalle_compra_model import DetalleCompraModel
 from models.producto_model import ProductoModel
 from models.proveedor_model import ProveedorModel
+from models.reporte_model import ReporteModel
 from config.database import Database
+from utils.cursor_helper import CursorHelper
 
 
 class CompraService:
@@ -39,13 +41,16 @@ class CompraService:
         subtotal = 0
         items_validados = []
         
+        # Cargar todos los productos de la compra en una sola consulta
+        productos = ProductoModel.obtener_por_ids(int(item['producto_id']) for item in items)
+        
         for item in items:
-            producto_id = item['producto_id']
+            producto_id = int(item['producto_id'])
             cantidad = item['cantidad']
             precio_unitario = item['precio_unitario']
             
             # Obtener producto
-            producto = ProductoModel.obtener_por_id(producto_id)
+            producto = productos.get(producto_id)
             if not producto:
                 raise ValueError(f"Producto ID {producto_id} no encontrado")
             
@@ -69,7 +74,17 @@ class CompraService:
         # Crear compra en una transacción
         try:
             with Database.get_cursor(commit=True) as cursor:
-                # 1. Crear cabecera de compra
+                # 1. Bloquear las filas de productos para registrar el stock real
+                stock_bloqueado = ProductoModel.bloquear_stock(
+                    [item['producto_id'] for item in items_validados], cursor
+                )
+                
+                # Eliminado entre la validación y el bloqueo
+                for item in items_validados:
+                    if item['producto_id'] not in stock_bloqueado:
+                        raise ValueError(f"Producto ID {item['producto_id']} no encontrado")
+                
+                # 2. Crear cabecera de compra
                 query_compra = """
                     INSERT INTO compras (numero_factura, proveedor_id, usuario_id,
                                        subtotal, impuestos, total, observaciones)
@@ -81,69 +96,38 @@ class CompraService:
                 ))
                 compra_id = cursor.lastrowid
                 
-                # 2. Crear detalles y actualizar stock
-                query_detalle = """
-                    INSERT INTO detalle_compra (compra_id, producto_id, cantidad, precio_unitario)
-                    VALUES (%s, %s, %s, %s)
-                """
-                
-                query_update_stock = """
-                    UPDATE productos SET stock = stock + %s, updated_at = NOW()
-                    WHERE id = %s
-                """
-                
-                # También actualizar precio de compra si es mayor
-                query_update_precio = """
-                    UPDATE productos SET precio_compra = %s, updated_at = NOW()
-                    WHERE id = %s AND precio_compra < %s
-                """
-                
-                query_movimiento = """
-                    INSERT INTO movimientos_inventario 
-                    (producto_id, tipo, cantidad, stock_anterior, stock_nuevo,
-                     referencia_id, referencia_tipo, motivo, usuario_id)
-                    VALUES (%s, 'entrada', %s, %s, %s, %s, 'compra', 'Compra a proveedor', %s)
-                """
+                # 3. Crear detalles (un solo INSERT multi-fila)
+                DetalleCompraModel.crear_multiples(compra_id, items_validados, cursor=cursor)
                 
+                # 4. Actualizar stock y precio de compra (si es mayor) con un solo UPDATE
+                variaciones = {}
+                precios_compra = {}
                 for item in items_validados:
-                    # Crear detalle
-                    cursor.execute(query_detalle, (
-                        compra_id,
-                        item['producto_id'],
-                        item['cantidad'],
+                    producto_id = item['producto_id']
+                    variaciones[producto_id] = variaciones.get(producto_id, 0) + item['cantidad']
+                    precios_compra[producto_id] = max(
+                        precios_compra.get(producto_id, item['precio_unitario']),
                         item['precio_unitario']
-                    ))
-                    
-                    # Actualizar stock
-                    cursor.execute(query_update_stock, (
-                        item['cantidad'],
-                        item['producto_id']
-                    ))
-                    
-                    # Actualizar precio de compra si es mayor
-                    cursor.execute(query_update_precio, (
-                        item['precio_unitario'],
-                        item['producto_id'],
-                        item['precio_unitario']
-                    ))
-                    
-                    # Registrar movimiento
-                    stock_anterior = item['producto']['stock']
+                    )
+                ProductoModel.actualizar_stock_lote(variaciones, cursor, precios_compra=precios_compra)
+                
+                # 5. Registrar movimientos (un solo INSERT multi-fila)
+                movimientos = []
+                for item in items_validados:
+                    stock_anterior = stock_bloqueado[item['producto_id']]
                     stock_nuevo = stock_anterior + item['cantidad']
+                    stock_bloqueado[item['producto_id']] = stock_nuevo
                     
-                    cursor.execute(query_movimiento, (
-                        item['producto_id'],
-                        item['cantidad'],
-                        stock_anterior,
-                        stock_nuevo,
-                        compra_id,
-                        usuario_id
+                    movimientos.append((
+                        item['producto_id'], 'entrada', item['cantidad'],
+                        stock_anterior, stock_nuevo, compra_id,
+                        'compra', 'Compra a proveedor', usuario_id
                     ))
-            
-            # Limpiar cache de productos afectados
-            for item in items_validados:
-                if item['producto_id'] in ProductoModel._productos_por_id:
-                    del ProductoModel._productos_por_id[item['producto_id']]
+                ProductoModel.registrar_movimientos_lote(movimientos, cursor)
+                
+                # 6. Limpiar cache de productos afectados y reportes de hoy (en todos los workers)
+                ProductoModel.invalidar_cache(variaciones.keys(), cursor)
+                ReporteModel.invalidar_cache_abiertos(cursor)
             
             return {
                 'compra_id': compra_id,
@@ -162,9 +146,15 @@ class CompraService:
         return CompraModel.obtener_por_id(compra_id)
     
     @staticmethod
-    def listar_compras(limite=100, offset=0):
-        """Lista compras con paginación"""
-        return CompraModel.obtener_todas(limite, offset)
+    def listar_compras(limite=100, offset=0, cursor=None):
+        """
+        Lista compras con paginación
+        
+        Returns:
+            tuple: (compras, next_cursor) - next_cursor es None en la última página
+        """
+        compras = CompraModel.obtener_todas(limite + 1, offset, cursor)
+        return CursorHelper.paginar(compras, limite)
     
     @staticmethod
     def obtener_compras_proveedor(proveedor_id):
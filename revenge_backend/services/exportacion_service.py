@@ -0,0 +1,182 @@
+"""
+Servicio de Exportaciones
+Genera PDF y Excel de reportes en segundo plano para no ocupar
+los workers de la API mientras dura la generación
+Estructura: Pool de hilos acotado + almacén en disco con expiración
+"""
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from services.reporte_service import ReporteService
+from utils.almacen_exportaciones import AlmacenExportaciones
+from utils.pdf_pool import PoolPDF
+
+
+class ColaExportacionesLlenaError(Exception):
+    """Se alcanzó el máximo de exportaciones pendientes"""
+    pass
+
+
+class ExportacionService:
+    """Servicio para exportaciones asíncronas de reportes"""
+    
+    WORKERS = int(os.getenv('EXPORT_WORKERS', 2))
+    MAX_PENDIENTES = int(os.getenv('EXPORT_MAX_PENDIENTES', 20))
+    
+    TIPOS = ('ventas', 'compras', 'inventario')
+    FORMATOS = {
+        'pdf': ('pdf', 'application/pdf'),
+        'excel': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+    }
+    
+    _executor = None
+    _pid = None
+    _pendientes = 0
+    _lock = threading.Lock()
+    
+    @staticmethod
+    def _obtener_executor():
+        """Pool de hilos del proceso actual (se recrea tras un fork)"""
+        if ExportacionService._executor is None or ExportacionService._pid != os.getpid():
+            ExportacionService._executor = ThreadPoolExecutor(
+                max_workers=ExportacionService.WORKERS,
+                thread_name_prefix='exportacion'
+            )
+            ExportacionService._pid = os.getpid()
+            ExportacionService._pendientes = 0
+        return ExportacionService._executor
+    
+    @staticmethod
+    def encolar(tipo, formato, fecha_inicio=None, fecha_fin=None):
+        """
+        Encola la generación de un reporte
+        
+        Returns:
+            dict: Estado inicial del trabajo (incluye 'id')
+        
+        Raises:
+            ValueError: Tipo o formato inválido
+            ColaExportacionesLlenaError: Demasiadas exportaciones pendientes
+        """
+        if tipo not in ExportacionService.TIPOS:
+            raise ValueError(f"Tipo de reporte inválido: {tipo}")
+        if formato not in ExportacionService.FORMATOS:
+            raise ValueError(f"Formato inválido: {formato}")
+        
+        AlmacenExportaciones.purgar()
+        
+        extension, mimetype = ExportacionService.FORMATOS[formato]
+        ahora = time.time()
+        estado = {
+            'id': uuid.uuid4().hex,
+            'tipo': tipo,
+            'formato': formato,
+            'fecha_inicio': fecha_inicio,
+            'fecha_fin': fecha_fin,
+            'estado': 'pendiente',
+            'error': None,
+            'creado_en': ahora,
+            'terminado_en': None,
+            'expira_en': ahora + AlmacenExportaciones.TTL,
+            'extension': extension,
+            'mimetype': mimetype,
+            'nombre_descarga': f"reporte_{tipo}_{time.strftime('%Y%m%d_%H%M%S')}.{extension}",
+            'tamano': None
+        }
+        
+        with ExportacionService._lock:
+            executor = ExportacionService._obtener_executor()
+            if ExportacionService._pendientes >= ExportacionService.MAX_PENDIENTES:
+                raise ColaExportacionesLlenaError(
+                    f"Hay {ExportacionService._pendientes} exportaciones pendientes, intente más tarde"
+                )
+            ExportacionService._pendientes += 1
+        
+        try:
+            AlmacenExportaciones.guardar_estado(estado)
+            executor.submit(ExportacionService._ejecutar, dict(estado))
+        except Exception:
+            with ExportacionService._lock:
+                ExportacionService._pendientes -= 1
+            raise
+        
+        return estado
+    
+    @staticmethod
+    def _ejecutar(estado):
+        """Genera el archivo de un trabajo (corre en el pool de hilos)"""
+        try:
+            estado['estado'] = 'procesando'
+            AlmacenExportaciones.guardar_estado(estado)
+            
+            buffer = ExportacionService._generar(
+                estado['tipo'], estado['formato'], estado['fecha_inicio'], estado['fecha_fin']
+            )
+            
+            ruta = AlmacenExportaciones.ruta_archivo(estado['id'], estado['extension'])
+            temporal = f"{ruta}.tmp"
+            with open(temporal, 'wb') as archivo:
+                archivo.write(buffer.getbuffer())
+            os.replace(temporal, ruta)
+            
+            estado['estado'] = 'completado'
+            estado['tamano'] = os.path.getsize(ruta)
+        except Exception as e:
+            print(f"❌ Error en exportación {estado['id']}: {e}")
+            estado['estado'] = 'error'
+            estado['error'] = str(e)
+        finally:
+            with ExportacionService._lock:
+                ExportacionService._pendientes -= 1
+        
+        estado['terminado_en'] = time.time()
+        AlmacenExportaciones.guardar_estado(estado)
+    
+    @staticmethod
+    def _generar(tipo, formato, fecha_inicio, fecha_fin):
+        """Obtiene los datos del reporte y genera el documento en memoria"""
+        if tipo == 'inventario':
+            resultado = ReporteService.generar_reporte_inventario()
+            argumentos = ()
+        elif tipo == 'ventas':
+            resultado = ReporteService.generar_reporte_ventas(fecha_inicio, fecha_fin)
+            argumentos = (fecha_inicio, fecha_fin)
+        else:
+            resultado = ReporteService.generar_reporte_compras(fecha_inicio, fecha_fin)
+            argumentos = (fecha_inicio, fecha_fin)
+        
+        if not resultado['success']:
+            raise ValueError(resultado.get('error', 'Error al generar reporte'))
+        
+        if formato == 'pdf':
+            # También fuera del proceso: los hilos de exportación comparten el GIL con la API
+            return BytesIO(PoolPDF.generar(tipo, resultado['data'], *argumentos))
+        
+        from utils.excel_generator import ExcelGenerator
+        return getattr(ExcelGenerator, f"generar_reporte_{tipo}")(resultado['data'], *argumentos)
+    
+    @staticmethod
+    def obtener_estado(job_id):
+        """Retorna el estado de un trabajo o None si no existe o venció"""
+        return AlmacenExportaciones.leer_estado(job_id)
+    
+    @staticmethod
+    def obtener_archivo(job_id):
+        """
+        Retorna (ruta, estado) de un trabajo completado
+        
+        Returns:
+            tuple: (ruta o None, estado o None)
+        """
+        estado = AlmacenExportaciones.leer_estado(job_id)
+        if not estado or estado['estado'] != 'completado':
+            return None, estado
+        
+        ruta = AlmacenExportaciones.ruta_archivo(job_id, estado['extension'])
+        if not os.path.exists(ruta):
+            return None, None
+        return ruta, estado
@@ -60,7 +60,7 @@ class ProductoService:
         Búsqueda optimizada de productos usando hash maps
         
         Args:
-            criterio: 'id', 'codigo', 'nombre'
+            criterio: 'id', 'codigo', 'nombre', 'fuzzy' (nombre tolerante a errores de tipeo)
             valor: valor a buscar
         """
         if criterio == 'id':
@@ -69,6 +69,8 @@ class ProductoService:
             return ProductoModel.obtener_por_codigo(valor)
         elif criterio == 'nombre':
             return ProductoModel.buscar_por_nombre(valor)
+        elif criterio == 'fuzzy':
+            return ProductoModel.buscar_por_nombre(valor, limite=20, difuso=True)
         else:
             raise ValueError("Criterio de búsqueda inválido")
     
@@ -122,6 +124,7 @@ class ProductoService:
     def ajustar_stock(producto_id, cantidad, tipo_ajuste, motivo, usuario_id):
         """
         Ajusta el stock de un producto
+        Entradas y salidas se aplican como variación sobre el stock bloqueado en BD
         
         Args:
             tipo_ajuste: 'entrada', 'salida', 'ajuste'
@@ -130,26 +133,26 @@ class ProductoService:
         if not producto:
             raise ValueError("Producto no encontrado")
         
-        stock_actual = producto['stock']
+        nuevo_stock = None
+        variacion = None
         
         if tipo_ajuste == 'entrada':
-            nuevo_stock = stock_actual + abs(cantidad)
+            variacion = abs(cantidad)
         elif tipo_ajuste == 'salida':
-            nuevo_stock = stock_actual - abs(cantidad)
-            if nuevo_stock < 0:
-                raise ValueError("Stock insuficiente")
+            variacion = -abs(cantidad)
         elif tipo_ajuste == 'ajuste':
             nuevo_stock = cantidad
         else:
             raise ValueError("Tipo de ajuste inválido")
         
-        # Actualizar stock
+        # Actualizar stock (valida stock insuficiente contra la fila bloqueada)
         return ProductoModel.actualizar_stock(
             producto_id=producto_id,
             nueva_cantidad=nuevo_stock,
             tipo_movimiento=tipo_ajuste,
             motivo=motivo,
-            usuario_id=usuario_id
+            usuario_id=usuario_id,
+            variacion=variacion
         )
     
     @staticmethod
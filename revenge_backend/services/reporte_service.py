@@ -4,6 +4,9 @@ Lógica de negocio para generación de reportes
 """
 
 from models.reporte_model import ReporteModel
+from utils.fecha_helper import FechaHelper
+from utils.stream_helper import StreamHelper
+from datetime import datetime, timedelta
 
 
 class ReporteService:
@@ -76,3 +79,65 @@ class ReporteService:
                 'success': False,
                 'error': str(e)
             }
+    
+    @staticmethod
+    def exportar_lineas_ventas_excel(fecha_inicio=None, fecha_fin=None):
+        """
+        Exporta las líneas de venta a Excel en streaming
+        
+        Args:
+            fecha_inicio (str): Fecha inicio (por defecto hace 7 días)
+            fecha_fin (str): Fecha fin (por defecto hoy)
+            
+        Returns:
+            tuple: (generador de bytes del .xlsx, nombre de archivo)
+            
+        Raises:
+            ValueError: Si alguna fecha no es válida
+        """
+        from utils.excel_generator import ExcelGenerator
+        
+        fecha_inicio, fecha_fin = ReporteService._rango_exportacion(fecha_inicio, fecha_fin)
+        filas = ReporteModel.lineas_ventas(fecha_inicio, fecha_fin)
+        contenido = ExcelGenerator.generar_stream(
+            'Líneas de Venta',
+            ReporteModel.COLUMNAS_LINEAS_VENTAS,
+            filas,
+            formatos={8: 'S/ #,##0.00', 9: 'S/ #,##0.00', 10: 'S/ #,##0.00'}
+        )
+        return contenido, f"ventas_{fecha_inicio}_{fecha_fin}.xlsx"
+    
+    @staticmethod
+    def exportar_lineas_ventas_texto(formato, fecha_inicio=None, fecha_fin=None):
+        """
+        Exporta las líneas de venta como CSV o NDJSON en streaming
+        
+        Args:
+            formato (str): 'csv' o 'ndjson'
+            
+        Returns:
+            tuple: (generador de bytes, nombre de archivo)
+            
+        Raises:
+            ValueError: Si el formato o alguna fecha no es válida
+        """
+        if formato not in ('csv', 'ndjson'):
+            raise ValueError(f"Formato inválido: {formato}")
+        
+        fecha_inicio, fecha_fin = ReporteService._rango_exportacion(fecha_inicio, fecha_fin)
+        filename = f"ventas_{fecha_inicio}_{fecha_fin}.{formato}"
+        
+        if formato == 'csv':
+            filas = ReporteModel.lineas_ventas(fecha_inicio, fecha_fin)
+            return StreamHelper.csv(ReporteModel.COLUMNAS_LINEAS_VENTAS, filas), filename
+        
+        filas = ReporteModel.lineas_ventas(fecha_inicio, fecha_fin, como_dict=True)
+        return StreamHelper.ndjson(filas), filename
+    
+    @staticmethod
+    def _rango_exportacion(fecha_inicio, fecha_fin):
+        """Normaliza el rango de una exportación (últimos 7 días por defecto)"""
+        hoy = datetime.now().date()
+        inicio = FechaHelper.a_fecha(fecha_inicio) if fecha_inicio else hoy - timedelta(days=7)
+        fin = FechaHelper.a_fecha(fecha_fin) if fecha_fin else hoy
+        return inicio.isoformat(), fin.isoformat()
@@ -49,7 +49,7 @@ class UsuarioService:
         # Si se incluye password, hashearlo
         if 'password' in datos and datos['password']:
             from utils.password_helper import PasswordHelper
-            datos['password_hash'] = PasswordHelper.hash_password(datos['password'])
+            datos['password_hash'] = PasswordHelper.hashear(datos['password'])
             datos.pop('password')
         elif 'password' in datos:
             # Si password está vacío, no actualizar
@@ -64,12 +64,30 @@ class UsuarioService:
             if UsuarioModel.verificar_email_existe(datos['email'], usuario_id):
                 raise ValueError("El email ya está en uso")
         
-        return UsuarioModel.actualizar(usuario_id, **datos)
+        resultado = UsuarioModel.actualizar(usuario_id, **datos)
+        
+        # Nueva contraseña, cambio de rol o desactivación: cerrar las sesiones abiertas
+        # (el rol viaja en el token)
+        cambio_rol = 'rol_id' in datos and int(datos['rol_id']) != usuario['rol_id']
+        desactivado = 'estado_id' in datos and int(datos['estado_id']) != 1
+        if 'password_hash' in datos or cambio_rol or desactivado:
+            # Importar aquí para evitar circular import
+            from services.auth_service import AuthService
+            AuthService.revocar_sesiones(usuario_id)
+        
+        return resultado
     
     @staticmethod
     def cambiar_estado(usuario_id, estado_id):
         """Cambia el estado de un usuario"""
-        return UsuarioModel.actualizar(usuario_id, estado_id=estado_id)
+        resultado = UsuarioModel.actualizar(usuario_id, estado_id=estado_id)
+        
+        # Usuario desactivado: sus tokens dejan de ser válidos de inmediato
+        if int(estado_id) != 1:
+            from services.auth_service import AuthService
+            AuthService.revocar_sesiones(usuario_id)
+        
+        return resultado
     
     @staticmethod
     def eliminar_usuario(usuario_id):
@@ -78,7 +96,11 @@ class UsuarioService:
         if not usuario:
             raise ValueError("Usuario no encontrado")
         
-        return UsuarioModel.eliminar_logico(usuario_id)
+        resultado = UsuarioModel.eliminar_logico(usuario_id)
+        
+        from services.auth_service import AuthService
+        AuthService.revocar_sesiones(usuario_id)
+        return resultado
     
     @staticmethod
     def obtener_usuarios_por_rol(rol_id):
@@ -5,9 +5,14 @@ Aplica SOLID con procesamiento de listas para items de venta
 
 from models.venta_model import VentaModel
 from models.detalle_venta_model import DetalleVentaModel
+from models.venta_diaria_model import VentaDiariaModel
+from models.reporte_model import ReporteModel
 from models.producto_model import ProductoModel
 from models.usuario_model import UsuarioModel
+from models.permiso_model import PermisoModel
+from services.boleta_service import BoletaService
 from config.database import Database
+from utils.cursor_helper import CursorHelper
 from datetime import datetime
 
 
@@ -42,18 +47,21 @@ class VentaService:
         if not cajero:
             raise ValueError("Cajero no encontrado")
         
-        # Verificar que el rol permite ventas (admin=1 o cajero=2)
-        if cajero['rol_id'] not in [1, 2]:
+        # Verificar que el rol permite ventas (permiso 'venta')
+        if not PermisoModel.tiene_permiso(cajero['rol_id'], 'venta'):
             raise ValueError("El usuario no tiene permisos para realizar ventas")
         
         # Validar items
         if not items or len(items) == 0:
             raise ValueError("La venta debe tener al menos un producto")
         
-        # Calcular totales y validar stock
+        # Calcular totales (el stock se valida dentro de la transacción)
         subtotal = 0
         items_validados = []
         
+        # Cargar todos los productos del carrito en una sola consulta
+        productos = ProductoModel.obtener_por_ids(int(item['producto_id']) for item in items)
+        
         for item in items:
             producto_id = int(item['producto_id'])
             cantidad = int(item['cantidad'])
@@ -61,16 +69,10 @@ class VentaService:
             descuento_unitario = float(item.get('descuento_unitario', 0))
             
             # Obtener producto
-            producto = ProductoModel.obtener_por_id(producto_id)
+            producto = productos.get(producto_id)
             if not producto:
                 raise ValueError(f"Producto ID {producto_id} no encontrado")
             
-            # Verificar stock
-            stock_actual = int(producto['stock']) if isinstance(producto['stock'], str) else producto['stock']
-            if stock_actual < cantidad:
-                raise ValueError(f"Stock insuficiente para {producto['nombre']}. " +
-                               f"Disponible: {stock_actual}, Requerido: {cantidad}")
-            
             # Usar precio de venta del producto si no se especifica
             if precio_unitario is None:
                 precio_unitario = producto['precio_venta']
@@ -105,7 +107,23 @@ class VentaService:
         # Crear venta en una transacción
         try:
             with Database.get_cursor(commit=True) as cursor:
-                # 1. Crear cabecera de venta
+                # 1. Bloquear las filas de productos y validar contra el stock real
+                cantidades = {}
+                for item in items_validados:
+                    cantidades[item['producto_id']] = cantidades.get(item['producto_id'], 0) + item['cantidad']
+                
+                stock_bloqueado = ProductoModel.bloquear_stock(cantidades.keys(), cursor)
+                
+                for item in items_validados:
+                    disponible = stock_bloqueado.get(item['producto_id'])
+                    if disponible is None:
+                        raise ValueError(f"Producto ID {item['producto_id']} no encontrado")
+                    requerido = cantidades[item['producto_id']]
+                    if disponible < requerido:
+                        raise ValueError(f"Stock insuficiente para {item['producto']['nombre']}. " +
+                                       f"Disponible: {disponible}, Requerido: {requerido}")
+                
+                # 2. Crear cabecera de venta
                 query_venta = """
                     INSERT INTO ventas (numero_boleta, cajero_id, subtotal, descuento,
                                       impuestos, total, metodo_pago_id, observaciones)
@@ -117,58 +135,43 @@ class VentaService:
                 ))
                 venta_id = cursor.lastrowid
                 
-                # 2. Crear detalles y actualizar stock
-                query_detalle = """
-                    INSERT INTO detalle_venta (venta_id, producto_id, cantidad,
-                                              precio_unitario, descuento_unitario)
-                    VALUES (%s, %s, %s, %s, %s)
-                """
-                
-                query_update_stock = """
-                    UPDATE productos SET stock = stock - %s, updated_at = NOW()
-                    WHERE id = %s
-                """
+                # 3. Crear detalles (un solo INSERT multi-fila)
+                DetalleVentaModel.crear_multiples(venta_id, items_validados, cursor=cursor)
                 
-                query_movimiento = """
-                    INSERT INTO movimientos_inventario 
-                    (producto_id, tipo, cantidad, stock_anterior, stock_nuevo,
-                     referencia_id, referencia_tipo, motivo, usuario_id)
-                    VALUES (%s, 'salida', %s, %s, %s, %s, 'venta', 'Venta realizada', %s)
-                """
+                # 4. Actualizar stock de todos los productos con un solo UPDATE
+                variaciones = {pid: -cantidad for pid, cantidad in cantidades.items()}
+                ProductoModel.actualizar_stock_lote(variaciones, cursor)
                 
+                # 5. Registrar movimientos (un solo INSERT multi-fila)
+                # Parte del stock bloqueado y se acumula si el producto se repite
+                movimientos = []
                 for item in items_validados:
-                    # Crear detalle
-                    cursor.execute(query_detalle, (
-                        venta_id,
-                        item['producto_id'],
-                        item['cantidad'],
-                        item['precio_unitario'],
-                        item['descuento_unitario']
-                    ))
-                    
-                    # Actualizar stock
-                    cursor.execute(query_update_stock, (
-                        item['cantidad'],
-                        item['producto_id']
-                    ))
-                    
-                    # Registrar movimiento
-                    stock_anterior = item['producto']['stock']
+                    stock_anterior = stock_bloqueado[item['producto_id']]
                     stock_nuevo = stock_anterior - item['cantidad']
+                    stock_bloqueado[item['producto_id']] = stock_nuevo
                     
-                    cursor.execute(query_movimiento, (
-                        item['producto_id'],
-                        -item['cantidad'],
-                        stock_anterior,
-                        stock_nuevo,
-                        venta_id,
-                        cajero_id
+                    movimientos.append((
+                        item['producto_id'], 'salida', -item['cantidad'],
+                        stock_anterior, stock_nuevo, venta_id,
+                        'venta', 'Venta realizada', cajero_id
                     ))
+                ProductoModel.registrar_movimientos_lote(movimientos, cursor)
+                
+                # 6. Sumar la venta a los agregados diarios (reportes)
+                VentaDiariaModel.registrar_venta(venta_id, cursor)
+                
+                # 7. Limpiar cache de productos afectados y reportes de hoy (en todos los workers)
+                ProductoModel.invalidar_cache(cantidades.keys(), cursor)
+                ReporteModel.invalidar_cache_abiertos(cursor)
             
-            # Limpiar cache de productos afectados
-            for item in items_validados:
-                if item['producto_id'] in ProductoModel._productos_por_id:
-                    del ProductoModel._productos_por_id[item['producto_id']]
+            # Datos para imprimir la boleta sin volver a consultar la venta
+            try:
+                BoletaService.registrar(
+                    venta_id, numero_boleta, cajero, items_validados, subtotal,
+                    descuento_general, impuestos, total, metodo_pago_id, observaciones
+                )
+            except Exception as e:
+                print(f"❌ Error preparando boleta de venta {venta_id}: {e}")
             
             return {
                 'venta_id': venta_id,
@@ -187,9 +190,15 @@ class VentaService:
         return VentaModel.obtener_por_id(venta_id)
     
     @staticmethod
-    def listar_ventas(limite=100, offset=0):
-        """Lista ventas con paginación"""
-        return VentaModel.obtener_todas(limite, offset)
+    def listar_ventas(limite=100, offset=0, cursor=None):
+        """
+        Lista ventas con paginación
+        
+        Returns:
+            tuple: (ventas, next_cursor) - next_cursor es None en la última página
+        """
+        ventas = VentaModel.obtener_todas(limite + 1, offset, cursor)
+        return CursorHelper.paginar(ventas, limite)
     
     @staticmethod
     def obtener_ventas_por_fecha(fecha_inicio, fecha_fin):
@@ -0,0 +1,11 @@
+"""
+Configuración de pytest
+Los módulos se importan como en app.py: con revenge_backend en el path
+(y la raíz del repositorio, para create_app)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -0,0 +1,37 @@
+"""
+Pruebas de los manejadores de errores registrados por create_app
+"""
+
+import pytest
+from app import create_app
+from services.reporte_service import ReporteService
+from utils.pdf_pool import PoolPDF, ColaPDFLlenaError, PDFNoDisponibleError
+
+
+@pytest.fixture(scope='module')
+def cliente():
+    return create_app().test_client()
+
+
+def test_cursor_invalido_responde_400(cliente):
+    respuesta = cliente.get('/api/ventas?cursor=@@@')
+    
+    assert respuesta.status_code == 400
+    assert respuesta.get_json()['error'] is True
+
+
+@pytest.mark.parametrize('error, estado', [
+    (ColaPDFLlenaError('cola llena'), 429),
+    (PDFNoDisponibleError('timeout'), 503)
+])
+def test_pdf_saturado_responde_con_retry_after(cliente, monkeypatch, error, estado):
+    def generar_fallido(*args):
+        raise error
+    
+    monkeypatch.setattr(ReporteService, 'generar_reporte_inventario', lambda: {'success': True, 'data': {}})
+    monkeypatch.setattr(PoolPDF, 'generar', generar_fallido)
+    
+    respuesta = cliente.get('/api/reportes/inventario/pdf')
+    
+    assert respuesta.status_code == estado
+    assert respuesta.headers['Retry-After'] == str(PoolPDF.REINTENTAR_EN)
@@ -0,0 +1,57 @@
+"""
+Pruebas de la búsqueda difusa de IndiceBusqueda
+"""
+
+import pytest
+from utils.indice_busqueda import IndiceBusqueda
+
+
+@pytest.fixture
+def indice():
+    indice = IndiceBusqueda({'nombre': 1.0})
+    indice.cargar([
+        {'id': 1, 'nombre': 'Mantequilla Gloria'},
+        {'id': 2, 'nombre': 'Chocolate Sublime'},
+        {'id': 3, 'nombre': 'Leche Evaporada'},
+        {'id': 4, 'nombre': 'Pan'}
+    ])
+    return indice
+
+
+@pytest.mark.parametrize('consulta, esperado', [
+    ('lehce', 3),          # Transposición
+    ('lecge', 3),          # Sustitución
+    ('lece', 3),           # Borrado
+    ('leeche', 3),         # Inserción
+    ('chocolafe', 2)       # Sustitución en término largo
+])
+def test_distancia_1(indice, consulta, esperado):
+    assert indice.buscar(consulta, difuso=True) == [esperado]
+
+
+@pytest.mark.parametrize('consulta, esperado', [
+    ('xhocolaye', 2),      # Dos sustituciones
+    ('chocolatexx', 2),    # Dos inserciones
+    ('chcolat', 2),        # Dos borrados
+    ('mantekilla', 1),     # Sustitución + borrado
+    ('mantquila', 1),      # Dos borrados
+    ('mantequiilla', 1)    # Inserción
+])
+def test_distancia_2_en_terminos_largos(indice, consulta, esperado):
+    assert indice.buscar(consulta, difuso=True) == [esperado]
+
+
+def test_terminos_cortos_toleran_un_error(indice):
+    # 'lexhe' está a distancia 1 de 'leche'; 'lxxhe' a distancia 2 (término de 5 caracteres)
+    assert indice.buscar('lexhe', difuso=True) == [3]
+    assert indice.buscar('lxxhe', difuso=True) == []
+
+
+def test_sin_difuso_no_corrige(indice):
+    assert indice.buscar('mantekilla') == []
+
+
+def test_quitar_limpia_borrados(indice):
+    indice.quitar(2)
+    assert indice.buscar('xhocolaye', difuso=True) == []
+    assert not any('chocolate' in tokens for tokens in indice._borrados.values())
@@ -0,0 +1,76 @@
+"""
+Pruebas de la agregación de métricas entre workers (archivos en METRICAS_DIR)
+"""
+
+import json
+import os
+import time
+import pytest
+from utils.metricas import Metricas
+
+
+@pytest.fixture
+def directorio(tmp_path, monkeypatch):
+    monkeypatch.setattr(Metricas, 'DIRECTORIO', str(tmp_path))
+    return tmp_path
+
+
+def escribir_worker(directorio, pid, etiquetas, actualizado=None, en_curso=0):
+    """Archivo de otro worker con 3 errores y una consulta de 2 ms"""
+    estado = {
+        'pid': pid,
+        'actualizado': actualizado if actualizado is not None else time.time(),
+        'contadores': [['db_errores_total', etiquetas, 3]],
+        'histogramas': [['db_consulta_segundos', etiquetas, [0, 0, 1] + [0] * 10, 0.002, 1]],
+        'en_curso': en_curso,
+        'externo': [['pdf_pendientes', 'gauge', 'PDFs en generación o en cola', [[[], 4]]]]
+    }
+    ruta = directorio / f"{pid}.json"
+    ruta.write_text(json.dumps(estado), encoding='utf-8')
+    return ruta
+
+
+def test_exponer_suma_los_workers(directorio):
+    etiquetas = (('prueba', 'suma'),)
+    Metricas.incrementar('db_errores_total', 2, etiquetas)
+    Metricas.observar('db_consulta_segundos', 0.002, etiquetas)
+    escribir_worker(directorio, 999991, [['prueba', 'suma']], en_curso=2)
+    
+    texto = Metricas.exponer()
+    
+    assert 'revenge_db_errores_total{prueba="suma"} 5' in texto
+    assert 'revenge_db_consulta_segundos_count{prueba="suma"} 2' in texto
+    assert 'revenge_db_consulta_segundos_bucket{prueba="suma",le="0.0025"} 2' in texto
+    assert 'revenge_http_en_curso 2' in texto
+    assert 'revenge_pdf_pendientes{worker="999991"} 4' in texto
+    assert f'revenge_pdf_pendientes{{worker="{os.getpid()}"}}' in texto
+
+
+def test_worker_terminado_conserva_contadores_pero_no_valores_instantaneos(directorio):
+    escribir_worker(directorio, 999992, [['prueba', 'terminado']],
+                    actualizado=time.time() - 10 * Metricas.INTERVALO, en_curso=7)
+    
+    texto = Metricas.exponer()
+    
+    assert 'revenge_db_errores_total{prueba="terminado"} 3' in texto
+    assert 'revenge_http_en_curso 7' not in texto
+    assert 'worker="999992"' not in texto
+
+
+def test_heredar_no_pierde_ni_duplica(directorio):
+    ruta = escribir_worker(directorio, 999993, [['prueba', 'heredar']])
+    assert 'revenge_db_errores_total{prueba="heredar"} 3' in Metricas.exponer()
+    
+    Metricas._heredar(str(ruta))
+    
+    assert not ruta.exists()
+    assert 'revenge_db_errores_total{prueba="heredar"} 3' in Metricas.exponer()
+    assert json.loads((directorio / f"{os.getpid()}.json").read_text(encoding='utf-8'))['contadores']
+
+
+def test_heredar_abandonados_ignora_archivos_recientes(directorio):
+    reciente = escribir_worker(directorio, 999994, [['prueba', 'reciente']])
+    
+    Metricas._heredar_abandonados()
+    
+    assert reciente.exists()
@@ -0,0 +1,103 @@
+"""
+Pruebas del armado del reporte de ventas sobre los agregados diarios
+"""
+
+import json
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from config.database import Database
+from models.reporte_model import ReporteModel
+from utils.cache_sync import CacheSync
+from utils.lru_cache import LRUCache
+
+
+def resultados_con_decimal():
+    # SUM() sobre ventas_diarias devuelve Decimal aunque la columna sea entera
+    return {
+        'resumen': {
+            'total_ventas': Decimal('5'), 'monto_total': Decimal('250.00'),
+            'promedio_venta': Decimal('50.00'), 'venta_minima': Decimal('10.00'),
+            'venta_maxima': Decimal('90.00')
+        },
+        'por_dia': [{'fecha': date(2025, 1, 2), 'cantidad': Decimal('5'), 'total': Decimal('250.00')}],
+        'productos': [{
+            'codigo_barras': '775001', 'producto': 'Pan', 'categoria': 'Panadería',
+            'cantidad_vendida': Decimal('12'), 'precio_unitario': Decimal('0.50'),
+            'total_vendido': Decimal('6.00')
+        }],
+        'metodos': [{'metodo_pago': 'Efectivo', 'cantidad': Decimal('5'), 'total': Decimal('250.00')}],
+        'cajeros': [
+            {'cajero': 'Ana', 'cantidad_ventas': Decimal('3'), 'total_vendido': Decimal('100.00')},
+            {'cajero': 'Luis', 'cantidad_ventas': Decimal('0'), 'total_vendido': Decimal('0.00')}
+        ]
+    }
+
+
+def test_conteos_decimal_se_convierten_a_int():
+    reporte = ReporteModel._armar_reporte_ventas('2025-01-01', '2025-01-31', resultados_con_decimal())
+    
+    assert reporte['resumen']['total_ventas'] == 5
+    assert type(reporte['resumen']['total_ventas']) is int
+    assert type(reporte['ventas_por_dia'][0]['cantidad']) is int
+    assert type(reporte['ventas_por_metodo_pago'][0]['cantidad']) is int
+    assert type(reporte['ventas_por_cajero'][0]['cantidad']) is int
+
+
+def test_ticket_promedio_con_conteo_decimal():
+    reporte = ReporteModel._armar_reporte_ventas('2025-01-01', '2025-01-31', resultados_con_decimal())
+    
+    assert reporte['ventas_por_cajero'][0]['ticket_promedio'] == 33.33
+    assert reporte['ventas_por_cajero'][1]['ticket_promedio'] == 0
+
+
+def test_conteos_se_serializan_como_numeros():
+    reporte = ReporteModel._armar_reporte_ventas('2025-01-01', '2025-01-31', resultados_con_decimal())
+    datos = json.loads(json.dumps(reporte, default=str))
+    
+    assert datos['resumen']['total_ventas'] == 5
+    assert datos['ventas_por_dia'][0]['cantidad'] == 5
+    assert datos['ventas_por_metodo_pago'][0]['cantidad'] == 5
+
+
+def test_reporte_sin_ventas():
+    reporte = ReporteModel._armar_reporte_ventas('2025-01-01', '2025-01-31', {
+        'resumen': None, 'por_dia': [], 'productos': [], 'metodos': [], 'cajeros': []
+    })
+    
+    assert reporte['resumen']['total_ventas'] == 0
+    assert reporte['ventas_por_cajero'] == []
+
+
+def test_cierre_se_decide_con_la_hora_de_la_bd(monkeypatch):
+    # MySQL va 5 horas atrasado respecto de la app: para la BD, ayer aún no terminó
+    ahora_bd = datetime.now() - timedelta(hours=5)
+    monkeypatch.setattr(ReporteModel, '_desfase', None)
+    monkeypatch.setattr(Database, 'execute_query', lambda *args, **kwargs: {'ahora': ahora_bd})
+    monkeypatch.setattr(CacheSync, 'sincronizar', lambda *args, **kwargs: None)
+    monkeypatch.setattr(ReporteModel, '_cache_cerrados', LRUCache('prueba_cerrados', tipo_clave=str))
+    monkeypatch.setattr(ReporteModel, '_cache_abiertos', LRUCache('prueba_abiertos', tipo_clave=str))
+    
+    ayer_bd = (ahora_bd - timedelta(days=1)).date().isoformat()
+    hoy_bd = ahora_bd.date().isoformat()
+    ReporteModel._con_cache('ventas', hoy_bd, hoy_bd, lambda inicio, fin: {'rango': 'hoy'})
+    ReporteModel._con_cache('ventas', ayer_bd, ayer_bd, lambda inicio, fin: {'rango': 'ayer'})
+    
+    assert ReporteModel._cache_abiertos.obtener(('ventas', hoy_bd, hoy_bd)) == {'rango': 'hoy'}
+    assert ReporteModel._cache_cerrados.obtener(('ventas', hoy_bd, hoy_bd)) is None
+    assert ReporteModel._cache_cerrados.obtener(('ventas', ayer_bd, ayer_bd)) == {'rango': 'ayer'}
+
+
+def test_sin_hora_de_la_bd_el_rango_se_trata_como_abierto(monkeypatch):
+    def falla(*args, **kwargs):
+        raise ConnectionError('sin conexión')
+    
+    monkeypatch.setattr(ReporteModel, '_desfase', None)
+    monkeypatch.setattr(Database, 'execute_query', falla)
+    monkeypatch.setattr(CacheSync, 'sincronizar', lambda *args, **kwargs: None)
+    monkeypatch.setattr(ReporteModel, '_cache_cerrados', LRUCache('prueba_cerrados', tipo_clave=str))
+    monkeypatch.setattr(ReporteModel, '_cache_abiertos', LRUCache('prueba_abiertos', tipo_clave=str))
+    
+    ReporteModel._con_cache('ventas', '2020-01-01', '2020-01-31', lambda inicio, fin: {'rango': 'enero'})
+    
+    assert ReporteModel._cache_cerrados.obtener(('ventas', '2020-01-01', '2020-01-31')) is None
+    assert ReporteModel._cache_abiertos.obtener(('ventas', '2020-01-01', '2020-01-31')) == {'rango': 'enero'}
@@ -0,0 +1,152 @@
+"""
+Almacén de exportaciones en disco
+Cada trabajo guarda `<id>.json` (estado) y `<id>.<ext>` (archivo generado)
+en un directorio compartido, así cualquier worker puede responder el estado
+y la descarga. El almacén es acotado: los archivos vencen tras EXPORT_TTL
+y se borran los más antiguos si se supera EXPORT_MAX_ARCHIVOS o EXPORT_MAX_MB.
+Los trabajos pendientes o en proceso no se borran (salvo abandonados).
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+
+
+class AlmacenExportaciones:
+    """Almacén acotado de archivos generados y su estado"""
+    
+    DIRECTORIO = os.getenv('EXPORT_DIR') or os.path.join(tempfile.gettempdir(), 'revenge_exportaciones')
+    TTL = float(os.getenv('EXPORT_TTL', 3600))                         # Vida de cada exportación (s)
+    MAX_ARCHIVOS = int(os.getenv('EXPORT_MAX_ARCHIVOS', 50))
+    MAX_BYTES = int(float(os.getenv('EXPORT_MAX_MB', 500)) * 1024 * 1024)
+    
+    ACTIVOS = ('pendiente', 'procesando')
+    ABANDONO = 2        # Un trabajo activo por más de ABANDONO * TTL perdió su worker
+    
+    _PATRON_ID = re.compile(r'^[0-9a-f]{32}$')
+    _lock = threading.Lock()
+    
+    @staticmethod
+    def id_valido(job_id):
+        """Evita rutas arbitrarias: solo IDs hexadecimales de 32 caracteres"""
+        return bool(job_id) and AlmacenExportaciones._PATRON_ID.match(job_id) is not None
+    
+    @staticmethod
+    def _ruta(nombre):
+        os.makedirs(AlmacenExportaciones.DIRECTORIO, exist_ok=True)
+        return os.path.join(AlmacenExportaciones.DIRECTORIO, nombre)
+    
+    @staticmethod
+    def ruta_archivo(job_id, extension):
+        """Ruta del archivo generado de un trabajo"""
+        return AlmacenExportaciones._ruta(f"{job_id}.{extension}")
+    
+    @staticmethod
+    def guardar_estado(estado):
+        """Escribe el estado de un trabajo de forma atómica (archivo temporal + rename)"""
+        ruta = AlmacenExportaciones._ruta(f"{estado['id']}.json")
+        temporal = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            json.dump(estado, archivo, ensure_ascii=False)
+        os.replace(temporal, ruta)
+    
+    @staticmethod
+    def leer_estado(job_id):
+        """
+        Lee el estado de un trabajo
+        
+        Returns:
+            dict o None si no existe, es inválido o ya venció
+        """
+        if not AlmacenExportaciones.id_valido(job_id):
+            return None
+        
+        try:
+            with open(AlmacenExportaciones._ruta(f"{job_id}.json"), encoding='utf-8') as archivo:
+                estado = json.load(archivo)
+        except (OSError, ValueError):
+            return None
+        
+        if estado.get('expira_en') and estado['expira_en'] < time.time() \
+                and estado.get('estado') not in AlmacenExportaciones.ACTIVOS:
+            AlmacenExportaciones.eliminar(job_id)
+            return None
+        return estado
+    
+    @staticmethod
+    def _activo(job_id, ahora):
+        """True si el trabajo sigue pendiente o en proceso (y no fue abandonado)"""
+        try:
+            with open(AlmacenExportaciones._ruta(f"{job_id}.json"), encoding='utf-8') as archivo:
+                estado = json.load(archivo)
+        except (OSError, ValueError):
+            return False
+        
+        if estado.get('estado') not in AlmacenExportaciones.ACTIVOS:
+            return False
+        limite = AlmacenExportaciones.ABANDONO * AlmacenExportaciones.TTL
+        return estado.get('creado_en', 0) + limite >= ahora
+    
+    @staticmethod
+    def eliminar(job_id):
+        """Borra el estado y el archivo de un trabajo"""
+        directorio = AlmacenExportaciones.DIRECTORIO
+        try:
+            nombres = [n for n in os.listdir(directorio) if n.split('.', 1)[0] == job_id]
+        except OSError:
+            return
+        for nombre in nombres:
+            try:
+                os.remove(os.path.join(directorio, nombre))
+            except OSError:
+                pass
+    
+    @staticmethod
+    def purgar():
+        """
+        Borra los trabajos terminados vencidos y, si el almacén supera sus
+        límites, los terminados más antiguos primero (los activos no se tocan:
+        el trabajo fallaría a mitad de camino)
+        """
+        directorio = AlmacenExportaciones.DIRECTORIO
+        ahora = time.time()
+        
+        with AlmacenExportaciones._lock:
+            try:
+                nombres = os.listdir(directorio)
+            except OSError:
+                return
+            
+            # {job_id: [bytes, creado_en]}
+            trabajos = {}
+            for nombre in nombres:
+                job_id = nombre.split('.', 1)[0]
+                if not AlmacenExportaciones.id_valido(job_id):
+                    continue
+                try:
+                    info = os.stat(os.path.join(directorio, nombre))
+                except OSError:
+                    continue
+                datos = trabajos.setdefault(job_id, [0, info.st_mtime])
+                datos[0] += info.st_size
+                datos[1] = min(datos[1], info.st_mtime)
+            
+            vigentes = []
+            for job_id, (tamano, creado_en) in trabajos.items():
+                if AlmacenExportaciones._activo(job_id, ahora):
+                    continue
+                if creado_en + AlmacenExportaciones.TTL < ahora:
+                    AlmacenExportaciones.eliminar(job_id)
+                else:
+                    vigentes.append((creado_en, job_id, tamano))
+            
+            vigentes.sort()
+            total = sum(tamano for _, _, tamano in vigentes)
+            while vigentes and (len(vigentes) > AlmacenExportaciones.MAX_ARCHIVOS
+                                or total > AlmacenExportaciones.MAX_BYTES):
+                _, job_id, tamano = vigentes.pop(0)
+                AlmacenExportaciones.eliminar(job_id)
+                total -= tamano
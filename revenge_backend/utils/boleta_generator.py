@@ -0,0 +1,223 @@
+"""
+Generador de Boletas de Venta
+Formatos: PDF de 80mm, texto plano para impresora térmica y ESC/POS
+Estructura: Encabezado de la tienda (fijo) renderizado una vez por proceso
++ cuerpo generado desde los datos de la venta
+"""
+
+import os
+import threading
+from io import BytesIO
+
+try:
+    from reportlab.lib.units import mm
+    from reportlab.pdfgen import canvas
+    REPORTLAB_AVAILABLE = True
+except ImportError:
+    REPORTLAB_AVAILABLE = False
+
+
+# Comandos ESC/POS
+ESC_INICIAR = b'\x1b@'
+ESC_CODEPAGE_1252 = b'\x1bt\x10'
+ESC_IZQUIERDA = b'\x1ba\x00'
+ESC_CENTRO = b'\x1ba\x01'
+ESC_NEGRITA = b'\x1bE\x01'
+ESC_NORMAL = b'\x1bE\x00'
+ESC_DOBLE = b'\x1d!\x11'
+ESC_SIMPLE = b'\x1d!\x00'
+ESC_CORTE = b'\x1bd\x04\x1dVB\x00'
+
+
+class BoletaGenerator:
+    """Generador de boletas para impresoras de 80mm"""
+    
+    TIENDA_NOMBRE = os.getenv('TIENDA_NOMBRE', 'REVENGE POS')
+    TIENDA_RUC = os.getenv('TIENDA_RUC', '')
+    TIENDA_DIRECCION = os.getenv('TIENDA_DIRECCION', '')
+    TIENDA_TELEFONO = os.getenv('TIENDA_TELEFONO', '')
+    PIE = os.getenv('BOLETA_PIE', '¡Gracias por su compra!')
+    COLUMNAS = int(os.getenv('BOLETA_COLUMNAS', 48))       # 48 = fuente A en papel de 80mm
+    
+    # Encabezados ya renderizados (se construyen en el primer uso)
+    _encabezado_texto = None
+    _encabezado_escpos = None
+    _lock = threading.Lock()
+    
+    # ==================== ENCABEZADO (CACHE POR PROCESO) ====================
+    
+    @staticmethod
+    def _lineas_encabezado():
+        """Líneas fijas de la tienda (sin el nombre)"""
+        lineas = []
+        if BoletaGenerator.TIENDA_RUC:
+            lineas.append(f"RUC: {BoletaGenerator.TIENDA_RUC}")
+        if BoletaGenerator.TIENDA_DIRECCION:
+            lineas.append(BoletaGenerator.TIENDA_DIRECCION)
+        if BoletaGenerator.TIENDA_TELEFONO:
+            lineas.append(f"Tel: {BoletaGenerator.TIENDA_TELEFONO}")
+        return lineas
+    
+    @staticmethod
+    def _preparar_encabezados():
+        """Renderiza el encabezado en texto y ESC/POS una sola vez"""
+        if BoletaGenerator._encabezado_escpos is not None:
+            return
+        
+        with BoletaGenerator._lock:
+            if BoletaGenerator._encabezado_escpos is not None:
+                return
+            
+            columnas = BoletaGenerator.COLUMNAS
+            lineas = BoletaGenerator._lineas_encabezado()
+            
+            BoletaGenerator._encabezado_texto = [BoletaGenerator.TIENDA_NOMBRE.center(columnas)]
+            BoletaGenerator._encabezado_texto.extend(linea.center(columnas) for linea in lineas)
+            
+            escpos = [ESC_INICIAR, ESC_CODEPAGE_1252, ESC_CENTRO,
+                      ESC_DOBLE, ESC_NEGRITA, BoletaGenerator._codificar(BoletaGenerator.TIENDA_NOMBRE),
+                      b'\n', ESC_SIMPLE, ESC_NORMAL]
+            escpos.extend(BoletaGenerator._codificar(linea) + b'\n' for linea in lineas)
+            escpos.append(ESC_IZQUIERDA)
+            BoletaGenerator._encabezado_escpos = b''.join(escpos)
+    
+    @staticmethod
+    def _codificar(texto):
+        """Texto a la página de códigos de la impresora (WPC1252)"""
+        return texto.encode('cp1252', errors='replace')
+    
+    # ==================== CUERPO ====================
+    
+    @staticmethod
+    def _monto(valor):
+        return f"S/ {valor:,.2f}"
+    
+    @staticmethod
+    def _fila(izquierda, derecha):
+        """Texto a la izquierda y monto alineado a la derecha"""
+        espacio = max(1, BoletaGenerator.COLUMNAS - len(izquierda) - len(derecha))
+        return f"{izquierda}{' ' * espacio}{derecha}"
+    
+    @staticmethod
+    def _cuerpo(boleta):
+        """
+        Líneas variables de la boleta
+        
+        Returns:
+            list: [(texto, negrita)]
+        """
+        columnas = BoletaGenerator.COLUMNAS
+        separador = ('-' * columnas, False)
+        fila = BoletaGenerator._fila
+        monto = BoletaGenerator._monto
+        
+        lineas = [
+            separador,
+            (f"BOLETA DE VENTA {boleta['numero_boleta']}".center(columnas), True),
+            (f"Fecha: {boleta['fecha'].strftime('%d/%m/%Y %H:%M:%S')}", False),
+            (f"Cajero: {boleta['cajero']}", False),
+            separador
+        ]
+        
+        for item in boleta['items']:
+            lineas.append((item['producto'][:columnas], False))
+            detalle = f"  {item['cantidad']} x {monto(item['precio_unitario'])}"
+            if item['descuento_unitario']:
+                detalle += f" -{item['descuento_unitario']:.2f}"
+            lineas.append((fila(detalle, monto(item['subtotal'])), False))
+        
+        lineas.append(separador)
+        lineas.append((fila('SUBTOTAL', monto(boleta['subtotal'])), False))
+        if boleta['descuento']:
+            lineas.append((fila('DESCUENTO', f"-{monto(boleta['descuento'])}"), False))
+        lineas.append((fila('IGV', monto(boleta['impuestos'])), False))
+        lineas.append((fila('TOTAL', monto(boleta['total'])), True))
+        lineas.append(separador)
+        lineas.append((f"Pago: {boleta['metodo_pago']}", False))
+        if boleta.get('observaciones'):
+            lineas.append((f"Obs: {boleta['observaciones']}"[:columnas], False))
+        lineas.append(('', False))
+        lineas.append((BoletaGenerator.PIE.center(columnas), False))
+        return lineas
+    
+    # ==================== FORMATOS ====================
+    
+    @staticmethod
+    def generar_texto(boleta):
+        """
+        Boleta en texto plano de ancho fijo (COLUMNAS caracteres)
+        
+        Args:
+            boleta (dict): Datos de la venta (ver BoletaService)
+        
+        Returns:
+            str
+        """
+        BoletaGenerator._preparar_encabezados()
+        lineas = list(BoletaGenerator._encabezado_texto)
+        lineas.extend(texto for texto, _ in BoletaGenerator._cuerpo(boleta))
+        return '\n'.join(lineas) + '\n'
+    
+    @staticmethod
+    def generar_escpos(boleta):
+        """
+        Boleta en comandos ESC/POS listos para enviar a la impresora
+        
+        Returns:
+            bytes
+        """
+        BoletaGenerator._preparar_encabezados()
+        partes = [BoletaGenerator._encabezado_escpos]
+        for texto, negrita in BoletaGenerator._cuerpo(boleta):
+            linea = BoletaGenerator._codificar(texto) + b'\n'
+            partes.append(ESC_NEGRITA + linea + ESC_NORMAL if negrita else linea)
+        partes.append(ESC_CORTE)
+        return b''.join(partes)
+    
+    @staticmethod
+    def generar_pdf(boleta):
+        """
+        Boleta en PDF de 80mm de ancho (alto según la cantidad de líneas)
+        
+        Returns:
+            bytes
+        """
+        if not REPORTLAB_AVAILABLE:
+            raise ImportError("reportlab no está instalado. Ejecuta: pip install reportlab")
+        
+        BoletaGenerator._preparar_encabezados()
+        cuerpo = BoletaGenerator._cuerpo(boleta)
+        
+        # Fuente monoespaciada: COLUMNAS caracteres ocupan el ancho útil
+        ancho = 80 * mm
+        margen = 4 * mm
+        tamano = (ancho - 2 * margen) / (0.6 * BoletaGenerator.COLUMNAS)
+        interlineado = tamano * 1.25
+        lineas_totales = len(BoletaGenerator._encabezado_texto) + len(cuerpo)
+        alto = 2 * margen + interlineado * (lineas_totales + 1)
+        
+        buffer = BytesIO()
+        pdf = canvas.Canvas(buffer, pagesize=(ancho, alto))
+        pdf.setTitle(f"Boleta {boleta['numero_boleta']}")
+        
+        y = alto - margen - interlineado
+        pdf.setFont('Courier-Bold', tamano * 1.4)
+        pdf.drawCentredString(ancho / 2, y, BoletaGenerator.TIENDA_NOMBRE)
+        y -= interlineado * 1.5
+        pdf.setFont('Courier', tamano)
+        for linea in BoletaGenerator._encabezado_texto[1:]:
+            pdf.drawString(margen, y, linea)
+            y -= interlineado
+        
+        for texto, negrita in cuerpo:
+            if negrita:
+                pdf.setFont('Courier-Bold', tamano)
+                pdf.drawString(margen, y, texto)
+                pdf.setFont('Courier', tamano)
+            else:
+                pdf.drawString(margen, y, texto)
+            y -= interlineado
+        
+        pdf.showPage()
+        pdf.save()
+        return buffer.getvalue()
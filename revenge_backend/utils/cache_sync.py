@@ -0,0 +1,243 @@
+"""
+Coherencia de caches entre workers
+Cada escritura publica una fila en `cache_invalidaciones`; cada proceso
+consulta las filas nuevas como máximo una vez por intervalo y descarta
+las claves afectadas de sus caches en memoria.
+No requiere servicios externos: solo la misma base de datos MySQL.
+"""
+
+import os
+import threading
+import time
+from config.database import Database
+
+
+class CacheSync:
+    """
+    Bus de invalidación basado en una tabla de log
+    Estructura: Diccionario de handlers por nombre de cache
+    """
+    
+    INTERVALO = float(os.getenv('CACHE_SYNC_INTERVALO', 1))    # Retraso máximo entre workers (s)
+    GRACIA = float(os.getenv('CACHE_SYNC_GRACIA', 10))         # Ventana para transacciones que confirman tarde (s)
+    RETENCION = int(os.getenv('CACHE_SYNC_RETENCION', 3600))   # Antigüedad máxima de las filas del log (s)
+    LIMITE_LOTE = 5000
+    
+    _handlers = {}          # {cache: funcion(clave)} clave=None vacía el cache completo
+    _lock = threading.Lock()
+    _pid = None
+    _ultimo_id = None       # Todas las filas con id <= _ultimo_id ya fueron procesadas
+    _vistos = set()         # IDs > _ultimo_id ya aplicados (dentro de la ventana de gracia)
+    _ultimo_sondeo = 0.0
+    _ultima_purga = 0.0
+    _metricas = {}
+    
+    @staticmethod
+    def registrar(cache, handler):
+        """Registra la función que invalida una clave de un cache local"""
+        CacheSync._handlers[cache] = handler
+    
+    @staticmethod
+    def publicar(cache, claves=None, cursor=None):
+        """
+        Publica la invalidación para los demás workers
+        
+        Args:
+            cache: Nombre del cache ('productos', 'usuarios', ...)
+            claves: Lista de claves o None para vaciar el cache completo
+            cursor: Cursor de la transacción en curso (la invalidación se
+                    confirma junto con los datos)
+        """
+        query = "INSERT INTO cache_invalidaciones (cache, clave) VALUES (%s, %s)"
+        if claves is None:
+            params = [(cache, None)]
+        else:
+            params = [(cache, str(clave)) for clave in dict.fromkeys(claves)]
+        
+        if not params:
+            return
+        
+        try:
+            if cursor:
+                cursor.executemany(query, params)
+            else:
+                with Database.get_cursor(commit=True) as cursor:
+                    cursor.executemany(query, params)
+        except Exception as e:
+            if cursor is not None:
+                raise
+            print(f"⚠️  No se pudo publicar invalidación de '{cache}': {e}")
+    
+    @staticmethod
+    def invalidar(cache, claves=None, cursor=None):
+        """Invalida localmente y publica para los demás workers"""
+        CacheSync._aplicar(cache, claves)
+        CacheSync.publicar(cache, claves, cursor)
+    
+    @staticmethod
+    def _aplicar(cache, claves):
+        """Ejecuta el handler local de un cache"""
+        handler = CacheSync._handlers.get(cache)
+        if not handler:
+            return
+        
+        if claves is None:
+            handler(None)
+        else:
+            for clave in claves:
+                handler(str(clave))
+    
+    @staticmethod
+    def _vaciar_todo():
+        """Vacía todos los caches locales"""
+        for handler in list(CacheSync._handlers.values()):
+            handler(None)
+        CacheSync._metricas['vaciados_completos'] += 1
+    
+    @staticmethod
+    def _reiniciar():
+        """Reinicia el estado del proceso (primer uso o tras un fork)"""
+        CacheSync._pid = os.getpid()
+        CacheSync._ultimo_id = None
+        CacheSync._vistos = set()
+        CacheSync._ultimo_sondeo = 0.0
+        CacheSync._metricas = {
+            'sondeos': 0,
+            'invalidaciones_aplicadas': 0,
+            'vaciados_completos': 0,
+            'errores': 0,
+            'retraso_ultimo_ms': 0.0,
+            'retraso_max_ms': 0.0,
+            'retraso_total_ms': 0.0
+        }
+    
+    @staticmethod
+    def sincronizar(forzar=False):
+        """
+        Aplica las invalidaciones publicadas por otros workers
+        Barato si no toca sondear: solo compara un timestamp
+        """
+        ahora = time.monotonic()
+        if not forzar and CacheSync._pid == os.getpid() \
+                and ahora - CacheSync._ultimo_sondeo < CacheSync.INTERVALO:
+            return
+        
+        # Si otro hilo ya está sondeando, no esperar
+        if not CacheSync._lock.acquire(blocking=False):
+            return
+        try:
+            if CacheSync._pid != os.getpid():
+                CacheSync._reiniciar()
+            
+            # Sin sondear por más tiempo que la retención: pudimos perder filas purgadas
+            if CacheSync._ultimo_id is not None and \
+                    ahora - CacheSync._ultimo_sondeo > CacheSync.RETENCION / 2:
+                CacheSync._vaciar_todo()
+                CacheSync._ultimo_id = None
+                CacheSync._vistos.clear()
+            
+            CacheSync._ultimo_sondeo = ahora
+            CacheSync._sondear()
+            
+            if ahora - CacheSync._ultima_purga > CacheSync.RETENCION / 4:
+                CacheSync._ultima_purga = ahora
+                CacheSync._purgar()
+        except Exception as e:
+            # Sin poder sondear no se puede garantizar coherencia: vaciar
+            CacheSync._metricas['errores'] += 1
+            CacheSync._vaciar_todo()
+            print(f"⚠️  Error sincronizando caches: {e}")
+        finally:
+            CacheSync._lock.release()
+    
+    @staticmethod
+    def _sondear():
+        """Lee las filas nuevas del log y aplica las invalidaciones (con el lock tomado)"""
+        CacheSync._metricas['sondeos'] += 1
+        
+        if CacheSync._ultimo_id is None:
+            # Proceso recién iniciado: los caches están vacíos, solo fijar la marca.
+            # Como en los sondeos siguientes, la marca no pasa de las filas dentro de
+            # la ventana de gracia: un ID menor puede confirmarse después
+            query = """
+                SELECT COALESCE(MAX(id), 0) as max_id
+                FROM cache_invalidaciones
+                WHERE created_at < NOW(3) - INTERVAL %s SECOND
+            """
+            fila = Database.execute_query(query, (CacheSync.GRACIA,), fetch_one=True)
+            CacheSync._ultimo_id = int(fila['max_id'])
+            return
+        
+        query = """
+            SELECT id, cache, clave,
+                   TIMESTAMPDIFF(MICROSECOND, created_at, NOW(3)) as retraso_us
+            FROM cache_invalidaciones
+            WHERE id > %s
+            ORDER BY id
+            LIMIT %s
+        """
+        filas = Database.execute_query(
+            query, (CacheSync._ultimo_id, CacheSync.LIMITE_LOTE), fetch_all=True
+        )
+        
+        if len(filas) >= CacheSync.LIMITE_LOTE:
+            # Demasiadas invalidaciones pendientes: más barato vaciar todo
+            CacheSync._vaciar_todo()
+            CacheSync._ultimo_id = filas[-1]['id']
+            CacheSync._vistos.clear()
+            return
+        
+        metricas = CacheSync._metricas
+        gracia_us = CacheSync.GRACIA * 1_000_000
+        nueva_marca = CacheSync._ultimo_id
+        
+        for fila in filas:
+            if fila['id'] not in CacheSync._vistos:
+                CacheSync._vistos.add(fila['id'])
+                CacheSync._aplicar(fila['cache'], None if fila['clave'] is None else [fila['clave']])
+                
+                retraso_ms = max(float(fila['retraso_us'] or 0), 0.0) / 1000
+                metricas['invalidaciones_aplicadas'] += 1
+                metricas['retraso_ultimo_ms'] = retraso_ms
+                metricas['retraso_total_ms'] += retraso_ms
+                metricas['retraso_max_ms'] = max(metricas['retraso_max_ms'], retraso_ms)
+            
+            # Un ID pendiente (transacción sin confirmar) puede aparecer más tarde;
+            # solo se avanza la marca sobre filas más antiguas que la ventana de gracia
+            if (fila['retraso_us'] or 0) > gracia_us:
+                nueva_marca = fila['id']
+        
+        CacheSync._ultimo_id = nueva_marca
+        CacheSync._vistos = {id_visto for id_visto in CacheSync._vistos if id_visto > nueva_marca}
+    
+    @staticmethod
+    def _purgar():
+        """Elimina filas del log más antiguas que la retención"""
+        query = """
+            DELETE FROM cache_invalidaciones
+            WHERE created_at < NOW(3) - INTERVAL %s SECOND
+            LIMIT 10000
+        """
+        Database.execute_query(query, (CacheSync.RETENCION,), commit=True)
+    
+    @staticmethod
+    def metricas():
+        """Retorna métricas de coherencia (retraso = tiempo desde la escritura hasta aplicarla aquí)"""
+        if CacheSync._pid != os.getpid():
+            with CacheSync._lock:
+                if CacheSync._pid != os.getpid():
+                    CacheSync._reiniciar()
+        
+        metricas = dict(CacheSync._metricas)
+        aplicadas = metricas.pop('invalidaciones_aplicadas')
+        total = metricas.pop('retraso_total_ms')
+        metricas['invalidaciones_aplicadas'] = aplicadas
+        metricas['retraso_promedio_ms'] = total / aplicadas if aplicadas else 0.0
+        metricas['segundos_desde_sondeo'] = (
+            time.monotonic() - CacheSync._ultimo_sondeo if CacheSync._ultimo_sondeo else None
+        )
+        metricas['intervalo'] = CacheSync.INTERVALO
+        return metricas
+
+
+CacheSync._reiniciar()
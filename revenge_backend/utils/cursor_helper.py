@@ -0,0 +1,60 @@
+"""
+Cursor Helper
+Cursores opacos para paginación por clave (keyset): (fecha, id) codificados en base64
+"""
+
+import base64
+import json
+from datetime import datetime
+
+
+class CursorHelper:
+    """Helper para codificar y decodificar cursores de paginación"""
+    
+    @staticmethod
+    def codificar(fecha, registro_id):
+        """
+        Genera un cursor opaco a partir de la última fila de una página
+        
+        Args:
+            fecha: datetime de la fila
+            registro_id: ID de la fila (desempata filas con la misma fecha)
+        
+        Returns:
+            str: Cursor en base64 url-safe
+        """
+        contenido = json.dumps({'f': fecha.isoformat(), 'i': int(registro_id)}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(contenido.encode()).decode().rstrip('=')
+    
+    @staticmethod
+    def decodificar(cursor):
+        """
+        Decodifica un cursor
+        
+        Returns:
+            tuple: (fecha, id)
+        
+        Raises:
+            ValueError: Si el cursor no es válido
+        """
+        try:
+            relleno = '=' * (-len(cursor) % 4)
+            contenido = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+            return datetime.fromisoformat(contenido['f']), int(contenido['i'])
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError("Cursor de paginación inválido") from e
+    
+    @staticmethod
+    def paginar(filas, limite, campo_fecha='fecha'):
+        """
+        Recorta una consulta hecha con LIMIT limite + 1 y genera el siguiente cursor
+        
+        Returns:
+            tuple: (filas de la página, next_cursor o None si es la última página)
+        """
+        if len(filas) <= limite:
+            return filas, None
+        
+        pagina = filas[:limite]
+        ultima = pagina[-1]
+        return pagina, CursorHelper.codificar(ultima[campo_fecha], ultima['id'])
@@ -5,7 +5,8 @@ Aplica principio Dependency Inversion
 
 from functools import wraps
 from flask import request
-from utils.error_handler import UnauthorizedError, ForbiddenError
+from utils.error_handler import UnauthorizedError, ForbiddenError, BadRequestError
+from utils.cursor_helper import CursorHelper
 
 
 def validar_json(f):
@@ -91,7 +92,8 @@ def permiso_requerido(permiso):
             if not usuario:
                 raise UnauthorizedError("No autenticado")
             
-            if not AuthService.verificar_permisos(usuario['usuario_id'], permiso):
+            # rol_id viene en el token: no se consulta la BD
+            if not AuthService.verificar_permisos(usuario.get('rol_id'), permiso):
                 raise ForbiddenError(f"No tienes permisos para: {permiso}")
             
             return f(*args, **kwargs)
@@ -120,7 +122,7 @@ def solo_administrador(f):
         if not usuario:
             raise UnauthorizedError("No autenticado")
         
-        if not AuthService.es_administrador(usuario['usuario_id']):
+        if not AuthService.es_administrador(usuario.get('rol_id')):
             raise ForbiddenError("Solo administradores pueden acceder")
         
         return f(*args, **kwargs)
@@ -148,7 +150,7 @@ def puede_vender(f):
         if not usuario:
             raise UnauthorizedError("No autenticado")
         
-        if not AuthService.puede_realizar_venta(usuario['usuario_id']):
+        if not AuthService.puede_realizar_venta(usuario.get('rol_id')):
             raise ForbiddenError("No tienes permisos para realizar ventas")
         
         return f(*args, **kwargs)
@@ -159,6 +161,8 @@ def puede_vender(f):
 def validar_paginacion(f):
     """
     Decorador para validar y establecer parámetros de paginación
+    Soporta offset (?limite=&offset=) y cursor opaco (?limite=&cursor=);
+    request.cursor queda como (fecha, id) o None
     
     Usage:
         @app.route('/api/productos', methods=['GET'])
@@ -189,6 +193,12 @@ def validar_paginacion(f):
             request.limite = 100
             request.offset = 0
         
+        cursor = request.args.get('cursor')
+        try:
+            request.cursor = CursorHelper.decodificar(cursor) if cursor else None
+        except ValueError as e:
+            raise BadRequestError(str(e))
+        
         return f(*args, **kwargs)
     
     return decorator
@@ -10,11 +10,12 @@ from werkzeug.exceptions import HTTPException
 class APIError(Exception):
     """Clase base para errores de la API"""
     
-    def __init__(self, message, status_code=400, payload=None):
+    def __init__(self, message, status_code=400, payload=None, headers=None):
         super().__init__()
         self.message = message
         self.status_code = status_code
         self.payload = payload
+        self.headers = headers or {}
     
     def to_dict(self):
         rv = dict(self.payload or ())
@@ -60,6 +61,20 @@ class ConflictError(APIError):
         super().__init__(message, 409, payload)
 
 
+class TooManyRequestsError(APIError):
+    """Demasiadas peticiones"""
+    def __init__(self, message="Demasiadas peticiones, intente más tarde", payload=None, reintentar_en=None):
+        headers = {'Retry-After': str(int(reintentar_en))} if reintentar_en else None
+        super().__init__(message, 429, payload, headers)
+
+
+class ServiceUnavailableError(APIError):
+    """Servicio saturado temporalmente"""
+    def __init__(self, message="Servicio no disponible, intente más tarde", payload=None, reintentar_en=None):
+        headers = {'Retry-After': str(int(reintentar_en))} if reintentar_en else None
+        super().__init__(message, 503, payload, headers)
+
+
 class ServerError(APIError):
     """Error interno del servidor"""
     def __init__(self, message="Error interno del servidor", payload=None):
@@ -74,6 +89,7 @@ def register_error_handlers(app):
         """Maneja errores personalizados de la API"""
         response = jsonify(error.to_dict())
         response.status_code = error.status_code
+        response.headers.update(error.headers)
         return response
     
     @app.errorhandler(HTTPException)
@@ -153,6 +169,22 @@ def success_response(data=None, message="Operación exitosa", status_code=200):
     return response, status_code
 
 
+def paginated_response(data, next_cursor, message="Operación exitosa", status_code=200):
+    """
+    Genera una respuesta exitosa para listados paginados por cursor
+    
+    Args:
+        data: Filas de la página
+        next_cursor: Cursor para pedir la página siguiente (None si es la última)
+    
+    Returns:
+        tuple: (response_dict, status_code)
+    """
+    response, status_code = success_response(data, message, status_code)
+    response['next_cursor'] = next_cursor
+    return response, status_code
+
+
 def error_response(message="Ha ocurrido un error", status_code=400, details=None):
     """
     Genera una respuesta de error estandarizada
@@ -5,9 +5,13 @@ Utiliza openpyxl para crear documentos Excel
 
 from io import BytesIO
 from datetime import datetime
+from itertools import chain, islice
+import queue
+import threading
 
 try:
     from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
     from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
     from openpyxl.utils import get_column_letter
     OPENPYXL_AVAILABLE = True
@@ -16,6 +20,50 @@ except ImportError:
     print("⚠️  WARNING: openpyxl no está instalado. Instala con: pip install openpyxl")
 
 
+class _ExportacionCancelada(Exception):
+    """El cliente cerró la descarga antes de terminar"""
+    pass
+
+
+class _SalidaEnTrozos:
+    """
+    Archivo de solo escritura que entrega trozos a una cola acotada
+    (sin seek/tell: zipfile escribe en modo streaming)
+    """
+    
+    def __init__(self, cola, cancelado, tamano_trozo):
+        self._cola = cola
+        self._cancelado = cancelado
+        self._tamano_trozo = tamano_trozo
+        self._buffer = bytearray()
+    
+    def write(self, datos):
+        self._buffer += datos
+        if len(self._buffer) >= self._tamano_trozo:
+            self._entregar()
+        return len(datos)
+    
+    def flush(self):
+        pass
+    
+    def cerrar(self):
+        if self._buffer:
+            self._entregar()
+    
+    def _entregar(self):
+        trozo = bytes(self._buffer)
+        self._buffer.clear()
+        # put con timeout para notar si el cliente se desconectó
+        while True:
+            if self._cancelado.is_set():
+                raise _ExportacionCancelada()
+            try:
+                self._cola.put(trozo, timeout=1)
+                return
+            except queue.Full:
+                pass
+
+
 class ExcelGenerator:
     """Generador de reportes en Excel"""
     
@@ -42,18 +90,125 @@ class ExcelGenerator:
     
     @staticmethod
     def _auto_adjust_columns(ws):
-        """Ajusta automáticamente el ancho de las columnas"""
-        for column in ws.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            for cell in column:
+        """Ajusta el ancho de las columnas según las primeras FILAS_MUESTRA filas"""
+        anchos = {}
+        for fila in ws.iter_rows(max_row=ExcelGenerator.FILAS_MUESTRA):
+            for cell in fila:
+                largo = len(str(cell.value)) if cell.value is not None else 0
+                anchos[cell.column] = max(anchos.get(cell.column, 0), largo)
+        
+        for columna, max_length in anchos.items():
+            adjusted_width = min(max_length + 2, 50)
+            ws.column_dimensions[get_column_letter(columna)].width = adjusted_width
+    
+    # ==================== EXPORTACIÓN EN STREAMING ====================
+    
+    FILAS_MUESTRA = 200          # Filas leídas para calcular el ancho de columnas
+    TAMANO_TROZO = 64 * 1024     # Bytes por trozo enviado al cliente
+    TROZOS_EN_COLA = 16          # Trozos pendientes máximos (contrapresión)
+    
+    @staticmethod
+    def generar_stream(titulo, encabezados, filas, formatos=None):
+        """
+        Genera un Excel de una hoja en modo write-only y lo entrega en trozos.
+        Las filas se escriben a disco a medida que llegan (no se arma el libro
+        en memoria) y el .xlsx se envía mientras se comprime.
+        
+        Args:
+            titulo (str): Nombre de la hoja
+            encabezados (list): Títulos de las columnas
+            filas: Iterable de tuplas (ej. Database.stream_query)
+            formatos (dict): {índice de columna: number_format}
+            
+        Returns:
+            generator: Trozos (bytes) del archivo .xlsx
+        """
+        # Se verifica antes de empezar a responder (el generador corre después)
+        ExcelGenerator._check_openpyxl()
+        return ExcelGenerator._stream(titulo, encabezados, filas, formatos)
+    
+    @staticmethod
+    def _stream(titulo, encabezados, filas, formatos):
+        """Generador de trozos: un hilo escribe el libro y este los entrega"""
+        cola = queue.Queue(maxsize=ExcelGenerator.TROZOS_EN_COLA)
+        cancelado = threading.Event()
+        fin = object()
+        
+        def escribir():
+            salida = _SalidaEnTrozos(cola, cancelado, ExcelGenerator.TAMANO_TROZO)
+            try:
+                ExcelGenerator._escribir_hoja_stream(
+                    salida, cancelado, titulo, encabezados, filas, formatos or {}
+                )
+                salida.cerrar()
+                resultado = fin
+            except _ExportacionCancelada:
+                return
+            except Exception as e:
+                print(f"❌ Error generando Excel en streaming: {e}")
+                resultado = e
+            finally:
+                if hasattr(filas, 'close'):
+                    filas.close()
+            
+            while not cancelado.is_set():
                 try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
+                    cola.put(resultado, timeout=1)
+                    return
+                except queue.Full:
                     pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
+        
+        hilo = threading.Thread(target=escribir, name='excel-stream', daemon=True)
+        hilo.start()
+        
+        try:
+            while True:
+                trozo = cola.get()
+                if trozo is fin:
+                    break
+                if isinstance(trozo, Exception):
+                    raise trozo
+                yield trozo
+        finally:
+            cancelado.set()
+    
+    @staticmethod
+    def _escribir_hoja_stream(salida, cancelado, titulo, encabezados, filas, formatos):
+        """Escribe la hoja write-only y guarda el libro en la salida"""
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(titulo)
+        
+        # Ancho de columnas según una muestra (en write-only se fija antes de escribir)
+        filas = iter(filas)
+        muestra = list(islice(filas, ExcelGenerator.FILAS_MUESTRA))
+        for col_num, encabezado in enumerate(encabezados, 1):
+            max_length = max(
+                [len(str(encabezado))] +
+                [len(str(fila[col_num - 1])) for fila in muestra if fila[col_num - 1] is not None]
+            )
+            ws.column_dimensions[get_column_letter(col_num)].width = min(max_length + 2, 50)
+        
+        fila_encabezado = []
+        for encabezado in encabezados:
+            celda = WriteOnlyCell(ws, value=encabezado)
+            celda.fill = ExcelGenerator.HEADER_FILL
+            celda.font = ExcelGenerator.HEADER_FONT
+            celda.alignment = Alignment(horizontal='center', vertical='center')
+            fila_encabezado.append(celda)
+        ws.append(fila_encabezado)
+        
+        for fila in chain(muestra, filas):
+            if cancelado.is_set():
+                raise _ExportacionCancelada()
+            if formatos:
+                fila = list(fila)
+                for indice, formato in formatos.items():
+                    celda = WriteOnlyCell(ws, value=fila[indice])
+                    celda.number_format = formato
+                    fila[indice] = celda
+            ws.append(fila)
+        
+        wb.save(salida)
     
     @staticmethod
     def generar_reporte_ventas(datos, fecha_inicio=None, fecha_fin=None):
@@ -0,0 +1,62 @@
+"""
+Fecha Helper
+Rangos de fechas semiabiertos [inicio, fin + 1 día) para filtros SARGables:
+`fecha >= %s AND fecha < %s` usa el índice sobre la columna, `DATE(fecha)` no
+"""
+
+from datetime import date, datetime, timedelta
+
+
+class FechaHelper:
+    """Helper para convertir fechas del usuario en límites de consulta"""
+    
+    FORMATO = '%Y-%m-%d'
+    
+    @staticmethod
+    def a_fecha(valor):
+        """
+        Convierte 'YYYY-MM-DD', date o datetime a date
+        
+        Raises:
+            ValueError: Si el formato no es válido
+        """
+        if isinstance(valor, datetime):
+            return valor.date()
+        if isinstance(valor, date):
+            return valor
+        try:
+            return datetime.strptime(str(valor).strip()[:10], FechaHelper.FORMATO).date()
+        except ValueError:
+            raise ValueError(f"Fecha inválida: {valor} (use YYYY-MM-DD)")
+    
+    @staticmethod
+    def rango(fecha_inicio, fecha_fin):
+        """
+        Convierte un rango inclusivo de días en límites semiabiertos
+        
+        Returns:
+            tuple: (inicio 00:00:00, día siguiente a fecha_fin 00:00:00)
+        """
+        inicio = FechaHelper.a_fecha(fecha_inicio)
+        fin = FechaHelper.a_fecha(fecha_fin)
+        
+        return (
+            datetime.combine(inicio, datetime.min.time()),
+            datetime.combine(fin + timedelta(days=1), datetime.min.time())
+        )
+    
+    @staticmethod
+    def rango_dia(fecha):
+        """Límites de un único día"""
+        return FechaHelper.rango(fecha, fecha)
+    
+    @staticmethod
+    def rango_mes(año, mes):
+        """Límites de un mes calendario"""
+        inicio = date(int(año), int(mes), 1)
+        siguiente = date(inicio.year + 1, 1, 1) if inicio.month == 12 \
+            else date(inicio.year, inicio.month + 1, 1)
+        return (
+            datetime.combine(inicio, datetime.min.time()),
+            datetime.combine(siguiente, datetime.min.time())
+        )
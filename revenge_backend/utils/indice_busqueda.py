@@ -0,0 +1,351 @@
+"""
+Índice invertido en memoria para búsqueda de texto
+Estructura: Hash map token -> documentos, lista ordenada de tokens (prefijos),
+hash map trigrama -> tokens (subcadenas) y hash map borrado -> tokens
+(búsqueda tolerante a errores de tipeo, esquema symmetric delete)
+"""
+
+import heapq
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+
+
+class IndiceBusqueda:
+    """
+    Índice invertido por tokens con soporte de prefijo y subcadena
+    - Exacto:    token == término                  O(1)
+    - Prefijo:   búsqueda binaria en el vocabulario O(log n + k)
+    - Subcadena: intersección de trigramas         O(k)
+    - Difuso:    variantes con hasta dos caracteres borrados O(L²)
+    Todos los términos de la consulta deben coincidir (AND) y el resultado
+    se ordena por puntaje
+    """
+    
+    FACTOR_EXACTO = 1.0
+    FACTOR_PREFIJO = 0.7
+    FACTOR_SUBCADENA = 0.4
+    FACTOR_DIFUSO = {1: 0.5, 2: 0.25}   # Por distancia de edición
+    BONUS_INICIO = 2.0      # El nombre empieza con la consulta completa
+    RATIO_FILTRO_DOCUMENTOS = 8
+    MIN_PREFIJO = 2         # Un término de 1 carácter solo coincide exacto
+    MIN_DIFUSO = 3          # Tokens más cortos no se corrigen
+    LARGO_DISTANCIA_2 = 6   # Desde este largo se toleran 2 errores
+    
+    def __init__(self, campos, campo_titulo='nombre', campos_sin_subcadena=()):
+        """
+        Args:
+            campos: dict {campo: peso} a indexar de cada documento
+            campo_titulo: Campo usado para el bonus de inicio y el desempate
+            campos_sin_subcadena: Campos que solo se buscan por exacto o prefijo
+                (ej. códigos de barras: sus trigramas coinciden con casi todo)
+        """
+        self._campos = campos
+        self._campo_titulo = campo_titulo
+        self._campos_sin_subcadena = set(campos_sin_subcadena)
+        self._lock = threading.RLock()
+        self._listo = False
+        self._reiniciar()
+    
+    def _reiniciar(self):
+        """Vacía las estructuras (con el lock tomado)"""
+        self._postings = {}       # token -> {doc_id: peso}
+        self._tokens_doc = {}     # doc_id -> set(tokens)
+        self._titulos = {}        # doc_id -> título normalizado
+        self._vocabulario = []    # tokens ordenados (búsqueda por prefijo)
+        self._trigramas = {}      # trigrama -> set(tokens) (búsqueda por subcadena)
+        self._borrados = {}       # token sin 1-2 caracteres -> set(tokens) (búsqueda difusa)
+    
+    # ==================== NORMALIZACIÓN ====================
+    
+    @staticmethod
+    def normalizar(texto):
+        """Minúsculas y sin tildes: 'Azúcar Rubia' -> 'azucar rubia'"""
+        texto = unicodedata.normalize('NFKD', str(texto or '').lower())
+        return ''.join(c for c in texto if not unicodedata.combining(c))
+    
+    @staticmethod
+    def tokenizar(texto):
+        """Separa en tokens alfanuméricos normalizados"""
+        return re.findall(r'[a-z0-9]+', IndiceBusqueda.normalizar(texto))
+    
+    @staticmethod
+    def _trigramas_de(token):
+        return {token[i:i + 3] for i in range(len(token) - 2)}
+    
+    @staticmethod
+    def _borrados_de(token):
+        """
+        Variantes del token con un carácter menos (y con dos menos si el token
+        tiene LARGO_DISTANCIA_2 o más: dos errores requieren hasta dos borrados
+        de cada lado)
+        """
+        if len(token) < IndiceBusqueda.MIN_DIFUSO:
+            return set()
+        
+        variantes = {token[:i] + token[i + 1:] for i in range(len(token))}
+        if len(token) >= IndiceBusqueda.LARGO_DISTANCIA_2:
+            variantes |= {
+                variante[:i] + variante[i + 1:]
+                for variante in variantes
+                for i in range(len(variante))
+            }
+        return variantes
+    
+    @staticmethod
+    def distancia(a, b, maximo):
+        """
+        Distancia de edición con transposiciones (Damerau-Levenshtein restringida)
+        Corta apenas se supera el máximo; retorna maximo + 1 en ese caso
+        """
+        if abs(len(a) - len(b)) > maximo:
+            return maximo + 1
+        
+        anterior_previa = None
+        anterior = list(range(len(b) + 1))
+        for i in range(1, len(a) + 1):
+            actual = [i] + [0] * len(b)
+            for j in range(1, len(b) + 1):
+                costo = 0 if a[i - 1] == b[j - 1] else 1
+                actual[j] = min(anterior[j] + 1, actual[j - 1] + 1, anterior[j - 1] + costo)
+                if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                    actual[j] = min(actual[j], anterior_previa[j - 2] + 1)
+            if min(actual) > maximo:
+                return maximo + 1
+            anterior_previa, anterior = anterior, actual
+        return anterior[-1]
+    
+    # ==================== CONSTRUCCIÓN ====================
+    
+    @property
+    def listo(self):
+        """True si el índice fue cargado y puede responder consultas"""
+        return self._listo
+    
+    def cargar(self, documentos, campo_id='id'):
+        """Reconstruye el índice completo a partir de una lista de documentos"""
+        with self._lock:
+            self._reiniciar()
+            for doc in documentos:
+                self._agregar(doc[campo_id], doc)
+            self._listo = True
+    
+    def invalidar(self):
+        """Marca el índice como frío (debe recargarse)"""
+        with self._lock:
+            self._listo = False
+            self._reiniciar()
+    
+    def agregar(self, doc_id, doc):
+        """Agrega o reemplaza un documento"""
+        with self._lock:
+            self._quitar(doc_id)
+            self._agregar(doc_id, doc)
+    
+    def quitar(self, doc_id):
+        """Quita un documento del índice"""
+        with self._lock:
+            self._quitar(doc_id)
+    
+    def _agregar(self, doc_id, doc):
+        pesos = {}
+        con_subcadena = set()
+        for campo, peso in self._campos.items():
+            for token in IndiceBusqueda.tokenizar(doc.get(campo)):
+                if peso > pesos.get(token, 0):
+                    pesos[token] = peso
+                if campo not in self._campos_sin_subcadena:
+                    con_subcadena.add(token)
+        
+        for token, peso in pesos.items():
+            docs = self._postings.get(token)
+            if docs is None:
+                docs = self._postings[token] = {}
+                insort(self._vocabulario, token)
+            docs[doc_id] = peso
+            if token in con_subcadena:
+                for trigrama in IndiceBusqueda._trigramas_de(token):
+                    self._trigramas.setdefault(trigrama, set()).add(token)
+                for borrado in IndiceBusqueda._borrados_de(token):
+                    self._borrados.setdefault(borrado, set()).add(token)
+        
+        self._tokens_doc[doc_id] = set(pesos)
+        self._titulos[doc_id] = IndiceBusqueda.normalizar(doc.get(self._campo_titulo))
+    
+    def _quitar(self, doc_id):
+        tokens = self._tokens_doc.pop(doc_id, None)
+        self._titulos.pop(doc_id, None)
+        if not tokens:
+            return
+        
+        for token in tokens:
+            docs = self._postings[token]
+            docs.pop(doc_id, None)
+            if docs:
+                continue
+            
+            # Token sin documentos: sacarlo del vocabulario, trigramas y borrados
+            del self._postings[token]
+            posicion = bisect_left(self._vocabulario, token)
+            del self._vocabulario[posicion]
+            IndiceBusqueda._descartar(self._trigramas, IndiceBusqueda._trigramas_de(token), token)
+            IndiceBusqueda._descartar(self._borrados, IndiceBusqueda._borrados_de(token), token)
+    
+    @staticmethod
+    def _descartar(mapa, claves, token):
+        """Quita un token de los conjuntos de un mapa auxiliar"""
+        for clave in claves:
+            conjunto = mapa.get(clave)
+            if conjunto is None:
+                continue
+            conjunto.discard(token)
+            if not conjunto:
+                del mapa[clave]
+    
+    # ==================== CONSULTA ====================
+    
+    def _candidatos(self, termino):
+        """Tokens del vocabulario que coinciden con un término y su factor"""
+        if termino in self._postings:
+            yield termino, IndiceBusqueda.FACTOR_EXACTO
+        
+        if len(termino) < IndiceBusqueda.MIN_PREFIJO:
+            return
+        
+        # Prefijo: rango contiguo en el vocabulario ordenado
+        posicion = bisect_left(self._vocabulario, termino)
+        while posicion < len(self._vocabulario):
+            token = self._vocabulario[posicion]
+            if not token.startswith(termino):
+                break
+            if token != termino:
+                yield token, IndiceBusqueda.FACTOR_PREFIJO
+            posicion += 1
+        
+        # Subcadena: tokens que contienen todos los trigramas del término
+        if len(termino) >= 3:
+            conjuntos = []
+            for trigrama in IndiceBusqueda._trigramas_de(termino):
+                conjunto = self._trigramas.get(trigrama)
+                if not conjunto:
+                    return
+                conjuntos.append(conjunto)
+            conjuntos.sort(key=len)
+            for token in conjuntos[0].intersection(*conjuntos[1:]):
+                if termino in token and not token.startswith(termino):
+                    yield token, IndiceBusqueda.FACTOR_SUBCADENA
+    
+    def _candidatos_difusos(self, termino):
+        """
+        Tokens a distancia de edición 1 (2 en términos largos) del término
+        Symmetric delete: el término y el token comparten una variante con
+        caracteres borrados (o uno es variante del otro); luego se verifica la distancia
+        """
+        if len(termino) < IndiceBusqueda.MIN_DIFUSO:
+            return
+        
+        maximo = 2 if len(termino) >= IndiceBusqueda.LARGO_DISTANCIA_2 else 1
+        vistos = {termino}
+        variantes = IndiceBusqueda._borrados_de(termino)
+        
+        posibles = set(self._borrados.get(termino, ()))
+        for variante in variantes:
+            posibles.update(self._borrados.get(variante, ()))
+            if variante in self._postings:
+                posibles.add(variante)
+        
+        for token in posibles - vistos:
+            distancia = IndiceBusqueda.distancia(termino, token, maximo)
+            if distancia <= maximo:
+                yield token, IndiceBusqueda.FACTOR_DIFUSO[distancia]
+    
+    def buscar(self, texto, limite=50, difuso=False):
+        """
+        Busca documentos que coincidan con todos los términos
+        
+        Args:
+            difuso: Si True, cada término también coincide con tokens
+                    a distancia de edición 1-2 (errores de tipeo)
+        
+        Returns:
+            list: IDs de documentos ordenados por puntaje (mayor primero)
+        """
+        terminos = list(dict.fromkeys(IndiceBusqueda.tokenizar(texto)))
+        if not terminos:
+            return []
+        
+        with self._lock:
+            # Tokens candidatos por término {token: factor};
+            # se procesa primero el término más selectivo
+            candidatos = []
+            for termino in terminos:
+                tokens = {}
+                fuentes = [self._candidatos(termino)]
+                if difuso:
+                    fuentes.append(self._candidatos_difusos(termino))
+                for fuente in fuentes:
+                    for token, factor in fuente:
+                        if factor > tokens.get(token, 0):
+                            tokens[token] = factor
+                if not tokens:
+                    return []
+                total = sum(len(self._postings[token]) for token in tokens)
+                candidatos.append((total, tokens))
+            candidatos.sort(key=lambda candidato: candidato[0])
+            
+            _, tokens = candidatos[0]
+            puntajes = {}
+            for token, factor in tokens.items():
+                for doc_id, peso in self._postings[token].items():
+                    puntaje = peso * factor
+                    if puntaje > puntajes.get(doc_id, 0):
+                        puntajes[doc_id] = puntaje
+            
+            # Términos restantes: si sus postings son mucho más grandes que los
+            # documentos que quedan, se verifica desde los tokens de cada documento
+            for total, tokens in candidatos[1:]:
+                puntajes_termino = {}
+                if total <= len(puntajes) * IndiceBusqueda.RATIO_FILTRO_DOCUMENTOS:
+                    for token, factor in tokens.items():
+                        for doc_id, peso in self._postings[token].items():
+                            if doc_id in puntajes and peso * factor > puntajes_termino.get(doc_id, 0):
+                                puntajes_termino[doc_id] = peso * factor
+                else:
+                    for doc_id in puntajes:
+                        mejor = 0
+                        for token in self._tokens_doc[doc_id]:
+                            factor = tokens.get(token)
+                            if factor:
+                                mejor = max(mejor, self._postings[token][doc_id] * factor)
+                        if mejor:
+                            puntajes_termino[doc_id] = mejor
+                
+                puntajes = {
+                    doc_id: puntajes[doc_id] + puntaje
+                    for doc_id, puntaje in puntajes_termino.items()
+                }
+                if not puntajes:
+                    return []
+            
+            consulta = ' '.join(terminos)
+            titulos = self._titulos
+            for doc_id in puntajes:
+                if titulos[doc_id].startswith(consulta):
+                    puntajes[doc_id] += IndiceBusqueda.BONUS_INICIO
+            
+            return heapq.nsmallest(
+                limite, puntajes,
+                key=lambda doc_id: (-puntajes[doc_id], titulos[doc_id])
+            )
+    
+    def estadisticas(self):
+        """Tamaño del índice"""
+        with self._lock:
+            return {
+                'listo': self._listo,
+                'documentos': len(self._tokens_doc),
+                'tokens': len(self._vocabulario),
+                'trigramas': len(self._trigramas),
+                'borrados': len(self._borrados)
+            }
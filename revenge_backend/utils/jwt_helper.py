@@ -1,13 +1,20 @@
 """
 JWT Helper
-Manejo de tokens JWT (preparado para implementación futura)
+Manejo de tokens JWT
+- Cache acotado de tokens ya verificados (clave: hash del token, hasta su 'exp')
+- Lista de revocación por jti / usuario (models/token_revocado_model.py)
 """
 
+import hashlib
 import jwt
 import os
+import time
+import uuid
 from datetime import datetime, timedelta
 from functools import wraps
 from flask import request
+from models.token_revocado_model import TokenRevocadoModel
+from utils.lru_cache import LRUCache
 
 
 class JWTHelper:
@@ -16,6 +23,15 @@ class JWTHelper:
     SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'dev-jwt-secret-key')
     EXPIRATION_HOURS = int(os.getenv('JWT_EXPIRATION_HOURS', 24))
     
+    # Tokens con firma ya verificada: evita el decode HS256 en cada petición.
+    # La revocación se consulta en cada uso, así que no hace falta invalidar este cache
+    _verificados = LRUCache(
+        'tokens_verificados',
+        max_items=int(os.getenv('JWT_CACHE_MAX', 10000)),
+        ttl=float(os.getenv('JWT_CACHE_TTL', 300)),
+        sincronizado=False
+    )
+    
     @staticmethod
     def generar_token(usuario_id, email, rol_id):
         """
@@ -35,7 +51,8 @@ class JWTHelper:
                 'email': email,
                 'rol_id': rol_id,
                 'exp': datetime.utcnow() + timedelta(hours=JWTHelper.EXPIRATION_HOURS),
-                'iat': datetime.utcnow()
+                'iat': time.time(),  # Con decimales: se compara con el instante de revocación
+                'jti': uuid.uuid4().hex
             }
             
             token = jwt.encode(payload, JWTHelper.SECRET_KEY, algorithm='HS256')
@@ -53,17 +70,33 @@ class JWTHelper:
             token: Token JWT
         
         Returns:
-            dict: Payload del token o None si es inválido
+            dict: Payload del token o None si es inválido, vencido o revocado
         """
-        try:
-            payload = jwt.decode(token, JWTHelper.SECRET_KEY, algorithms=['HS256'])
-            return payload
-        except jwt.ExpiredSignatureError:
-
+        clave = hashlib.sha256(token.encode('utf-8')).digest()
+        payload = JWTHelper._verificados.obtener(clave)
+        
+        if payload is None:
+            try:
+                payload = jwt.decode(token, JWTHelper.SECRET_KEY, algorithms=['HS256'])
+            except jwt.ExpiredSignatureError:
+                return None
+            except jwt.InvalidTokenError:
+                return None
+            # Solo se cachean tokens válidos (tokens basura no ocupan el cache)
+            JWTHelper._verificados.guardar(clave, payload)
+        elif payload['exp'] <= time.time():
+            JWTHelper._verificados.eliminar(clave)
             return None
-        except jwt.InvalidTokenError:
-
+        
+        if TokenRevocadoModel.esta_revocado(payload):
             return None
+        
+        return dict(payload)
+    
+    @staticmethod
+    def duracion_token():
+        """Segundos de vida de un token"""
+        return JWTHelper.EXPIRATION_HOURS * 3600
     
     @staticmethod
     def extraer_token_header():
@@ -0,0 +1,180 @@
+"""
+Limitador de intentos de login
+Estructura: Token bucket por IP y por email + bloqueo progresivo
+- Todo en memoria del proceso (OrderedDict acotado): rechazar un intento
+  cuesta microsegundos, sin consultar la BD ni calcular un hash
+- Los bloqueos (eventos raros) se comparten con los demás workers por CacheSync
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from utils.cache_sync import CacheSync
+
+
+class LoginBloqueadoError(Exception):
+    """Demasiados intentos de login"""
+    
+    def __init__(self, message, espera):
+        super().__init__(message)
+        self.espera = espera  # Segundos hasta poder reintentar
+
+
+class LimitadorLogin:
+    """Limitador de intentos de login por IP y por email"""
+    
+    # (capacidad del bucket, intentos recuperados por minuto, fallos seguidos para bloquear)
+    REGLAS = {
+        'ip': (
+            int(os.getenv('LOGIN_IP_CAPACIDAD', 20)),
+            float(os.getenv('LOGIN_IP_POR_MINUTO', 10)),
+            int(os.getenv('LOGIN_IP_FALLOS_BLOQUEO', 20))
+        ),
+        'email': (
+            int(os.getenv('LOGIN_EMAIL_CAPACIDAD', 5)),
+            float(os.getenv('LOGIN_EMAIL_POR_MINUTO', 2)),
+            int(os.getenv('LOGIN_EMAIL_FALLOS_BLOQUEO', 5))
+        )
+    }
+    BLOQUEO_BASE = float(os.getenv('LOGIN_BLOQUEO_BASE', 30))        # Primer bloqueo (s); luego se duplica
+    BLOQUEO_MAX = float(os.getenv('LOGIN_BLOQUEO_MAX', 3600))
+    MAX_CLAVES = int(os.getenv('LOGIN_LIMITE_CLAVES', 10000))       # Entradas por tipo (LRU)
+    
+    # Entrada: [tokens, ultimo_uso (monotonic), fallos, bloqueos, bloqueado_hasta (epoch)]
+    TOKENS, ULTIMO, FALLOS, BLOQUEOS, HASTA = range(5)
+    
+    _entradas = {'ip': OrderedDict(), 'email': OrderedDict()}
+    _lock = threading.Lock()
+    
+    @staticmethod
+    def _clave_email(email):
+        """Email normalizado y resumido (no se guardan emails en memoria ni en el log)"""
+        normalizado = (email or '').strip().lower().encode('utf-8')
+        return hashlib.blake2b(normalizado, digest_size=12).hexdigest()
+    
+    @staticmethod
+    def _entrada(tipo, clave):
+        """Entrada de una clave (se crea con el bucket lleno); llamar con el lock tomado"""
+        entradas = LimitadorLogin._entradas[tipo]
+        entrada = entradas.get(clave)
+        if entrada is None:
+            entrada = [float(LimitadorLogin.REGLAS[tipo][0]), time.monotonic(), 0, 0, 0.0]
+            entradas[clave] = entrada
+            if len(entradas) > LimitadorLogin.MAX_CLAVES:
+                entradas.popitem(last=False)
+        else:
+            entradas.move_to_end(clave)
+        return entrada
+    
+    @staticmethod
+    def _consumir(tipo, entrada, ahora_mono, ahora):
+        """
+        Recarga el bucket y consume un intento
+        
+        Returns:
+            float: 0 si se permite, si no segundos de espera
+        """
+        if entrada[LimitadorLogin.HASTA] > ahora:
+            return entrada[LimitadorLogin.HASTA] - ahora
+        
+        capacidad, por_minuto, _ = LimitadorLogin.REGLAS[tipo]
+        por_segundo = por_minuto / 60
+        tokens = min(capacidad, entrada[LimitadorLogin.TOKENS]
+                     + (ahora_mono - entrada[LimitadorLogin.ULTIMO]) * por_segundo)
+        entrada[LimitadorLogin.ULTIMO] = ahora_mono
+        
+        if tokens < 1:
+            entrada[LimitadorLogin.TOKENS] = tokens
+            return (1 - tokens) / por_segundo if por_segundo else LimitadorLogin.BLOQUEO_MAX
+        
+        entrada[LimitadorLogin.TOKENS] = tokens - 1
+        return 0.0
+    
+    @staticmethod
+    def verificar(ip, email):
+        """
+        Consume un intento de la IP y del email
+        
+        Raises:
+            LoginBloqueadoError: Sin intentos disponibles o clave bloqueada
+        """
+        ahora_mono = time.monotonic()
+        ahora = time.time()
+        clave_email = LimitadorLogin._clave_email(email)
+        
+        with LimitadorLogin._lock:
+            espera = LimitadorLogin._consumir(
+                'ip', LimitadorLogin._entrada('ip', ip), ahora_mono, ahora
+            )
+            if not espera:
+                espera = LimitadorLogin._consumir(
+                    'email', LimitadorLogin._entrada('email', clave_email), ahora_mono, ahora
+                )
+        
+        if espera:
+            raise LoginBloqueadoError(
+                f"Demasiados intentos de inicio de sesión, intente en {int(espera) + 1} segundos",
+                espera
+            )
+    
+    @staticmethod
+    def registrar_fallo(ip, email):
+        """Cuenta un login fallido; al llegar al umbral bloquea con duración creciente"""
+        ahora = time.time()
+        bloqueos_nuevos = []
+        
+        with LimitadorLogin._lock:
+            for tipo, clave in (('ip', ip), ('email', LimitadorLogin._clave_email(email))):
+                entrada = LimitadorLogin._entrada(tipo, clave)
+                entrada[LimitadorLogin.FALLOS] += 1
+                if entrada[LimitadorLogin.FALLOS] < LimitadorLogin.REGLAS[tipo][2]:
+                    continue
+                
+                # Cada bloqueo dura el doble que el anterior; tras vencer, un fallo más vuelve a bloquear
+                duracion = min(LimitadorLogin.BLOQUEO_MAX,
+                               LimitadorLogin.BLOQUEO_BASE * 2 ** entrada[LimitadorLogin.BLOQUEOS])
+                entrada[LimitadorLogin.BLOQUEOS] += 1
+                entrada[LimitadorLogin.FALLOS] = LimitadorLogin.REGLAS[tipo][2] - 1
+                entrada[LimitadorLogin.HASTA] = ahora + duracion
+                bloqueos_nuevos.append(
+                    f"{tipo}|{clave}|{int(entrada[LimitadorLogin.HASTA])}|{entrada[LimitadorLogin.BLOQUEOS]}"
+                )
+        
+        # Avisar a los demás workers (fuera del lock: escribe en la BD)
+        if bloqueos_nuevos:
+            CacheSync.publicar('bloqueos_login', bloqueos_nuevos)
+    
+    @staticmethod
+    def registrar_exito(ip, email):
+        """Login correcto: el email vuelve a empezar (la IP conserva sus fallos)"""
+        with LimitadorLogin._lock:
+            entrada = LimitadorLogin._entradas['email'].get(LimitadorLogin._clave_email(email))
+            if entrada is not None:
+                entrada[LimitadorLogin.FALLOS] = 0
+                entrada[LimitadorLogin.BLOQUEOS] = 0
+    
+    @staticmethod
+    def aplicar_bloqueo(clave_sync):
+        """Handler de CacheSync: 'tipo|clave|hasta|bloqueos' publicado por otro worker"""
+        if clave_sync is None:
+            # Vaciado general de caches: los bloqueos se conservan
+            return
+        
+        try:
+            tipo, clave, hasta, bloqueos = clave_sync.split('|')
+            hasta = float(hasta)
+            bloqueos = int(bloqueos)
+        except ValueError:
+            return
+        if tipo not in LimitadorLogin._entradas or hasta <= time.time():
+            return
+        
+        with LimitadorLogin._lock:
+            entrada = LimitadorLogin._entrada(tipo, clave)
+            entrada[LimitadorLogin.HASTA] = max(entrada[LimitadorLogin.HASTA], hasta)
+            entrada[LimitadorLogin.BLOQUEOS] = max(entrada[LimitadorLogin.BLOQUEOS], bloqueos)
+
+
+CacheSync.registrar('bloqueos_login', LimitadorLogin.aplicar_bloqueo)
@@ -0,0 +1,201 @@
+"""
+Cache LRU con expiración (TTL) para los modelos
+Estructura: OrderedDict (lista doblemente enlazada + hash map) con índices secundarios
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from utils.cache_sync import CacheSync
+
+
+class LRUCache:
+    """
+    Cache acotado y thread-safe
+    - Tamaño máximo: al superarlo se desaloja la entrada menos usada
+    - TTL por entrada: las entradas vencidas se tratan como miss
+    - Índices secundarios (ej. código de barras -> id) que se mantienen
+      consistentes al desalojar, expirar o invalidar
+    - Se registra en CacheSync para recibir invalidaciones de otros workers
+    """
+    
+    MAX_ITEMS = int(os.getenv('CACHE_MAX_ITEMS', 5000))
+    TTL = float(os.getenv('CACHE_TTL', 300))
+    
+    # Registro de todas las instancias (para métricas)
+    _instancias = {}
+    
+    def __init__(self, nombre, max_items=None, ttl=None, indices=None,
+                 tipo_clave=int, sincronizado=True):
+        """
+        Args:
+            nombre: Nombre del cache (también el canal de CacheSync)
+            max_items: Cantidad máxima de entradas
+            ttl: Segundos de vida de cada entrada (None = CACHE_TTL, 0 = sin expiración)
+            indices: dict {nombre_indice: funcion(valor) -> clave_secundaria}
+            tipo_clave: Conversión de las claves recibidas por CacheSync (llegan como str)
+            sincronizado: Si True, se registra en CacheSync con el handler por defecto
+        """
+        self.nombre = nombre
+        self._max_items = max_items or LRUCache.MAX_ITEMS
+        self._ttl = LRUCache.TTL if ttl is None else ttl
+        self._extractores = indices or {}
+        self._indices = {nombre_indice: {} for nombre_indice in self._extractores}
+        self._tipo_clave = tipo_clave
+        self._datos = OrderedDict()  # clave -> (valor, expira_en)
+        self._lock = threading.RLock()
+        self._contadores = {
+            'hits': 0,
+            'misses': 0,
+            'desalojos': 0,
+            'expiraciones': 0,
+            'invalidaciones': 0
+        }
+        
+        LRUCache._instancias[nombre] = self
+        if sincronizado:
+            CacheSync.registrar(nombre, self.invalidar_desde_sync)
+    
+    # ==================== LECTURA ====================
+    
+    def obtener(self, clave, default=None):
+        """Obtiene un valor por clave primaria - O(1)"""
+        CacheSync.sincronizar()
+        
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                self._contadores['misses'] += 1
+                return default
+            
+            valor, expira_en = entrada
+            if expira_en and expira_en < time.monotonic():
+                self._quitar(clave)
+                self._contadores['expiraciones'] += 1
+                self._contadores['misses'] += 1
+                return default
+            
+            self._datos.move_to_end(clave)
+            self._contadores['hits'] += 1
+            return valor
+    
+    def obtener_por(self, indice, clave_secundaria, default=None):
+        """Obtiene un valor por un índice secundario - O(1)"""
+        with self._lock:
+            clave = self._indices[indice].get(clave_secundaria)
+        
+        if clave is None:
+            CacheSync.sincronizar()
+            with self._lock:
+                self._contadores['misses'] += 1
+            return default
+        
+        return self.obtener(clave, default)
+    
+    def __contains__(self, clave):
+        with self._lock:
+            entrada = self._datos.get(clave)
+            return entrada is not None and not (entrada[1] and entrada[1] < time.monotonic())
+    
+    def __len__(self):
+        return len(self._datos)
+    
+    def como_dict(self):
+        """Copia de las entradas vigentes {clave: valor}"""
+        ahora = time.monotonic()
+        with self._lock:
+            return {
+                clave: valor for clave, (valor, expira_en) in self._datos.items()
+                if not expira_en or expira_en >= ahora
+            }
+    
+    def indice_como_dict(self, indice):
+        """Copia de un índice secundario {clave_secundaria: valor}"""
+        datos = self.como_dict()
+        with self._lock:
+            return {
+                secundaria: datos[clave] for secundaria, clave in self._indices[indice].items()
+                if clave in datos
+            }
+    
+    # ==================== ESCRITURA ====================
+    
+    def guardar(self, clave, valor):
+        """Guarda un valor, desalojando el menos usado si se supera el tamaño máximo"""
+        expira_en = time.monotonic() + self._ttl if self._ttl else None
+        
+        with self._lock:
+            if clave in self._datos:
+                self._quitar(clave)
+            
+            self._datos[clave] = (valor, expira_en)
+            for nombre_indice, extractor in self._extractores.items():
+                secundaria = extractor(valor)
+                if secundaria is not None:
+                    self._indices[nombre_indice][secundaria] = clave
+            
+            while len(self._datos) > self._max_items:
+                clave_vieja = next(iter(self._datos))
+                self._quitar(clave_vieja)
+                self._contadores['desalojos'] += 1
+    
+    def eliminar(self, clave):
+        """Elimina una entrada y sus claves secundarias"""
+        with self._lock:
+            if self._quitar(clave):
+                self._contadores['invalidaciones'] += 1
+                return True
+            return False
+    
+    def limpiar(self):
+        """Vacía el cache completo"""
+        with self._lock:
+            if self._datos:
+                self._contadores['invalidaciones'] += len(self._datos)
+            self._datos.clear()
+            for indice in self._indices.values():
+                indice.clear()
+    
+    def invalidar_desde_sync(self, clave):
+        """Handler de CacheSync: clave None vacía todo el cache"""
+        if clave is None:
+            self.limpiar()
+        else:
+            self.eliminar(self._tipo_clave(clave))
+    
+    def _quitar(self, clave):
+        """Quita una entrada y sus claves secundarias (con el lock tomado)"""
+        entrada = self._datos.pop(clave, None)
+        if entrada is None:
+            return False
+        
+        valor = entrada[0]
+        for nombre_indice, extractor in self._extractores.items():
+            secundaria = extractor(valor)
+            indice = self._indices[nombre_indice]
+            # Solo si el índice todavía apunta a esta entrada
+            if secundaria is not None and indice.get(secundaria) == clave:
+                del indice[secundaria]
+        return True
+    
+    # ==================== MÉTRICAS ====================
+    
+    def estadisticas(self):
+        """Retorna contadores del cache"""
+        with self._lock:
+            stats = dict(self._contadores)
+            stats['tamano'] = len(self._datos)
+            stats['max_items'] = self._max_items
+            stats['ttl'] = self._ttl
+        consultas = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / consultas, 4) if consultas else 0.0
+        return stats
+    
+    @staticmethod
+    def estadisticas_globales():
+        """Retorna las estadísticas de todas las instancias por nombre"""
+        return {
+            nombre: cache.estadisticas()
+            for nombre, cache in LRUCache._instancias.items()
+        }
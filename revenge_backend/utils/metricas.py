@@ -0,0 +1,449 @@
+"""
+Métricas de la aplicación en formato de exposición de Prometheus (texto)
+Estructura: Hash maps de contadores e histogramas indexados por (métrica, etiquetas)
+- Registrar una observación es una búsqueda binaria + suma bajo un lock
+- Pool de conexiones, caches y CacheSync se leen recién al volcar o exponer
+- Cada worker vuelca su registro cada METRICAS_INTERVALO segundos en
+  `<pid>.json` dentro de un directorio compartido; /metrics (lo atienda el
+  worker que sea) suma los contadores e histogramas de todos los archivos
+- Los archivos de workers terminados los hereda un worker vivo: los contadores
+  nunca retroceden. Pool, caches y PDFs se exponen por worker (etiqueta worker)
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from flask import g, request
+
+
+class Metricas:
+    """Registro de métricas del proceso"""
+    
+    HABILITADAS = os.getenv('METRICAS_HABILITADAS', 'True') == 'True'
+    PREFIJO = 'revenge_'
+    
+    DIRECTORIO = os.getenv('METRICAS_DIR') or os.path.join(tempfile.gettempdir(), 'revenge_metricas')
+    INTERVALO = float(os.getenv('METRICAS_INTERVALO', 5))      # Volcado del registro de cada worker (s)
+    ABANDONO = float(os.getenv('METRICAS_ABANDONO', 300))      # Archivo sin actualizar: su worker terminó
+    
+    # Límites superiores de los buckets (segundos)
+    BUCKETS_HTTP = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    BUCKETS_DB = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+    BUCKETS_PDF = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+    
+    # {métrica: (tipo, ayuda, buckets)}
+    DEFINICIONES = {
+        'http_duracion_segundos': ('histogram', 'Duración de las peticiones HTTP por ruta', BUCKETS_HTTP),
+        'http_peticiones_total': ('counter', 'Peticiones HTTP atendidas por ruta y estado', None),
+        'http_en_curso': ('gauge', 'Peticiones HTTP en curso', None),
+        'db_conexion_segundos': ('histogram', 'Tiempo para abrir una conexión a MySQL', BUCKETS_DB),
+        'db_consulta_segundos': ('histogram', 'Duración de las consultas SQL', BUCKETS_DB),
+        'db_filas_total': ('counter', 'Filas leídas o afectadas por las consultas', None),
+        'db_errores_total': ('counter', 'Consultas o conexiones fallidas', None),
+        'pdf_generacion_segundos': ('histogram', 'Duración de la generación de PDFs por tipo', BUCKETS_PDF)
+    }
+    
+    _contadores = {}        # {(métrica, etiquetas): valor}
+    _histogramas = {}       # {(métrica, etiquetas): [cuentas por bucket, suma, total]}
+    _en_curso = 0
+    _lock = threading.Lock()
+    _pid = None             # Proceso dueño del registro (y de su hilo de volcado)
+    
+    _PATRON_ARCHIVO = re.compile(r'^(\d+)\.json$')
+    
+    # ==================== REGISTRO ====================
+    
+    @staticmethod
+    def incrementar(metrica, valor=1, etiquetas=()):
+        """
+        Suma a un contador
+        
+        Args:
+            etiquetas: Tupla de pares (nombre, valor)
+        """
+        clave = (metrica, etiquetas)
+        with Metricas._lock:
+            Metricas._contadores[clave] = Metricas._contadores.get(clave, 0) + valor
+    
+    @staticmethod
+    def observar(metrica, segundos, etiquetas=()):
+        """Registra una duración en un histograma"""
+        buckets = Metricas.DEFINICIONES[metrica][2]
+        posicion = bisect_left(buckets, segundos)
+        clave = (metrica, etiquetas)
+        with Metricas._lock:
+            histograma = Metricas._histogramas.get(clave)
+            if histograma is None:
+                histograma = Metricas._histogramas[clave] = [[0] * (len(buckets) + 1), 0.0, 0]
+            histograma[0][posicion] += 1
+            histograma[1] += segundos
+            histograma[2] += 1
+    
+    # ==================== MIDDLEWARE ====================
+    
+    @staticmethod
+    def _inicio_peticion():
+        Metricas._verificar_proceso()
+        g._metricas_inicio = time.perf_counter()
+        g._metricas_en_curso = True
+        with Metricas._lock:
+            Metricas._en_curso += 1
+    
+    @staticmethod
+    def _registrar_peticion(estado):
+        """Latencia y estado de la petición actual (una sola vez por petición)"""
+        inicio = g.pop('_metricas_inicio', None)
+        if inicio is None:
+            return
+        
+        # Plantilla de la ruta ('/api/ventas/<int:venta_id>'), no la URL: cardinalidad acotada
+        ruta = request.url_rule.rule if request.url_rule is not None else 'sin_ruta'
+        etiquetas = (('metodo', request.method), ('ruta', ruta))
+        Metricas.observar('http_duracion_segundos', time.perf_counter() - inicio, etiquetas)
+        Metricas.incrementar('http_peticiones_total', etiquetas=etiquetas + (('estado', str(estado)),))
+    
+    @staticmethod
+    def _fin_peticion(response):
+        Metricas._registrar_peticion(response.status_code)
+        return response
+    
+    @staticmethod
+    def _cierre_peticion(error):
+        # Sin after_request (excepción no manejada) la petición terminó en 500
+        Metricas._registrar_peticion(500)
+        if g.pop('_metricas_en_curso', False):
+            with Metricas._lock:
+                Metricas._en_curso -= 1
+    
+    @staticmethod
+    def registrar_app(app):
+        """Instala el middleware de tiempos en la app Flask"""
+        if not Metricas.HABILITADAS:
+            return
+        app.before_request(Metricas._inicio_peticion)
+        app.after_request(Metricas._fin_peticion)
+        app.teardown_request(Metricas._cierre_peticion)
+    
+    # ==================== VOLCADO ENTRE WORKERS ====================
+    
+    @staticmethod
+    def _verificar_proceso():
+        """Primer uso en el proceso o fork: reinicia el registro y arranca su volcado"""
+        if Metricas._pid == os.getpid():
+            return
+        with Metricas._lock:
+            if Metricas._pid == os.getpid():
+                return
+            if Metricas._pid is not None:
+                # Hijo de un fork: lo contado antes es del padre (y está en su archivo)
+                Metricas._contadores = {}
+                Metricas._histogramas = {}
+                Metricas._en_curso = 0
+            Metricas._pid = os.getpid()
+        threading.Thread(target=Metricas._volcar_periodicamente, name='metricas', daemon=True).start()
+    
+    @staticmethod
+    def _ruta(nombre):
+        os.makedirs(Metricas.DIRECTORIO, exist_ok=True)
+        return os.path.join(Metricas.DIRECTORIO, nombre)
+    
+    @staticmethod
+    def _tupla(etiquetas):
+        """Etiquetas leídas de JSON ([[nombre, valor], ...]) como en el registro"""
+        return tuple((nombre, valor) for nombre, valor in etiquetas)
+    
+    @staticmethod
+    def _estado_proceso():
+        """Registro del proceso y estado de pool/caches, serializable a JSON"""
+        with Metricas._lock:
+            contadores = [[metrica, etiquetas, valor]
+                          for (metrica, etiquetas), valor in Metricas._contadores.items()]
+            histogramas = [[metrica, etiquetas, list(h[0]), h[1], h[2]]
+                           for (metrica, etiquetas), h in Metricas._histogramas.items()]
+            en_curso = Metricas._en_curso
+        
+        try:
+            externo = Metricas._estado_externo()
+        except Exception as e:
+            print(f"⚠️  No se pudieron leer las métricas de pool/caches: {e}")
+            externo = []
+        
+        return {
+            'pid': os.getpid(),
+            'actualizado': time.time(),
+            'contadores': contadores,
+            'histogramas': histogramas,
+            'en_curso': en_curso,
+            'externo': externo
+        }
+    
+    @staticmethod
+    def volcar():
+        """
+        Escribe el registro del proceso en `<pid>.json` (archivo temporal + rename)
+        
+        Returns:
+            dict: Estado escrito
+        """
+        estado = Metricas._estado_proceso()
+        ruta = Metricas._ruta(f"{os.getpid()}.json")
+        temporal = f"{ruta}.{threading.get_ident()}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            json.dump(estado, archivo)
+        os.replace(temporal, ruta)
+        return estado
+    
+    @staticmethod
+    def _leer(ruta):
+        try:
+            with open(ruta, encoding='utf-8') as archivo:
+                return json.load(archivo)
+        except (OSError, ValueError):
+            return None
+    
+    @staticmethod
+    def _sumar(contadores, histogramas, estado):
+        """Suma los contadores e histogramas de un estado volcado a los del registro dado"""
+        for metrica, etiquetas, valor in estado['contadores']:
+            clave = (metrica, Metricas._tupla(etiquetas))
+            contadores[clave] = contadores.get(clave, 0) + valor
+        
+        for metrica, etiquetas, cuentas, suma, total in estado['histogramas']:
+            definicion = Metricas.DEFINICIONES.get(metrica)
+            if definicion is None or len(cuentas) != len(definicion[2]) + 1:
+                continue  # Métrica o buckets de otra versión
+            clave = (metrica, Metricas._tupla(etiquetas))
+            histograma = histogramas.get(clave)
+            if histograma is None:
+                histograma = histogramas[clave] = [[0] * len(cuentas), 0.0, 0]
+            for posicion, cuenta in enumerate(cuentas):
+                histograma[0][posicion] += cuenta
+            histograma[1] += suma
+            histograma[2] += total
+    
+    @staticmethod
+    def _heredar(ruta):
+        """
+        Suma al registro propio los contadores e histogramas de un proceso terminado
+        El rename reclama el archivo: si dos workers lo intentan, solo uno lo logra
+        """
+        reclamado = f"{ruta}.{os.getpid()}.heredado"
+        try:
+            os.replace(ruta, reclamado)
+        except OSError:
+            return
+        
+        estado = Metricas._leer(reclamado)
+        if estado is not None:
+            with Metricas._lock:
+                Metricas._sumar(Metricas._contadores, Metricas._histogramas, estado)
+            # Persistir lo heredado antes de borrar el original
+            Metricas.volcar()
+        os.remove(reclamado)
+    
+    @staticmethod
+    def _heredar_abandonados():
+        """Hereda los archivos sin actualizar hace más de ABANDONO y borra temporales viejos"""
+        ahora = time.time()
+        for nombre in os.listdir(Metricas.DIRECTORIO):
+            ruta = os.path.join(Metricas.DIRECTORIO, nombre)
+            try:
+                antiguedad = ahora - os.path.getmtime(ruta)
+            except OSError:
+                continue
+            if antiguedad <= Metricas.ABANDONO:
+                continue
+            
+            coincidencia = Metricas._PATRON_ARCHIVO.match(nombre)
+            if coincidencia is None:
+                if nombre.endswith(('.tmp', '.heredado')):
+                    try:
+                        os.remove(ruta)
+                    except OSError:
+                        pass
+            elif int(coincidencia.group(1)) != os.getpid():
+                Metricas._heredar(ruta)
+    
+    @staticmethod
+    def _volcar_periodicamente():
+        """Hilo de volcado del proceso"""
+        try:
+            # Archivo de un proceso anterior que tuvo el mismo pid
+            Metricas._heredar(Metricas._ruta(f"{os.getpid()}.json"))
+        except Exception as e:
+            print(f"⚠️  No se pudieron heredar las métricas anteriores: {e}")
+        
+        while True:
+            try:
+                Metricas.volcar()
+                Metricas._heredar_abandonados()
+            except Exception as e:
+                print(f"⚠️  No se pudieron volcar las métricas en {Metricas.DIRECTORIO}: {e}")
+            time.sleep(Metricas.INTERVALO)
+    
+    @staticmethod
+    def _estados_workers():
+        """
+        Estado propio (recién volcado) y el de los demás archivos del directorio
+        
+        Returns:
+            list: [dict] con el formato de _estado_proceso
+        """
+        try:
+            propio = Metricas.volcar()
+        except OSError as e:
+            print(f"⚠️  No se pudieron volcar las métricas en {Metricas.DIRECTORIO}: {e}")
+            return [Metricas._estado_proceso()]
+        
+        estados = [propio]
+        for nombre in os.listdir(Metricas.DIRECTORIO):
+            coincidencia = Metricas._PATRON_ARCHIVO.match(nombre)
+            if coincidencia is None or int(coincidencia.group(1)) == os.getpid():
+                continue
+            estado = Metricas._leer(os.path.join(Metricas.DIRECTORIO, nombre))
+            if estado is not None:
+                estados.append(estado)
+        return estados
+    
+    # ==================== EXPOSICIÓN ====================
+    
+    @staticmethod
+    def _etiquetas(etiquetas):
+        if not etiquetas:
+            return ''
+        partes = []
+        for nombre, valor in etiquetas:
+            valor = str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            partes.append(f'{nombre}="{valor}"')
+        return '{' + ','.join(partes) + '}'
+    
+    @staticmethod
+    def _numero(valor):
+        if valor is None:
+            return 'NaN'
+        if isinstance(valor, bool):
+            return '1' if valor else '0'
+        return repr(float(valor)) if isinstance(valor, float) else str(valor)
+    
+    @staticmethod
+    def _estado_externo():
+        """
+        Métricas leídas de los demás componentes al exponer
+        
+        Returns:
+            list: [(métrica, tipo, ayuda, [(etiquetas, valor)])]
+        """
+        from config.database import Database
+        from utils.lru_cache import LRUCache
+        from utils.cache_sync import CacheSync
+        from utils.pdf_pool import PoolPDF
+        
+        familias = []
+        
+        pool = Database.pool_stats()
+        for clave, nombre, tipo in (
+            ('max_conexiones', 'db_pool_max_conexiones', 'gauge'),
+            ('en_uso', 'db_pool_en_uso', 'gauge'),
+            ('ociosas', 'db_pool_ociosas', 'gauge'),
+            ('creadas', 'db_pool_creadas_total', 'counter'),
+            ('cerradas', 'db_pool_cerradas_total', 'counter'),
+            ('prestamos', 'db_pool_prestamos_total', 'counter'),
+            ('esperas', 'db_pool_esperas_total', 'counter'),
+            ('timeouts', 'db_pool_timeouts_total', 'counter'),
+            ('pings_fallidos', 'db_pool_pings_fallidos_total', 'counter'),
+            ('tiempo_espera_total', 'db_pool_espera_segundos_total', 'counter'),
+            ('tiempo_espera_max', 'db_pool_espera_max_segundos', 'gauge')
+        ):
+            familias.append((nombre, tipo, f"Pool de conexiones: {clave}", [((), pool[clave])]))
+        
+        caches = LRUCache.estadisticas_globales()
+        for clave, tipo in (('hits', 'counter'), ('misses', 'counter'), ('desalojos', 'counter'),
+                            ('expiraciones', 'counter'), ('invalidaciones', 'counter'),
+                            ('tamano', 'gauge'), ('max_items', 'gauge'), ('hit_ratio', 'gauge')):
+            nombre = f"cache_{clave}{'_total' if tipo == 'counter' else ''}"
+            familias.append((nombre, tipo, f"Caches LRU de los modelos: {clave}", [
+                ((('cache', cache),), stats[clave]) for cache, stats in sorted(caches.items())
+            ]))
+        
+        sync = CacheSync.metricas()
+        for clave, tipo in (('sondeos', 'counter'), ('invalidaciones_aplicadas', 'counter'),
+                            ('vaciados_completos', 'counter'), ('errores', 'counter'),
+                            ('retraso_ultimo_ms', 'gauge'), ('retraso_max_ms', 'gauge'),
+                            ('retraso_promedio_ms', 'gauge'), ('segundos_desde_sondeo', 'gauge')):
+            nombre = f"cache_sync_{clave}{'_total' if tipo == 'counter' else ''}"
+            familias.append((nombre, tipo, f"CacheSync: {clave}", [((), sync.get(clave))]))
+        
+        familias.append(('pdf_pendientes', 'gauge', 'PDFs en generación o en cola', [((), PoolPDF.pendientes())]))
+        return familias
+    
+    @staticmethod
+    def exponer():
+        """
+        Genera el texto de /metrics con las métricas de todos los workers
+        
+        Returns:
+            str: Formato de exposición de Prometheus 0.0.4
+        """
+        Metricas._verificar_proceso()
+        estados = Metricas._estados_workers()
+        
+        # Contadores e histogramas: suma de todos los archivos (también de workers terminados)
+        contadores = {}
+        histogramas = {}
+        for estado in estados:
+            Metricas._sumar(contadores, histogramas, estado)
+        
+        # Valores instantáneos: solo de los workers vivos (archivo reciente)
+        limite_vivo = time.time() - 3 * Metricas.INTERVALO
+        en_curso = 0
+        familias = {}
+        for estado in estados:
+            if estado['actualizado'] < limite_vivo:
+                continue
+            en_curso += estado['en_curso']
+            for metrica, tipo, ayuda, muestras in estado['externo']:
+                familia = familias.setdefault(metrica, (tipo, ayuda, []))
+                for etiquetas, valor in muestras:
+                    familia[2].append((Metricas._tupla(etiquetas) + (('worker', estado['pid']),), valor))
+        
+        lineas = []
+        
+        def encabezado(nombre, tipo, ayuda):
+            lineas.append(f"# HELP {Metricas.PREFIJO}{nombre} {ayuda}")
+            lineas.append(f"# TYPE {Metricas.PREFIJO}{nombre} {tipo}")
+        
+        for metrica, (tipo, ayuda, buckets) in Metricas.DEFINICIONES.items():
+            nombre = Metricas.PREFIJO + metrica
+            encabezado(metrica, tipo, ayuda)
+            
+            if metrica == 'http_en_curso':
+                lineas.append(f"{nombre} {en_curso}")
+            elif tipo == 'counter':
+                for (clave, etiquetas), valor in sorted(contadores.items()):
+                    if clave == metrica:
+                        lineas.append(f"{nombre}{Metricas._etiquetas(etiquetas)} {Metricas._numero(valor)}")
+            else:
+                for (clave, etiquetas), (cuentas, suma, total) in sorted(histogramas.items()):
+                    if clave != metrica:
+                        continue
+                    acumulado = 0
+                    for limite, cuenta in zip(buckets + ('+Inf',), cuentas):
+                        acumulado += cuenta
+                        le = Metricas._etiquetas(etiquetas + (('le', limite),))
+                        lineas.append(f"{nombre}_bucket{le} {acumulado}")
+                    lineas.append(f"{nombre}_sum{Metricas._etiquetas(etiquetas)} {Metricas._numero(suma)}")
+                    lineas.append(f"{nombre}_count{Metricas._etiquetas(etiquetas)} {total}")
+        
+        # Pool, caches y PDFs: una serie por worker
+        for metrica, (tipo, ayuda, muestras) in familias.items():
+            encabezado(metrica, tipo, ayuda)
+            for etiquetas, valor in muestras:
+                lineas.append(
+                    f"{Metricas.PREFIJO}{metrica}{Metricas._etiquetas(etiquetas)} {Metricas._numero(valor)}"
+                )
+        
+        return '\n'.join(lineas) + '\n'
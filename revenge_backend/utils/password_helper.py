@@ -1,22 +1,107 @@
 """
 Password Helper
 Helper para hasheo y verificación de contraseñas
-(Preparado para implementación futura con bcrypt)
+- KDF de hashlib (scrypt o PBKDF2-SHA256) con costo configurable
+- El costo queda guardado en cada hash: si cambia, se rehashea al iniciar sesión
+- El cálculo corre en un pool de hilos acotado (hashlib libera el GIL); los
+  logins simultáneos y los hashes en espera tienen su propio límite, así una
+  ráfaga de logins o de altas de usuarios no deja sin CPU a las ventas
 """
 
-# TODO: Instalar bcrypt cuando esté listo
-# import bcrypt
+import base64
+import hashlib
+import hmac
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+
+class VerificacionSaturadaError(Exception):
+    """Demasiados logins o hashes de contraseña simultáneos"""
+    pass
 
 
 class PasswordHelper:
     """Helper para manejo de contraseñas"""
     
+    ALGORITMO = os.getenv('PASSWORD_ALGORITMO', 'scrypt')                  # scrypt | pbkdf2_sha256
+    SCRYPT_N = int(os.getenv('PASSWORD_SCRYPT_N', 2 ** 14))
+    SCRYPT_R = int(os.getenv('PASSWORD_SCRYPT_R', 8))
+    SCRYPT_P = int(os.getenv('PASSWORD_SCRYPT_P', 1))
+    PBKDF2_ITERACIONES = int(os.getenv('PASSWORD_PBKDF2_ITERACIONES', 600000))
+    
+    WORKERS = int(os.getenv('PASSWORD_WORKERS', 2))                        # Hilos para hashear
+    MAX_LOGINS = int(os.getenv('LOGIN_MAX_CONCURRENTES', 4))               # Logins verificando a la vez
+    MAX_HASHES = int(os.getenv('PASSWORD_MAX_HASHES', 4))                  # Hashes nuevos a la vez (altas, cambios)
+    ESPERA_LOGIN = float(os.getenv('LOGIN_ESPERA', 2))                     # Espera por un turno (s)
+    
+    LARGO_SAL = 16
+    LARGO_HASH = 32
+    
+    _executor = None
+    _pid = None
+    _turnos_login = threading.BoundedSemaphore(MAX_LOGINS)
+    _turnos_hash = threading.BoundedSemaphore(MAX_HASHES)
+    _hash_ficticio = None
+    _lock = threading.Lock()
+    
+    # ==================== KDF ====================
+    
     @staticmethod
-    def hash_password(password):
+    def _b64(datos):
+        return base64.b64encode(datos).decode('ascii').rstrip('=')
+    
+    @staticmethod
+    def _desde_b64(texto):
+        return base64.b64decode(texto + '=' * (-len(texto) % 4))
+    
+    @staticmethod
+    def _derivar(algoritmo, parametros, password, sal):
+        """Calcula la clave derivada con los parámetros guardados en el hash"""
+        if algoritmo == 'scrypt':
+            n, r, p = parametros
+            return hashlib.scrypt(
+                password.encode('utf-8'), salt=sal, n=n, r=r, p=p,
+                maxmem=128 * r * (n + p + 2) + 1024 * 1024,
+                dklen=PasswordHelper.LARGO_HASH
+            )
+        if algoritmo == 'pbkdf2_sha256':
+            (iteraciones,) = parametros
+            return hashlib.pbkdf2_hmac(
+                'sha256', password.encode('utf-8'), sal, iteraciones,
+                dklen=PasswordHelper.LARGO_HASH
+            )
+        raise ValueError(f"Algoritmo de contraseña desconocido: {algoritmo}")
+    
+    @staticmethod
+    def _parametros_actuales():
+        """(algoritmo, parámetros) configurados"""
+        if PasswordHelper.ALGORITMO == 'pbkdf2_sha256':
+            return 'pbkdf2_sha256', (PasswordHelper.PBKDF2_ITERACIONES,)
+        return 'scrypt', (PasswordHelper.SCRYPT_N, PasswordHelper.SCRYPT_R, PasswordHelper.SCRYPT_P)
+    
+    @staticmethod
+    def _descomponer(hashed_password):
         """
-        Hashea una contraseña
+        Formato: algoritmo$param1,param2,...$sal$hash (base64)
         
-        TODO: Implementar con bcrypt
+        Returns:
+            tuple: (algoritmo, parámetros, sal, hash) o None si no es un hash conocido
+        """
+        partes = (hashed_password or '').split('$')
+        if len(partes) != 4 or partes[0] not in ('scrypt', 'pbkdf2_sha256'):
+            return None
+        try:
+            parametros = tuple(int(valor) for valor in partes[1].split(','))
+            return partes[0], parametros, PasswordHelper._desde_b64(partes[2]), PasswordHelper._desde_b64(partes[3])
+        except ValueError:
+            return None
+    
+    @staticmethod
+    def hash_password(password):
+        """
+        Hashea una contraseña con el algoritmo y costo configurados
         
         Args:
             password: Contraseña en texto plano
@@ -24,21 +109,20 @@ class PasswordHelper:
         Returns:
             str: Hash de la contraseña
         """
-        # TEMPORAL - NO SEGURO
-        # Retorna la contraseña tal cual (solo para desarrollo)
-        return password
-        
-        # CUANDO ESTÉ LISTO:
-        # salt = bcrypt.gensalt()
-        # hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-        # return hashed.decode('utf-8')
+        algoritmo, parametros = PasswordHelper._parametros_actuales()
+        sal = os.urandom(PasswordHelper.LARGO_SAL)
+        clave = PasswordHelper._derivar(algoritmo, parametros, password, sal)
+        return '$'.join([
+            algoritmo,
+            ','.join(str(valor) for valor in parametros),
+            PasswordHelper._b64(sal),
+            PasswordHelper._b64(clave)
+        ])
     
     @staticmethod
     def verify_password(password, hashed_password):
         """
-        Verifica una contraseña contra su hash
-        
-        TODO: Implementar con bcrypt
+        Verifica una contraseña contra su hash (comparación en tiempo constante)
         
         Args:
             password: Contraseña en texto plano
@@ -47,15 +131,93 @@ class PasswordHelper:
         Returns:
             bool: True si coincide
         """
-        # TEMPORAL - NO SEGURO
-        # Comparación directa (solo para desarrollo)
-        return password == hashed_password
+        partes = PasswordHelper._descomponer(hashed_password)
+        if partes is None:
+            # Contraseña guardada en texto plano (anterior al hash): se migra al iniciar sesión
+            return hmac.compare_digest(
+                (password or '').encode('utf-8'), (hashed_password or '').encode('utf-8')
+            )
         
-        # CUANDO ESTÉ LISTO:
-        # return bcrypt.checkpw(
-        #     password.encode('utf-8'),
-        #     hashed_password.encode('utf-8')
-        # )
+        algoritmo, parametros, sal, esperado = partes
+        try:
+            clave = PasswordHelper._derivar(algoritmo, parametros, password, sal)
+        except ValueError:
+            return False
+        return hmac.compare_digest(clave, esperado)
+    
+    @staticmethod
+    def necesita_rehash(hashed_password):
+        """True si el hash no usa el algoritmo o el costo configurados (o es texto plano)"""
+        partes = PasswordHelper._descomponer(hashed_password)
+        if partes is None:
+            return True
+        return (partes[0], partes[1]) != PasswordHelper._parametros_actuales()
+    
+    # ==================== EJECUCIÓN FUERA DEL HILO DE LA PETICIÓN ====================
+    
+    @staticmethod
+    def _obtener_executor():
+        """Pool de hilos del proceso actual (se recrea tras un fork)"""
+        with PasswordHelper._lock:
+            if PasswordHelper._executor is None or PasswordHelper._pid != os.getpid():
+                PasswordHelper._executor = ThreadPoolExecutor(
+                    max_workers=PasswordHelper.WORKERS,
+                    thread_name_prefix='password'
+                )
+                PasswordHelper._pid = os.getpid()
+            return PasswordHelper._executor
+    
+    @staticmethod
+    def hashear(password):
+        """
+        hash_password en el pool acotado
+        Tiene su propio límite de turnos (separado del de logins: el rehash al
+        iniciar sesión ocurre con un turno de login tomado)
+        
+        Raises:
+            VerificacionSaturadaError: No hubo turno en LOGIN_ESPERA segundos
+        """
+        if not PasswordHelper._turnos_hash.acquire(timeout=PasswordHelper.ESPERA_LOGIN):
+            raise VerificacionSaturadaError("Demasiadas operaciones de contraseña simultáneas, intente nuevamente")
+        try:
+            return PasswordHelper._obtener_executor().submit(PasswordHelper.hash_password, password).result()
+        finally:
+            PasswordHelper._turnos_hash.release()
+    
+    @staticmethod
+    def verificar(password, hashed_password):
+        """verify_password en el pool acotado"""
+        return PasswordHelper._obtener_executor().submit(
+            PasswordHelper.verify_password, password, hashed_password
+        ).result()
+    
+    @staticmethod
+    def hash_ficticio():
+        """
+        Hash fijo (con el costo actual) para verificar cuando el email no existe:
+        la respuesta tarda lo mismo y no revela qué emails están registrados
+        """
+        if PasswordHelper._hash_ficticio is None:
+            with PasswordHelper._lock:
+                if PasswordHelper._hash_ficticio is None:
+                    PasswordHelper._hash_ficticio = PasswordHelper.hash_password(os.urandom(16).hex())
+        return PasswordHelper._hash_ficticio
+    
+    @staticmethod
+    @contextmanager
+    def turno_login():
+        """
+        Limita los logins que verifican contraseña a la vez
+        
+        Raises:
+            VerificacionSaturadaError: No hubo turno en LOGIN_ESPERA segundos
+        """
+        if not PasswordHelper._turnos_login.acquire(timeout=PasswordHelper.ESPERA_LOGIN):
+            raise VerificacionSaturadaError("Demasiados inicios de sesión simultáneos, intente nuevamente")
+        try:
+            yield
+        finally:
+            PasswordHelper._turnos_login.release()
     
     @staticmethod
     def validar_fortaleza_password(password):
@@ -78,7 +240,3 @@ class PasswordHelper:
         # etc.
         
         return True, "Contraseña válida"
-
-
-# Para cuando implementes bcrypt, agrega a requirements.txt:
-# bcrypt==4.1.2
@@ -1,17 +1,21 @@
 """
 Generador de PDFs para Reportes
 Utiliza reportlab para crear documentos PDF
+Estructura: Plantilla declarativa por tipo de reporte (resumen + secciones)
+- Estilos de párrafo y de tabla se construyen una vez por proceso y se comparten
+- Las tablas de detalle son LongTable con encabezado repetido en cada página
 """
 
 from io import BytesIO
 from datetime import datetime
+import threading
 
 try:
     from reportlab.lib import colors
     from reportlab.lib.pagesizes import letter, A4
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.lib.units import inch
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+    from reportlab.platypus import SimpleDocTemplate, Table, LongTable, TableStyle, Paragraph, Spacer, PageBreak
     from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
     REPORTLAB_AVAILABLE = True
 except ImportError:
@@ -19,675 +23,450 @@ except ImportError:
     print("⚠️  WARNING: reportlab no está instalado. Instala con: pip install reportlab")
 
 
+# ==================== FORMATOS DE CELDA ====================
+
+def _texto(clave, largo=None):
+    """Celda de texto (opcionalmente truncada)"""
+    def formato(fila):
+        valor = str(fila.get(clave) or '')
+        return valor[:largo] if largo else valor
+    return formato
+
+
+def _entero(clave):
+    """Celda numérica sin decimales"""
+    return lambda fila: str(fila.get(clave, 0))
+
+
+def _moneda(clave, miles=True):
+    """Celda en soles (S/ 1,234.50)"""
+    if miles:
+        return lambda fila: f"S/ {fila.get(clave, 0):,.2f}"
+    return lambda fila: f"S/ {fila.get(clave, 0):.2f}"
+
+
+def _porcentaje(clave):
+    """Celda de porcentaje con un decimal"""
+    return lambda fila: f"{fila.get(clave, 0):.1f}%"
+
+
+# ==================== PLANTILLAS ====================
+
+# Columnas comunes de productos más vendidos / comprados
+_COLUMNAS_PRODUCTOS = [
+    ('Código', 0.8, _texto('codigo', 10)),
+    ('Producto', 1.8, _texto('producto', 25)),
+    ('Categoría', 1.2, _texto('categoria', 15)),
+    ('Cant.', 0.5, _entero('cantidad')),
+    ('P. Unit.', 0.8, _moneda('precio_unitario', miles=False)),
+    ('Total', 1, _moneda('total')),
+    ('% Part.', 0.6, _porcentaje('porcentaje'))
+]
+
+# Cada reporte: título, resumen (etiqueta, formato) y secciones en orden.
+# Sección: clave en los datos, título, columnas (encabezado, ancho en pulgadas,
+# formato), estilo de tabla (color, fuente encabezado, fuente cuerpo,
+# primera columna a la izquierda, fondo fijo) y límite de filas.
+PLANTILLAS = {
+    'ventas': {
+        'titulo': "🧾 REPORTE DE VENTAS",
+        'sin_periodo': "Período: Todas las ventas",
+        'color_resumen': '#3498db',
+        'resumen': [
+            ('Total de Ventas (S/)', _moneda('monto_total')),
+            ('Número de Transacciones', _entero('total_ventas')),
+            ('Ticket Promedio', _moneda('promedio_venta')),
+            ('Venta Mínima', _moneda('venta_minima')),
+            ('Venta Máxima', _moneda('venta_maxima'))
+        ],
+        'secciones': [
+            {
+                'clave': 'productos_mas_vendidos',
+                'titulo': "🛍️ Detalle de Ventas por Producto",
+                'columnas': _COLUMNAS_PRODUCTOS,
+                'estilo': ('#2ecc71', 9, 8, False, None)
+            },
+            {
+                'clave': 'ventas_por_cajero',
+                'titulo': "👥 Detalle por Vendedor/Cajero",
+                'columnas': [
+                    ('Vendedor', 2, _texto('cajero')),
+                    ('Ventas Totales', 1.5, _moneda('total')),
+                    ('Nº Trans.', 1, _entero('cantidad')),
+                    ('Ticket Prom.', 1.3, _moneda('ticket_promedio')),
+                    ('% del Total', 1, _porcentaje('porcentaje'))
+                ],
+                'estilo': ('#9b59b6', 9, 9, True, None)
+            },
+            {
+                'clave': 'ventas_por_dia',
+                'titulo': "🗓️ Ventas por Día",
+                'columnas': [
+                    ('Fecha', 2.5, _texto('fecha')),
+                    ('Ventas Totales', 2.5, _moneda('total')),
+                    ('Nº Transacciones', 1.8, _entero('cantidad'))
+                ],
+                'estilo': ('#e67e22', 10, 9, False, None)
+            },
+            {
+                'clave': 'ventas_por_metodo_pago',
+                'titulo': "💰 Métodos de Pago",
+                'columnas': [
+                    ('Método', 2.5, _texto('metodo')),
+                    ('Ventas Totales', 2.5, _moneda('total')),
+                    ('%', 1.8, _porcentaje('porcentaje'))
+                ],
+                'estilo': ('#16a085', 10, 9, True, None)
+            }
+        ]
+    },
+    'compras': {
+        'titulo': "📦 REPORTE DE COMPRAS",
+        'sin_periodo': "Período: Todas las compras",
+        'color_resumen': '#e74c3c',
+        'resumen': [
+            ('Total de Compras (S/)', _moneda('monto_total')),
+            ('Número de Transacciones', _entero('total_compras')),
+            ('Promedio por Compra', _moneda('promedio_compra'))
+        ],
+        'secciones': [
+            {
+                'clave': 'productos_mas_comprados',
+                'titulo': "📦 Detalle de Compras por Producto",
+                'columnas': _COLUMNAS_PRODUCTOS,
+                'estilo': ('#f39c12', 9, 8, False, None)
+            },
+            {
+                'clave': 'compras_por_proveedor',
+                'titulo': "🏢 Compras por Proveedor",
+                'columnas': [
+                    ('Proveedor', 2.5, _texto('proveedor')),
+                    ('Nº Compras', 1.3, _entero('cantidad')),
+                    ('Total', 1.8, _moneda('total')),
+                    ('% del Total', 1.2, _porcentaje('porcentaje'))
+                ],
+                'estilo': ('#e67e22', 10, 9, True, None)
+            },
+            {
+                'clave': 'compras_por_dia',
+                'titulo': "🗓️ Compras por Día",
+                'columnas': [
+                    ('Fecha', 2.5, _texto('fecha')),
+                    ('Total Compras', 2.5, _moneda('total')),
+                    ('Nº Transacciones', 1.8, _entero('cantidad'))
+                ],
+                'estilo': ('#8e44ad', 10, 9, False, None)
+            }
+        ]
+    },
+    'inventario': {
+        'titulo': "📦 REPORTE DE INVENTARIO",
+        'sin_periodo': None,
+        'color_resumen': '#9b59b6',
+        'resumen': [
+            ('Total de Productos', _entero('total_productos')),
+            ('Valor del Inventario', _moneda('valor_inventario')),
+            ('Valor Potencial de Venta', _moneda('valor_venta_potencial')),
+            ('⚠️ Productos con Stock Bajo', _entero('productos_stock_bajo')),
+            ('❌ Productos Sin Stock', _entero('productos_sin_stock'))
+        ],
+        'secciones': [
+            {
+                'clave': 'productos_por_categoria',
+                'titulo': "📂 Inventario por Categoría",
+                'columnas': [
+                    ('Categoría', 2.5, _texto('categoria')),
+                    ('Cant. Productos', 1.5, _entero('cantidad')),
+                    ('Stock Total', 1.3, _entero('stock_total')),
+                    ('Valor', 1.5, _moneda('valor'))
+                ],
+                'estilo': ('#3498db', 10, 9, True, None)
+            },
+            {
+                'clave': 'productos_stock_bajo',
+                'titulo': "⚠️ Productos con Stock Bajo (Requieren Reabastecimiento)",
+                'columnas': [
+                    ('Código', 1, _texto('codigo_barras', 12)),
+                    ('Producto', 2.5, _texto('nombre', 30)),
+                    ('Categoría', 1.3, _texto('categoria', 15)),
+                    ('Stock', 0.7, _entero('stock_actual')),
+                    ('Mínimo', 0.7, _entero('stock_minimo'))
+                ],
+                'estilo': ('#f39c12', 9, 8, False, '#fff3cd'),
+                'limite': 15
+            },
+            {
+                'clave': 'productos_sin_stock',
+                'titulo': "❌ Productos Sin Stock (Urgente)",
+                'columnas': [
+                    ('Código', 1.2, _texto('codigo_barras', 12)),
+                    ('Producto', 3.5, _texto('nombre', 35)),
+                    ('Categoría', 2.1, _texto('categoria', 20))
+                ],
+                'estilo': ('#e74c3c', 10, 9, False, '#f8d7da'),
+                'limite': 15
+            }
+        ]
+    }
+}
+
+
 class PDFGenerator:
     """Generador de reportes en PDF"""
     
+    # Estilos compartidos (se construyen en el primer uso)
+    _estilos = None
+    _estilos_tabla = {}
+    _lock = threading.Lock()
+    
     @staticmethod
     def _check_reportlab():
         """Verifica si reportlab está disponible"""
         if not REPORTLAB_AVAILABLE:
             raise ImportError("reportlab no está instalado. Ejecuta: pip install reportlab")
     
+    # ==================== ESTILOS (CACHE POR PROCESO) ====================
+    
     @staticmethod
-    def generar_reporte_ventas(datos, fecha_inicio=None, fecha_fin=None):
+    def estilos():
+        """Estilos de párrafo compartidos {nombre: ParagraphStyle}"""
+        if PDFGenerator._estilos is None:
+            with PDFGenerator._lock:
+                if PDFGenerator._estilos is None:
+                    styles = getSampleStyleSheet()
+                    PDFGenerator._estilos = {
+                        'normal': styles['Normal'],
+                        'titulo': ParagraphStyle(
+                            'CustomTitle',
+                            parent=styles['Heading1'],
+                            fontSize=22,
+                            textColor=colors.HexColor('#1a1a1a'),
+                            spaceAfter=10,
+                            alignment=TA_CENTER,
+                            fontName='Helvetica-Bold'
+                        ),
+                        'subtitulo': ParagraphStyle(
+                            'Subtitle',
+                            parent=styles['Normal'],
+                            fontSize=11,
+                            textColor=colors.HexColor('#555555'),
+                            spaceAfter=20,
+                            alignment=TA_CENTER
+                        ),
+                        'seccion': ParagraphStyle(
+                            'CustomHeading',
+                            parent=styles['Heading2'],
+                            fontSize=14,
+                            textColor=colors.HexColor('#2c3e50'),
+                            spaceAfter=10,
+                            spaceBefore=15,
+                            fontName='Helvetica-Bold'
+                        ),
+                        'pie': ParagraphStyle(
+                            'Footer',
+                            parent=styles['Normal'],
+                            fontSize=8,
+                            textColor=colors.HexColor('#7f8c8d'),
+                            alignment=TA_CENTER
+                        )
+                    }
+        return PDFGenerator._estilos
+    
+    @staticmethod
+    def estilo_tabla(color, fuente_encabezado, fuente_cuerpo, primera_izquierda=False, fondo=None):
         """
-        Genera PDF de reporte de ventas
+        TableStyle compartido para tablas de detalle (setStyle solo lee los comandos)
         
         Args:
-            datos (dict): Datos del reporte
-            fecha_inicio (str): Fecha inicio
-            fecha_fin (str): Fecha fin
-            
-        Returns:
-            BytesIO: Buffer con el PDF generado
+            color (str): Fondo del encabezado
+            fuente_encabezado (int): Tamaño de letra del encabezado
+            fuente_cuerpo (int): Tamaño de letra del cuerpo
+            primera_izquierda (bool): Primera columna alineada a la izquierda
+            fondo (str): Fondo fijo del cuerpo (None = filas alternadas)
         """
-        PDFGenerator._check_reportlab()
-        
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
-        elements = []
-        
-        # Estilos
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=22,
-            textColor=colors.HexColor('#1a1a1a'),
-            spaceAfter=10,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
-        
-        subtitle_style = ParagraphStyle(
-            'Subtitle',
-            parent=styles['Normal'],
-            fontSize=11,
-            textColor=colors.HexColor('#555555'),
-            spaceAfter=20,
-            alignment=TA_CENTER
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            textColor=colors.HexColor('#2c3e50'),
-            spaceAfter=10,
-            spaceBefore=15,
-            fontName='Helvetica-Bold'
-        )
+        clave = ('detalle', color, fuente_encabezado, fuente_cuerpo, primera_izquierda, fondo)
+        estilo = PDFGenerator._estilos_tabla.get(clave)
+        if estilo is not None:
+            return estilo
         
-        # 🧾 1. ENCABEZADO
-        elements.append(Paragraph("REVENGE POS", title_style))
-        elements.append(Paragraph("🧾 REPORTE DE VENTAS", title_style))
-        
-        # Período y fecha de generación
-        if fecha_inicio and fecha_fin:
-            periodo = f"Período: Del {fecha_inicio} al {fecha_fin}"
+        if primera_izquierda:
+            alineacion = [('ALIGN', (0, 0), (0, -1), 'LEFT'), ('ALIGN', (1, 0), (-1, -1), 'CENTER')]
         else:
-            periodo = "Período: Todas las ventas"
-        elements.append(Paragraph(periodo, subtitle_style))
-        
-        fecha_generacion = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
-        elements.append(Paragraph(f"Fecha de generación: {fecha_generacion}", subtitle_style))
-        elements.append(Spacer(1, 0.2*inch))
+            alineacion = [('ALIGN', (0, 0), (-1, -1), 'CENTER')]
         
-        # 📊 2. RESUMEN GENERAL (INDICADORES CLAVE)
-        elements.append(Paragraph("📊 Resumen General", heading_style))
-        
-        resumen = datos.get('resumen', {})
-        resumen_data = [
-            ['Indicador', 'Valor'],
-            ['Total de Ventas (S/)', f"S/ {resumen.get('monto_total', 0):,.2f}"],
-            ['Número de Transacciones', str(resumen.get('total_ventas', 0))],
-            ['Ticket Promedio', f"S/ {resumen.get('promedio_venta', 0):,.2f}"],
-            ['Venta Mínima', f"S/ {resumen.get('venta_minima', 0):,.2f}"],
-            ['Venta Máxima', f"S/ {resumen.get('venta_maxima', 0):,.2f}"]
-        ]
-        
-        resumen_table = Table(resumen_data, colWidths=[3.5*inch, 3*inch])
-        resumen_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
+        comandos = [
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(color)),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            *alineacion,
             ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-            ('TOPPADDING', (0, 0), (-1, 0), 10),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#ecf0f1')),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('TOPPADDING', (0, 1), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 8)
-        ]))
-        
-        elements.append(resumen_table)
-        elements.append(Spacer(1, 0.25*inch))
-        
-        # 🛍️ 3. DETALLE DE VENTAS POR PRODUCTO
-        if 'productos_mas_vendidos' in datos and datos['productos_mas_vendidos']:
-            elements.append(Paragraph("🛍️ Detalle de Ventas por Producto", heading_style))
-            
-            productos_data = [['Código', 'Producto', 'Categoría', 'Cant.', 'P. Unit.', 'Total', '% Part.']]
-            for producto in datos['productos_mas_vendidos']:
-                productos_data.append([
-                    producto.get('codigo', '')[:10],
-                    producto.get('producto', '')[:25],
-                    producto.get('categoria', '')[:15],
-                    str(producto.get('cantidad', 0)),
-                    f"S/ {producto.get('precio_unitario', 0):.2f}",
-                    f"S/ {producto.get('total', 0):,.2f}",
-                    f"{producto.get('porcentaje', 0):.1f}%"
-                ])
-            
-            productos_table = Table(productos_data, colWidths=[0.8*inch, 1.8*inch, 1.2*inch, 0.5*inch, 0.8*inch, 1*inch, 0.6*inch])
-            productos_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2ecc71')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 9),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('TOPPADDING', (0, 0), (-1, 0), 8),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#bdc3c7')),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
-                ('TOPPADDING', (0, 1), (-1, -1), 6),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')])
-            ]))
-            
-            elements.append(productos_table)
-            elements.append(Spacer(1, 0.25*inch))
-        
-        # 👥 4. DETALLE POR VENDEDOR/CAJERO
-        if 'ventas_por_cajero' in datos and datos['ventas_por_cajero']:
-            elements.append(Paragraph("👥 Detalle por Vendedor/Cajero", heading_style))
-            
-            cajeros_data = [['Vendedor', 'Ventas Totales', 'Nº Trans.', 'Ticket Prom.', '% del Total']]
-            for cajero in datos['ventas_por_cajero']:
-                cajeros_data.append([
-                    cajero.get('cajero', ''),
-                    f"S/ {cajero.get('total', 0):,.2f}",
-                    str(cajero.get('cantidad', 0)),
-                    f"S/ {cajero.get('ticket_promedio', 0):,.2f}",
-                    f"{cajero.get('porcentaje', 0):.1f}%"
-                ])
-            
-            cajeros_table = Table(cajeros_data, colWidths=[2*inch, 1.5*inch, 1*inch, 1.3*inch, 1*inch])
-            cajeros_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#9b59b6')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-                ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 9),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('TOPPADDING', (0, 0), (-1, 0), 8),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#bdc3c7')),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('TOPPADDING', (0, 1), (-1, -1), 6),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')])
-            ]))
-            
-            elements.append(cajeros_table)
-            elements.append(Spacer(1, 0.25*inch))
-        
-        # 🗓️ 5. VENTAS POR DÍA
-        if 'ventas_por_dia' in datos and datos['ventas_por_dia']:
-            elements.append(Paragraph("🗓️ Ventas por Día", heading_style))
-            
-            dias_data = [['Fecha', 'Ventas Totales', 'Nº Transacciones']]
-            for dia in datos['ventas_por_dia']:
-                dias_data.append([
-                    dia.get('fecha', ''),
-                    f"S/ {dia.get('total', 0):,.2f}",
-                    str(dia.get('cantidad', 0))
-                ])
-            
-            dias_table = Table(dias_data, colWidths=[2.5*inch, 2.5*inch, 1.8*inch])
-            dias_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e67e22')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('TOPPADDING', (0, 0), (-1, 0), 8),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#bdc3c7')),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('TOPPADDING', (0, 1), (-1, -1), 6),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')])
-            ]))
-            
-            elements.append(dias_table)
-            elements.append(Spacer(1, 0.25*inch))
+            ('FONTSIZE', (0, 0), (-1, 0), fuente_encabezado),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+            ('TOPPADDING', (0, 0), (-1, 0), 8),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor(fondo) if fondo else colors.white),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#bdc3c7')),
+            ('FONTSIZE', (0, 1), (-1, -1), fuente_cuerpo),
+            ('TOPPADDING', (0, 1), (-1, -1), 6),
+            ('BOTTOMPADDING', (0, 1), (-1, -1), 6)
+        ]
+        if not fondo:
+            comandos.append(('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')]))
         
-        # 💰 7. MÉTODOS DE PAGO
-        if 'ventas_por_metodo_pago' in datos and datos['ventas_por_metodo_pago']:
-            elements.append(Paragraph("💰 Métodos de Pago", heading_style))
-            
-            metodos_data = [['Método', 'Ventas Totales', '%']]
-            for metodo in datos['ventas_por_metodo_pago']:
-                metodos_data.append([
-                    metodo.get('metodo', ''),
-                    f"S/ {metodo.get('total', 0):,.2f}",
-                    f"{metodo.get('porcentaje', 0):.1f}%"
-                ])
-            
-            metodos_table = Table(metodos_data, colWidths=[2.5*inch, 2.5*inch, 1.8*inch])
-            metodos_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#16a085')),
+        estilo = TableStyle(comandos)
+        PDFGenerator._estilos_tabla[clave] = estilo
+        return estilo
+    
+    @staticmethod
+    def estilo_tabla_resumen(color):
+        """TableStyle compartido para la tabla de indicadores"""
+        clave = ('resumen', color)
+        estilo = PDFGenerator._estilos_tabla.get(clave)
+        if estilo is None:
+            estilo = TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(color)),
                 ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-                ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
                 ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('TOPPADDING', (0, 0), (-1, 0), 8),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#bdc3c7')),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('TOPPADDING', (0, 1), (-1, -1), 6),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')])
-            ]))
-            
-            elements.append(metodos_table)
-        
-        # Pie de página
-        elements.append(Spacer(1, 0.3*inch))
-        footer_style = ParagraphStyle(
-            'Footer',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.HexColor('#7f8c8d'),
-            alignment=TA_CENTER
-        )
-        elements.append(Paragraph(f"Reporte generado por REVENGE POS - {fecha_generacion}", footer_style))
-        
-        # Construir PDF
-        doc.build(elements)
-        buffer.seek(0)
-        return buffer
+                ('FONTSIZE', (0, 0), (-1, 0), 11),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+                ('TOPPADDING', (0, 0), (-1, 0), 10),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#ecf0f1')),
+                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
+                ('FONTSIZE', (0, 1), (-1, -1), 10),
+                ('TOPPADDING', (0, 1), (-1, -1), 8),
+                ('BOTTOMPADDING', (0, 1), (-1, -1), 8)
+            ])
+            PDFGenerator._estilos_tabla[clave] = estilo
+        return estilo
     
     @staticmethod
-    def generar_reporte_compras(datos, fecha_inicio=None, fecha_fin=None):
+    def _numerar_pagina(canvas, doc):
+        """Pie de cada página: número de página"""
+        canvas.saveState()
+        canvas.setFont('Helvetica', 7)
+        canvas.setFillColor(colors.HexColor('#7f8c8d'))
+        canvas.drawRightString(doc.pagesize[0] - doc.rightMargin, 0.3*inch, f"Página {doc.page}")
+        canvas.restoreState()
+    
+    # ==================== GENERACIÓN ====================
+    
+    @staticmethod
+    def _generar(tipo, datos, fecha_inicio=None, fecha_fin=None):
         """
-        Genera PDF de reporte de compras
+        Llena la plantilla de un tipo de reporte
         
-        Args:
-            datos (dict): Datos del reporte
-            fecha_inicio (str): Fecha inicio
-            fecha_fin (str): Fecha fin
-            
         Returns:
             BytesIO: Buffer con el PDF generado
         """
         PDFGenerator._check_reportlab()
         
+        plantilla = PLANTILLAS[tipo]
+        estilos = PDFGenerator.estilos()
+        
         buffer = BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
         elements = []
         
-        # Estilos
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=22,
-            textColor=colors.HexColor('#1a1a1a'),
-            spaceAfter=10,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
-        
-        subtitle_style = ParagraphStyle(
-            'Subtitle',
-            parent=styles['Normal'],
-            fontSize=11,
-            textColor=colors.HexColor('#555555'),
-            spaceAfter=20,
-            alignment=TA_CENTER
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            textColor=colors.HexColor('#2c3e50'),
-            spaceAfter=10,
-            spaceBefore=15,
-            fontName='Helvetica-Bold'
-        )
-        
         # 🧾 1. ENCABEZADO
-        elements.append(Paragraph("REVENGE POS", title_style))
-        elements.append(Paragraph("📦 REPORTE DE COMPRAS", title_style))
+        elements.append(Paragraph("REVENGE POS", estilos['titulo']))
+        elements.append(Paragraph(plantilla['titulo'], estilos['titulo']))
         
         # Período y fecha de generación
-        if fecha_inicio and fecha_fin:
-            periodo = f"Período: Del {fecha_inicio} al {fecha_fin}"
-        else:
-            periodo = "Período: Todas las compras"
-        elements.append(Paragraph(periodo, subtitle_style))
+        if plantilla['sin_periodo']:
+            if fecha_inicio and fecha_fin:
+                periodo = f"Período: Del {fecha_inicio} al {fecha_fin}"
+            else:
+                periodo = plantilla['sin_periodo']
+            elements.append(Paragraph(periodo, estilos['subtitulo']))
         
         fecha_generacion = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
-        elements.append(Paragraph(f"Fecha de generación: {fecha_generacion}", subtitle_style))
+        elements.append(Paragraph(f"Fecha de generación: {fecha_generacion}", estilos['subtitulo']))
         elements.append(Spacer(1, 0.2*inch))
         
         # 📊 2. RESUMEN GENERAL
-        elements.append(Paragraph("📊 Resumen General", heading_style))
+        elements.append(Paragraph("📊 Resumen General", estilos['seccion']))
         
         resumen = datos.get('resumen', {})
-        resumen_data = [
-            ['Indicador', 'Valor'],
-            ['Total de Compras (S/)', f"S/ {resumen.get('monto_total', 0):,.2f}"],
-            ['Número de Transacciones', str(resumen.get('total_compras', 0))],
-            ['Promedio por Compra', f"S/ {resumen.get('promedio_compra', 0):,.2f}"]
-        ]
+        resumen_data = [['Indicador', 'Valor']]
+        resumen_data.extend([etiqueta, formato(resumen)] for etiqueta, formato in plantilla['resumen'])
         
         resumen_table = Table(resumen_data, colWidths=[3.5*inch, 3*inch])
-        resumen_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e74c3c')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-            ('TOPPADDING', (0, 0), (-1, 0), 10),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#ecf0f1')),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('TOPPADDING', (0, 1), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 8)
-        ]))
+        resumen_table.setStyle(PDFGenerator.estilo_tabla_resumen(plantilla['color_resumen']))
         
         elements.append(resumen_table)
         elements.append(Spacer(1, 0.25*inch))
         
-        # 📦 3. DETALLE DE COMPRAS POR PRODUCTO
-        if 'productos_mas_comprados' in datos and datos['productos_mas_comprados']:
-            elements.append(Paragraph("📦 Detalle de Compras por Producto", heading_style))
-            
-            productos_data = [['Código', 'Producto', 'Categoría', 'Cant.', 'P. Unit.', 'Total', '% Part.']]
-            for producto in datos['productos_mas_comprados']:
-                productos_data.append([
-                    producto.get('codigo', '')[:10],
-                    producto.get('producto', '')[:25],
-                    producto.get('categoria', '')[:15],
-                    str(producto.get('cantidad', 0)),
-                    f"S/ {producto.get('precio_unitario', 0):.2f}",
-                    f"S/ {producto.get('total', 0):,.2f}",
-                    f"{producto.get('porcentaje', 0):.1f}%"
-                ])
-            
-            productos_table = Table(productos_data, colWidths=[0.8*inch, 1.8*inch, 1.2*inch, 0.5*inch, 0.8*inch, 1*inch, 0.6*inch])
-            productos_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f39c12')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 9),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('TOPPADDING', (0, 0), (-1, 0), 8),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#bdc3c7')),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
-                ('TOPPADDING', (0, 1), (-1, -1), 6),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')])
-            ]))
-            
-            elements.append(productos_table)
-            elements.append(Spacer(1, 0.25*inch))
-        
-        # 🏢 4. COMPRAS POR PROVEEDOR
-        if 'compras_por_proveedor' in datos and datos['compras_por_proveedor']:
-            elements.append(Paragraph("🏢 Compras por Proveedor", heading_style))
-            
-            proveedores_data = [['Proveedor', 'Nº Compras', 'Total', '% del Total']]
-            for proveedor in datos['compras_por_proveedor']:
-                proveedores_data.append([
-                    proveedor.get('proveedor', ''),
-                    str(proveedor.get('cantidad', 0)),
-                    f"S/ {proveedor.get('total', 0):,.2f}",
-                    f"{proveedor.get('porcentaje', 0):.1f}%"
-                ])
+        # 3. SECCIONES DE DETALLE
+        secciones = plantilla['secciones']
+        for indice, seccion in enumerate(secciones):
+            filas = datos.get(seccion['clave'])
+            if not filas:
+                continue
+            if seccion.get('limite'):
+                filas = filas[:seccion['limite']]
             
-            proveedores_table = Table(proveedores_data, colWidths=[2.5*inch, 1.3*inch, 1.8*inch, 1.2*inch])
-            proveedores_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e67e22')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-                ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('TOPPADDING', (0, 0), (-1, 0), 8),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#bdc3c7')),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('TOPPADDING', (0, 1), (-1, -1), 6),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')])
-            ]))
-            
-            elements.append(proveedores_table)
-            elements.append(Spacer(1, 0.25*inch))
-        
-        # 🗓️ 5. COMPRAS POR DÍA
-        if 'compras_por_dia' in datos and datos['compras_por_dia']:
-            elements.append(Paragraph("🗓️ Compras por Día", heading_style))
+            elements.append(Paragraph(seccion['titulo'], estilos['seccion']))
             
-            dias_data = [['Fecha', 'Total Compras', 'Nº Transacciones']]
-            for dia in datos['compras_por_dia']:
-                dias_data.append([
-                    dia.get('fecha', ''),
-                    f"S/ {dia.get('total', 0):,.2f}",
-                    str(dia.get('cantidad', 0))
-                ])
+            columnas = seccion['columnas']
+            tabla_data = [[encabezado for encabezado, _, _ in columnas]]
+            tabla_data.extend([formato(fila) for _, _, formato in columnas] for fila in filas)
             
-            dias_table = Table(dias_data, colWidths=[2.5*inch, 2.5*inch, 1.8*inch])
-            dias_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#8e44ad')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('TOPPADDING', (0, 0), (-1, 0), 8),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#bdc3c7')),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('TOPPADDING', (0, 1), (-1, -1), 6),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')])
-            ]))
+            # LongTable: en tablas largas repite el encabezado en cada página
+            tabla = LongTable(tabla_data, colWidths=[ancho*inch for _, ancho, _ in columnas], repeatRows=1)
+            tabla.setStyle(PDFGenerator.estilo_tabla(*seccion['estilo']))
             
-            elements.append(dias_table)
+            elements.append(tabla)
+            if indice < len(secciones) - 1:
+                elements.append(Spacer(1, 0.25*inch))
         
         # Pie de página
         elements.append(Spacer(1, 0.3*inch))
-        footer_style = ParagraphStyle(
-            'Footer',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.HexColor('#7f8c8d'),
-            alignment=TA_CENTER
-        )
-        elements.append(Paragraph(f"Reporte generado por REVENGE POS - {fecha_generacion}", footer_style))
+        elements.append(Paragraph(f"Reporte generado por REVENGE POS - {fecha_generacion}", estilos['pie']))
         
         # Construir PDF
-        doc.build(elements)
+        doc.build(elements, onFirstPage=PDFGenerator._numerar_pagina, onLaterPages=PDFGenerator._numerar_pagina)
         buffer.seek(0)
         return buffer
     
     @staticmethod
-    def generar_reporte_inventario(datos):
+    def generar_reporte_ventas(datos, fecha_inicio=None, fecha_fin=None):
         """
-        Genera PDF de reporte de inventario
+        Genera PDF de reporte de ventas
         
         Args:
             datos (dict): Datos del reporte
-            
+            fecha_inicio (str): Fecha inicio
+            fecha_fin (str): Fecha fin
+        
         Returns:
             BytesIO: Buffer con el PDF generado
         """
-        PDFGenerator._check_reportlab()
-        
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
-        elements = []
-        
-        # Estilos
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=22,
-            textColor=colors.HexColor('#1a1a1a'),
-            spaceAfter=10,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
-        
-        subtitle_style = ParagraphStyle(
-            'Subtitle',
-            parent=styles['Normal'],
-            fontSize=11,
-            textColor=colors.HexColor('#555555'),
-            spaceAfter=20,
-            alignment=TA_CENTER
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            textColor=colors.HexColor('#2c3e50'),
-            spaceAfter=10,
-            spaceBefore=15,
-            fontName='Helvetica-Bold'
-        )
-        
-        # 🧾 1. ENCABEZADO
-        elements.append(Paragraph("REVENGE POS", title_style))
-        elements.append(Paragraph("📦 REPORTE DE INVENTARIO", title_style))
-        
-        fecha_generacion = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
-        elements.append(Paragraph(f"Fecha de generación: {fecha_generacion}", subtitle_style))
-        elements.append(Spacer(1, 0.2*inch))
-        
-        # 📊 2. RESUMEN GENERAL
-        elements.append(Paragraph("📊 Resumen General", heading_style))
-        
-        resumen = datos.get('resumen', {})
-        resumen_data = [
-            ['Indicador', 'Valor'],
-            ['Total de Productos', str(resumen.get('total_productos', 0))],
-            ['Valor del Inventario', f"S/ {resumen.get('valor_inventario', 0):,.2f}"],
-            ['Valor Potencial de Venta', f"S/ {resumen.get('valor_venta_potencial', 0):,.2f}"],
-            ['⚠️ Productos con Stock Bajo', str(resumen.get('productos_stock_bajo', 0))],
-            ['❌ Productos Sin Stock', str(resumen.get('productos_sin_stock', 0))]
-        ]
-        
-        resumen_table = Table(resumen_data, colWidths=[3.5*inch, 3*inch])
-        resumen_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#9b59b6')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-            ('TOPPADDING', (0, 0), (-1, 0), 10),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#ecf0f1')),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('TOPPADDING', (0, 1), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 8)
-        ]))
-        
-        elements.append(resumen_table)
-        elements.append(Spacer(1, 0.25*inch))
-        
-        # 📂 3. INVENTARIO POR CATEGORÍA
-        if 'productos_por_categoria' in datos and datos['productos_por_categoria']:
-            elements.append(Paragraph("📂 Inventario por Categoría", heading_style))
-            
-            categorias_data = [['Categoría', 'Cant. Productos', 'Stock Total', 'Valor']]
-            for categoria in datos['productos_por_categoria']:
-                categorias_data.append([
-                    categoria.get('categoria', ''),
-                    str(categoria.get('cantidad', 0)),
-                    str(categoria.get('stock_total', 0)),
-                    f"S/ {categoria.get('valor', 0):,.2f}"
-                ])
-            
-            categorias_table = Table(categorias_data, colWidths=[2.5*inch, 1.5*inch, 1.3*inch, 1.5*inch])
-            categorias_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-                ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('TOPPADDING', (0, 0), (-1, 0), 8),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#bdc3c7')),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('TOPPADDING', (0, 1), (-1, -1), 6),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')])
-            ]))
-            
-            elements.append(categorias_table)
-            elements.append(Spacer(1, 0.25*inch))
+        return PDFGenerator._generar('ventas', datos, fecha_inicio, fecha_fin)
+    
+    @staticmethod
+    def generar_reporte_compras(datos, fecha_inicio=None, fecha_fin=None):
+        """
+        Genera PDF de reporte de compras
         
-        # ⚠️ 4. PRODUCTOS CON STOCK BAJO
-        if 'productos_stock_bajo' in datos and datos['productos_stock_bajo']:
-            elements.append(Paragraph("⚠️ Productos con Stock Bajo (Requieren Reabastecimiento)", heading_style))
-            
-            stock_data = [['Código', 'Producto', 'Categoría', 'Stock', 'Mínimo']]
-            for producto in datos['productos_stock_bajo'][:15]:  # Limitar a 15 productos
-                stock_data.append([
-                    producto.get('codigo_barras', '')[:12],
-                    producto.get('nombre', '')[:30],
-                    producto.get('categoria', '')[:15],
-                    str(producto.get('stock_actual', 0)),
-                    str(producto.get('stock_minimo', 0))
-                ])
-            
-            stock_table = Table(stock_data, colWidths=[1*inch, 2.5*inch, 1.3*inch, 0.7*inch, 0.7*inch])
-            stock_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f39c12')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 9),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('TOPPADDING', (0, 0), (-1, 0), 8),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#fff3cd')),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#bdc3c7')),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
-                ('TOPPADDING', (0, 1), (-1, -1), 6),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 6)
-            ]))
-            
-            elements.append(stock_table)
-            elements.append(Spacer(1, 0.25*inch))
+        Args:
+            datos (dict): Datos del reporte
+            fecha_inicio (str): Fecha inicio
+            fecha_fin (str): Fecha fin
         
-        # ❌ 5. PRODUCTOS SIN STOCK
-        if 'productos_sin_stock' in datos and datos['productos_sin_stock']:
-            elements.append(Paragraph("❌ Productos Sin Stock (Urgente)", heading_style))
-            
-            sin_stock_data = [['Código', 'Producto', 'Categoría']]
-            for producto in datos['productos_sin_stock'][:15]:  # Limitar a 15 productos
-                sin_stock_data.append([
-                    producto.get('codigo_barras', '')[:12],
-                    producto.get('nombre', '')[:35],
-                    producto.get('categoria', '')[:20]
-                ])
-            
-            sin_stock_table = Table(sin_stock_data, colWidths=[1.2*inch, 3.5*inch, 2.1*inch])
-            sin_stock_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e74c3c')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('TOPPADDING', (0, 0), (-1, 0), 8),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f8d7da')),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#bdc3c7')),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('TOPPADDING', (0, 1), (-1, -1), 6),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 6)
-            ]))
-            
-            elements.append(sin_stock_table)
+        Returns:
+            BytesIO: Buffer con el PDF generado
+        """
+        return PDFGenerator._generar('compras', datos, fecha_inicio, fecha_fin)
+    
+    @staticmethod
+    def generar_reporte_inventario(datos):
+        """
+        Genera PDF de reporte de inventario
         
-        # Pie de página
-        elements.append(Spacer(1, 0.3*inch))
-        footer_style = ParagraphStyle(
-            'Footer',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.HexColor('#7f8c8d'),
-            alignment=TA_CENTER
-        )
-        elements.append(Paragraph(f"Reporte generado por REVENGE POS - {fecha_generacion}", footer_style))
+        Args:
+            datos (dict): Datos del reporte
         
-        # Construir PDF
-        doc.build(elements)
-        buffer.seek(0)
-        return buffer
+        Returns:
+            BytesIO: Buffer con el PDF generado
+        """
+        return PDFGenerator._generar('inventario', datos)
@@ -0,0 +1,139 @@
+"""
+Pool de procesos para generar PDFs
+ReportLab es Python puro y consume CPU: generado en un hilo retiene el GIL y
+frena las demás peticiones del worker (ventas en caja). Aquí cada PDF se genera
+en un proceso aparte; entra el dict del reporte y salen los bytes del PDF.
+Estructura: ProcessPoolExecutor + límite de trabajos pendientes + timeout por trabajo
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, CancelledError, TimeoutError as FuturoTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from utils.metricas import Metricas
+
+
+class ColaPDFLlenaError(Exception):
+    """Se alcanzó el máximo de PDFs pendientes"""
+    pass
+
+
+class PDFNoDisponibleError(Exception):
+    """El pool no respondió a tiempo o sus procesos fallaron"""
+    pass
+
+
+def _renderizar(tipo, datos, argumentos):
+    """Genera el PDF (corre en un proceso del pool)"""
+    from utils.pdf_generator import PDFGenerator
+    buffer = getattr(PDFGenerator, f"generar_reporte_{tipo}")(datos, *argumentos)
+    return buffer.getvalue()
+
+
+class PoolPDF:
+    """Generación de PDFs fuera del proceso web"""
+    
+    PROCESOS = int(os.getenv('PDF_PROCESOS', 2))                       # 0 = generar en el mismo proceso
+    MAX_PENDIENTES = int(os.getenv('PDF_MAX_PENDIENTES', 8))           # En proceso + en cola
+    TIMEOUT = float(os.getenv('PDF_TIMEOUT', 60))                      # Espera máxima por PDF (s)
+    REINTENTAR_EN = int(os.getenv('PDF_REINTENTAR_EN', 5))             # Retry-After de los 429/503 (s)
+    
+    _executor = None
+    _pid = None
+    _pendientes = 0
+    _lock = threading.Lock()
+    
+    @staticmethod
+    def _obtener_executor():
+        """Pool de procesos del proceso actual (se recrea tras un fork)"""
+        if PoolPDF._executor is None or PoolPDF._pid != os.getpid():
+            # spawn: los hijos no heredan locks ni conexiones del proceso web
+            PoolPDF._executor = ProcessPoolExecutor(
+                max_workers=PoolPDF.PROCESOS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            if PoolPDF._pid != os.getpid():
+                PoolPDF._pid = os.getpid()
+                PoolPDF._pendientes = 0
+        return PoolPDF._executor
+    
+    @staticmethod
+    def _reiniciar(executor):
+        """Descarta un pool bloqueado o roto; el siguiente trabajo crea uno nuevo"""
+        with PoolPDF._lock:
+            if PoolPDF._executor is executor:
+                PoolPDF._executor = None
+        
+        procesos = list((getattr(executor, '_processes', None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for proceso in procesos:
+            proceso.terminate()
+    
+    @staticmethod
+    def _liberar(_futuro):
+        with PoolPDF._lock:
+            PoolPDF._pendientes -= 1
+    
+    @staticmethod
+    def generar(tipo, datos, *argumentos):
+        """
+        Genera un PDF de reporte en el pool
+        
+        Args:
+            tipo (str): 'ventas', 'compras' o 'inventario'
+            datos (dict): Datos del reporte (se serializan hacia el proceso)
+            *argumentos: Argumentos extra del generador (fecha_inicio, fecha_fin)
+        
+        Returns:
+            bytes: Contenido del PDF
+        
+        Raises:
+            ColaPDFLlenaError: Demasiados PDFs pendientes
+            PDFNoDisponibleError: Timeout o fallo del pool
+        """
+        inicio = time.perf_counter()
+        if PoolPDF.PROCESOS <= 0:
+            pdf = _renderizar(tipo, datos, argumentos)
+            Metricas.observar('pdf_generacion_segundos', time.perf_counter() - inicio, (('tipo', tipo),))
+            return pdf
+        
+        with PoolPDF._lock:
+            executor = PoolPDF._obtener_executor()
+            if PoolPDF._pendientes >= PoolPDF.MAX_PENDIENTES:
+                raise ColaPDFLlenaError(
+                    f"Hay {PoolPDF._pendientes} PDFs en generación, intente más tarde"
+                )
+            PoolPDF._pendientes += 1
+        
+        try:
+            futuro = executor.submit(_renderizar, tipo, datos, argumentos)
+        except (BrokenProcessPool, RuntimeError) as e:
+            PoolPDF._liberar(None)
+            PoolPDF._reiniciar(executor)
+            raise PDFNoDisponibleError(f"Pool de PDF no disponible: {e}")
+        futuro.add_done_callback(PoolPDF._liberar)
+        
+        try:
+            pdf = futuro.result(timeout=PoolPDF.TIMEOUT)
+            # Incluye la espera en cola: es lo que percibe quien pidió el PDF
+            Metricas.observar('pdf_generacion_segundos', time.perf_counter() - inicio, (('tipo', tipo),))
+            return pdf
+        except FuturoTimeoutError:
+            # Si aún estaba en cola basta cancelarlo; si ya corre, hay que matar el pool
+            if not futuro.cancel():
+                print(f"❌ PDF de {tipo} excedió {PoolPDF.TIMEOUT}s, reiniciando pool")
+                PoolPDF._reiniciar(executor)
+            raise PDFNoDisponibleError("La generación del PDF excedió el tiempo máximo")
+        except BrokenProcessPool as e:
+            PoolPDF._reiniciar(executor)
+            raise PDFNoDisponibleError(f"Pool de PDF no disponible: {e}")
+        except CancelledError:
+            # Otro trabajo reinició el pool mientras este esperaba
+            raise PDFNoDisponibleError("Pool de PDF reiniciado, intente nuevamente")
+    
+    @staticmethod
+    def pendientes():
+        """PDFs en generación o en cola en este proceso"""
+        return PoolPDF._pendientes if PoolPDF._pid == os.getpid() else 0
@@ -0,0 +1,81 @@
+"""
+Stream Helper
+Convierte filas (de un cursor sin buffer) en trozos de texto CSV o NDJSON
+para respuestas HTTP en streaming con memoria constante
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+
+class StreamHelper:
+    """Helper para serializar filas en trozos"""
+    
+    TAMANO_TROZO = 64 * 1024     # Caracteres acumulados antes de entregar un trozo
+    
+    @staticmethod
+    def _valor_json(valor):
+        """Serializa tipos de MySQL que json no conoce"""
+        if isinstance(valor, Decimal):
+            # Como texto: no se pierde precisión
+            return str(valor)
+        if isinstance(valor, (datetime, date)):
+            return valor.isoformat()
+        raise TypeError(f"Tipo no serializable: {type(valor).__name__}")
+    
+    @staticmethod
+    def csv(encabezados, filas):
+        """
+        Generador de trozos CSV (UTF-8)
+        
+        Args:
+            encabezados (list): Primera fila del archivo
+            filas: Iterable de tuplas
+        """
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer, lineterminator='\n')
+        escritor.writerow(encabezados)
+        
+        try:
+            for fila in filas:
+                escritor.writerow(fila)
+                if buffer.tell() >= StreamHelper.TAMANO_TROZO:
+                    yield buffer.getvalue().encode('utf-8')
+                    buffer.seek(0)
+                    buffer.truncate()
+            
+            if buffer.tell():
+                yield buffer.getvalue().encode('utf-8')
+        finally:
+            if hasattr(filas, 'close'):
+                filas.close()
+    
+    @staticmethod
+    def ndjson(filas):
+        """
+        Generador de trozos NDJSON: un objeto JSON por línea
+        
+        Args:
+            filas: Iterable de dicts
+        """
+        partes = []
+        largo = 0
+        
+        try:
+            for fila in filas:
+                linea = json.dumps(fila, ensure_ascii=False, default=StreamHelper._valor_json)
+                partes.append(linea)
+                largo += len(linea) + 1
+                if largo >= StreamHelper.TAMANO_TROZO:
+                    yield ('\n'.join(partes) + '\n').encode('utf-8')
+                    partes = []
+                    largo = 0
+            
+            if partes:
+                yield ('\n'.join(partes) + '\n').encode('utf-8')
+        finally:
+            if hasattr(filas, 'close'):
+                filas.close()